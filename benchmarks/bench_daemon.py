@@ -0,0 +1,96 @@
+"""Round-trip latency of the passgen daemon versus fresh-process invocation.
+
+Starts `passgen serve` on a temporary socket and times:
+  * requests over one persistent connection,
+  * a new connection per request,
+  * `python -m passgen.cli --no-daemon --no-clipboard` per password.
+
+Usage (from the repo root): python -m benchmarks.bench_daemon [--requests N]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REQUEST = b'{"length": 16}\n'
+
+
+def wait_for_socket(path, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            return
+        time.sleep(0.01)
+    raise RuntimeError("daemon did not start")
+
+
+def time_persistent(path, n):
+    samples = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        reply = sock.makefile("rb")
+        for _ in range(n):
+            start = time.perf_counter()
+            sock.sendall(REQUEST)
+            reply.readline()
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_reconnect(path, n):
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(REQUEST)
+            sock.makefile("rb").readline()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_fresh_process(n):
+    samples = []
+    cmd = [sys.executable, "-m", "passgen.cli", "--no-daemon", "--no-clipboard"]
+    for _ in range(n):
+        start = time.perf_counter()
+        subprocess.run(cmd, capture_output=True, check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{name:<22} p50 {p50 * 1e3:9.3f} ms   p99 {p99 * 1e3:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--processes", type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "passgen.sock")
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "passgen.cli", "serve", "--socket", path],
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_socket(path)
+            report("daemon (persistent)", time_persistent(path, args.requests))
+            report("daemon (reconnect)", time_reconnect(path, args.requests))
+        finally:
+            daemon.terminate()
+            daemon.wait()
+    report("fresh process", time_fresh_process(args.processes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Throughput scaling of passgen.parallel.generate_parallel across workers.
+
+Usage (from the repo root): python -m benchmarks.bench_parallel [--count N] [--max-workers W]
+"""
+import argparse
+import os
+import time
+
+from passgen.generator import PasswordConfig
+from passgen.parallel import generate_parallel
+
+
+def measure(config, count, workers, chunk_size):
+    start = time.perf_counter()
+    produced = 0
+    for chunk in generate_parallel(
+        config, count, workers=workers, chunk_size=chunk_size, ordered=False
+    ):
+        produced += len(chunk)
+    elapsed = time.perf_counter() - start
+    assert produced == count
+    return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    config = PasswordConfig(length=args.length)
+    print(f"cpus={os.cpu_count()} count={args.count} length={args.length}")
+    print(f"{'workers':>7} {'passwords/s':>14} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        rate = measure(config, args.count, workers, args.chunk_size)
+        baseline = baseline or rate
+        speedup = rate / baseline
+        print(f"{workers:>7} {rate:>14,.0f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
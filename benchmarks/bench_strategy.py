@@ -0,0 +1,42 @@
+"""Compare the shuffle and reject generation strategies for lengths 8-128.
+
+Reports, per strategy and length, random values drawn per password (every
+character and every Fisher-Yates swap target counts as one draw), CSPRNG
+bytes consumed per password, and wall time per password.
+
+Usage (from the repo root): python -m benchmarks.bench_strategy [--count N]
+"""
+import argparse
+import time
+
+from passgen.generator import STRATEGIES, PasswordConfig, generate_passwords, instrument
+
+LENGTHS = (8, 12, 16, 24, 32, 64, 128)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'length':>6} {'strategy':>8} {'draws/pw':>9} {'bytes/pw':>9} {'us/pw':>8}")
+    for length in LENGTHS:
+        for strategy in STRATEGIES:
+            config = PasswordConfig(length=length, strategy=strategy)
+
+            with instrument() as stats:
+                generate_passwords(config, args.count)
+
+            start = time.perf_counter()
+            generate_passwords(config, args.count)
+            elapsed = time.perf_counter() - start
+
+            print(
+                f"{length:>6} {strategy:>8} {stats.draws / args.count:>9.1f} "
+                f"{stats.bytes_consumed / args.count:>9.1f} "
+                f"{elapsed / args.count * 1e6:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Throughput scaling of one shared PasswordGenerator across threads.
+
+Every thread calls password() (or passwords(--batch) with --batch > 1) on
+the same generator for --seconds. On a GIL build expect roughly flat
+total throughput; on a free-threaded build it should scale with cores.
+
+Usage (from the repo root):
+  python -m benchmarks.bench_threads [--max-threads N] [--seconds S] [--batch B]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+from passgen.generator import PasswordConfig, PasswordGenerator
+
+
+def gil_enabled():
+    """False on a free-threaded build running without the GIL."""
+    check = getattr(sys, "_is_gil_enabled", None)
+    return True if check is None else check()
+
+
+def measure(generator, threads, seconds, batch):
+    """Total passwords per second from threads threads sharing generator."""
+    counts = [0] * threads
+    start = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def work(slot):
+        start.wait()
+        produced = 0
+        while not stop.is_set():
+            if batch > 1:
+                produced += len(generator.passwords(batch))
+            else:
+                generator.password()
+                produced += 1
+        counts[slot] = produced
+
+    workers = [threading.Thread(target=work, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    began = time.perf_counter()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / (time.perf_counter() - began)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=1)
+    args = parser.parse_args()
+
+    generator = PasswordGenerator(PasswordConfig(length=args.length))
+    print(
+        f"python={sys.version.split()[0]} gil={'on' if gil_enabled() else 'off'} "
+        f"cpus={os.cpu_count()} length={args.length} batch={args.batch}"
+    )
+    print(f"{'threads':>7} {'passwords/s':>14} {'speedup':>8} {'efficiency':>10}")
+    baseline = None
+    for threads in range(1, args.max_threads + 1):
+        rate = measure(generator, threads, args.seconds, args.batch)
+        baseline = baseline or rate
+        speedup = rate / baseline
+        print(f"{threads:>7} {rate:>14,.0f} {speedup:>8.2f} {speedup / threads:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Benchmark suite for passgen, emitting machine-readable JSON.
+
+Cases:
+  single_latency     generate_password() per call, length 16, all 4 configs
+  batch_throughput   generate_passwords() passwords/s, lengths 8/16/64/128 x
+                     all 4 configs, for each installed engine
+  shuffle            secure_shuffle() per list and shuffle_many() per row
+  entropy            draws and CSPRNG bytes consumed per password
+  export             export_passwords() records/s per format, plaintext and
+                     AES-GCM encrypted (when `cryptography` is installed)
+  cli_cold_start     `python -m passgen.cli --no-clipboard --no-daemon`
+                     wall time, next to a bare interpreter start
+
+Usage (from the repo root):
+  python -m benchmarks.run [--quick] [--filter NAME] [--output FILE]
+  python -m benchmarks.run --compare OLD.json [--threshold 1.25]
+
+--compare runs the suite, reports every case whose time (or inverse
+throughput) got worse than OLD by more than the threshold ratio, and exits
+1 if any did.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+import passgen
+from passgen.generator import (
+    ENGINES,
+    STRATEGIES,
+    EntropyBuffer,
+    PasswordConfig,
+    generate_password,
+    generate_passwords,
+    instrument,
+    secure_shuffle,
+    shuffle_many,
+)
+
+LENGTHS = (8, 16, 64, 128)
+CONFIGS = {
+    "all": PasswordConfig(),
+    "no_symbols": PasswordConfig(include_symbols=False),
+    "no_numbers": PasswordConfig(include_numbers=False),
+    "letters": PasswordConfig(include_symbols=False, include_numbers=False),
+}
+
+
+def _with_length(config, length):
+    return PasswordConfig(
+        length=length,
+        include_symbols=config.include_symbols,
+        include_numbers=config.include_numbers,
+    )
+
+
+def _stats(samples):
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "samples": len(samples),
+    }
+
+
+def _time_per_call(fn, repeat, number):
+    """Seconds per call of fn, one sample per repeat."""
+    timer = timeit.Timer(fn)
+    return [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+
+def _result(name, params, unit, value, stats=None, lower_is_better=True):
+    return {
+        "name": name,
+        "params": params,
+        "unit": unit,
+        "value": value,
+        "lower_is_better": lower_is_better,
+        "stats": stats,
+    }
+
+
+def _cryptography_available():
+    try:
+        import cryptography  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _numpy_available():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def bench_single_latency(scale):
+    for label, config in CONFIGS.items():
+        samples = [s * 1e6 for s in _time_per_call(
+            lambda c=config: generate_password(c), repeat=5, number=200 * scale
+        )]
+        yield _result(
+            "single_latency", {"config": label, "length": 16}, "us",
+            statistics.median(samples), _stats(samples),
+        )
+
+
+def bench_batch_throughput(scale):
+    engines = [e for e in ENGINES if e != "numpy" or _numpy_available()]
+    count = 2000 * scale
+    for engine in engines:
+        for length in LENGTHS:
+            for label, config in CONFIGS.items():
+                cfg = _with_length(config, length)
+                samples = [count / s for s in _time_per_call(
+                    lambda cfg=cfg, engine=engine: generate_passwords(cfg, count, engine=engine),
+                    repeat=3, number=1,
+                )]
+                yield _result(
+                    "batch_throughput",
+                    {"engine": engine, "length": length, "config": label, "count": count},
+                    "passwords/s", statistics.median(samples), _stats(samples),
+                    lower_is_better=False,
+                )
+
+
+def bench_shuffle(scale):
+    for size in (16, 64, 128):
+        items = list(range(size))
+        samples = [s * 1e6 for s in _time_per_call(
+            lambda items=items: secure_shuffle(items), repeat=5, number=200 * scale
+        )]
+        yield _result(
+            "shuffle", {"function": "secure_shuffle", "size": size}, "us",
+            statistics.median(samples), _stats(samples),
+        )
+    rows = 1000 * scale
+    for size in (16, 128):
+        data = [list(range(size)) for _ in range(rows)]
+        samples = [s / rows * 1e6 for s in _time_per_call(
+            lambda data=data: shuffle_many(data, EntropyBuffer()), repeat=3, number=1
+        )]
+        yield _result(
+            "shuffle", {"function": "shuffle_many", "size": size, "rows": rows},
+            "us/row", statistics.median(samples), _stats(samples),
+        )
+
+
+def bench_entropy(scale):
+    count = 1000 * scale
+    for strategy in STRATEGIES:
+        for length in LENGTHS:
+            config = PasswordConfig(length=length, strategy=strategy)
+            with instrument() as stats:
+                generate_passwords(config, count)
+            params = {"strategy": strategy, "length": length, "count": count}
+            yield _result("entropy_draws", params, "draws/password", stats.draws / count)
+            yield _result("entropy_bytes", params, "bytes/password", stats.bytes_consumed / count)
+
+
+def bench_export(scale):
+    import io
+
+    from passgen.export import FORMATS, export_passwords
+
+    count = 20000 * scale
+    ids = [f"user-{i}\n" for i in range(count)]
+    config = PasswordConfig()
+    modes = [False, True] if _cryptography_available() else [False]
+    for encrypted in modes:
+        if encrypted:
+            from passgen.encryption import EncryptedWriter
+
+        def run(fmt, encrypted=encrypted):
+            out = io.BytesIO()
+            if not encrypted:
+                export_passwords(ids, config, out, fmt)
+                return
+            with EncryptedWriter(out, bytes(32)) as sink:
+                export_passwords(ids, config, sink, fmt)
+
+        for fmt in FORMATS:
+            samples = [count / s for s in _time_per_call(
+                lambda fmt=fmt, run=run: run(fmt), repeat=3, number=1
+            )]
+            yield _result(
+                "export", {"format": fmt, "encrypted": encrypted, "count": count},
+                "records/s", statistics.median(samples), _stats(samples),
+                lower_is_better=False,
+            )
+
+
+def bench_cli_cold_start(scale):
+    runs = 5 * scale
+    commands = {
+        "python": [sys.executable, "-c", "pass"],
+        "passgen": [sys.executable, "-m", "passgen.cli", "--no-clipboard", "--no-daemon"],
+    }
+    for label, cmd in commands.items():
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(cmd, capture_output=True, check=True)
+            samples.append((time.perf_counter() - start) * 1e3)
+        yield _result(
+            "cli_cold_start", {"command": label}, "ms",
+            statistics.median(samples), _stats(samples),
+        )
+
+
+SUITE = {
+    "single_latency": bench_single_latency,
+    "batch_throughput": bench_batch_throughput,
+    "shuffle": bench_shuffle,
+    "entropy": bench_entropy,
+    "export": bench_export,
+    "cli_cold_start": bench_cli_cold_start,
+}
+
+
+def run_suite(names, scale):
+    results = []
+    for name in names:
+        for result in SUITE[name](scale):
+            results.append(result)
+            print(
+                f"{result['name']:<17} {json.dumps(result['params']):<70} "
+                f"{result['value']:>14.3f} {result['unit']}",
+                file=sys.stderr,
+            )
+    return {
+        "meta": {
+            "passgen": passgen.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "scale": scale,
+        },
+        "results": results,
+    }
+
+
+def _key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(old, new, threshold):
+    """Return (case, ratio) for every case that regressed beyond threshold."""
+    baseline = {_key(r): r for r in old["results"]}
+    regressions = []
+    for result in new["results"]:
+        before = baseline.get(_key(result))
+        if before is None or not before["value"] or not result["value"]:
+            continue
+        ratio = result["value"] / before["value"]
+        if not result.get("lower_is_better", True):
+            ratio = 1 / ratio
+        if ratio > threshold:
+            regressions.append((result, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="Smallest workload.")
+    parser.add_argument("--scale", type=int, default=5, help="Workload multiplier.")
+    parser.add_argument(
+        "--filter", action="append", choices=sorted(SUITE), metavar="NAME",
+        help=f"Run only these cases (repeatable): {', '.join(SUITE)}.",
+    )
+    parser.add_argument("--output", metavar="FILE", help="Write JSON here (default: stdout).")
+    parser.add_argument("--compare", metavar="OLD", help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.filter or list(SUITE), 1 if args.quick else args.scale)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(json.load(fh), report, args.threshold)
+        for result, ratio in regressions:
+            print(
+                f"REGRESSION {result['name']} {json.dumps(result['params'])}: "
+                f"{ratio:.2f}x worse",
+                file=sys.stderr,
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""asyncio-friendly generation fed from a background-refilled entropy pool.
+
+Password generation itself is a few microseconds of CPU work; what blocks
+an event loop is the os.urandom syscall behind every buffer refill. Here
+those reads happen in an executor thread, between a low and a high
+watermark, so awaiting a password normally costs no syscall on the loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import weakref
+from collections import deque
+from typing import AsyncIterator
+
+from passgen.generator import (
+    EntropyBuffer,
+    EntropySource,
+    PasswordConfig,
+    generate_passwords,
+)
+
+CHUNK_SIZE = 1 << 16
+LOW_WATERMARK = 1 << 17
+HIGH_WATERMARK = 1 << 19
+
+
+class AsyncEntropyPool(EntropyBuffer):
+    """EntropyBuffer whose blocks are prefetched by a worker thread.
+
+    Reads happen on the event loop thread; the worker only appends whole
+    blocks to a deque, so no bytes are ever handed out twice. If the
+    prefetched blocks run dry anyway, refill() falls back to a synchronous
+    draw rather than failing.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = CHUNK_SIZE,
+        low_watermark: int = LOW_WATERMARK,
+        high_watermark: int = HIGH_WATERMARK,
+        executor=None,
+        source: EntropySource | None = None,
+    ):
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("watermarks must satisfy 0 <= low <= high")
+        super().__init__(block_size=chunk_size, source=source)
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self._executor = executor
+        self._blocks = deque()
+        self._filling = None
+
+    def available(self) -> int:
+        """Prefetched bytes not yet handed out."""
+        return len(self._buf) - self._pos + len(self._blocks) * self.block_size
+
+    def refill(self) -> None:
+        self._buf = self._blocks.popleft() if self._blocks else self._draw(
+            self.block_size
+        )
+        self._pos = 0
+
+    def read(self, n: int) -> bytes:
+        # Large reads are served from prefetched blocks too, never bypassed.
+        parts = []
+        while n > 0:
+            if self._pos >= len(self._buf):
+                self.refill()
+            part = self._buf[self._pos:self._pos + n]
+            self._pos += len(part)
+            n -= len(part)
+            parts.append(part)
+        return b"".join(parts)
+
+    def _fill(self, target: int) -> None:
+        # Runs in the executor thread.
+        while self.available() < target:
+            self._blocks.append(self._draw(self.block_size))
+
+    def _after_fork(self) -> None:
+        super()._after_fork()
+        self._blocks.clear()
+        self._filling = None
+
+    def _schedule(self, target: int) -> asyncio.Future:
+        if self._filling is None or self._filling.done():
+            loop = asyncio.get_running_loop()
+            self._filling = loop.run_in_executor(self._executor, self._fill, target)
+        return self._filling
+
+    async def ensure(self, nbytes: int) -> None:
+        """Make sure nbytes are prefetched, topping up below the low watermark.
+
+        Only waits if fewer than nbytes are available; otherwise the refill
+        runs in the background while the caller carries on.
+        """
+        target = max(self.high_watermark, nbytes)
+        if self.available() < max(self.low_watermark, nbytes):
+            filling = self._schedule(target)
+            while self.available() < nbytes:
+                await filling
+                filling = self._schedule(target)
+
+
+# One pool per event loop: pools are read from their loop's thread only.
+_pools = weakref.WeakKeyDictionary()
+
+
+def default_pool() -> AsyncEntropyPool:
+    """Return the running loop's shared AsyncEntropyPool."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = AsyncEntropyPool()
+    return pool
+
+
+def _bytes_needed(config: PasswordConfig, count: int) -> int:
+    # Generous per-batch estimate: characters plus Fisher-Yates targets at
+    # worst-case rejection rates, plus sampler over-read slack.
+    return count * config.length * 6 + 256
+
+
+async def generate_passwords_async(
+    config: PasswordConfig, count: int, pool: AsyncEntropyPool | None = None
+) -> list[str]:
+    """Generate count passwords without blocking the event loop on entropy reads."""
+    pool = pool or default_pool()
+    await pool.ensure(_bytes_needed(config, count))
+    passwords = generate_passwords(config, count, entropy=pool)
+    await pool.ensure(0)  # start topping up in the background if low
+    return passwords
+
+
+async def generate_password_async(
+    config: PasswordConfig, pool: AsyncEntropyPool | None = None
+) -> str:
+    """Async counterpart of generator.generate_password()."""
+    return (await generate_passwords_async(config, 1, pool))[0]
+
+
+async def iter_passwords_async(
+    config: PasswordConfig,
+    count: int | None = None,
+    batch_size: int = 256,
+    pool: AsyncEntropyPool | None = None,
+) -> AsyncIterator[str]:
+    """Async counterpart of generator.iter_passwords(); yields between batches."""
+    if count is not None and count < 0:
+        raise ValueError("count must be non-negative")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    while count is None or count > 0:
+        n = batch_size if count is None else min(batch_size, count)
+        for password in await generate_passwords_async(config, n, pool):
+            yield password
+        if count is not None:
+            count -= n
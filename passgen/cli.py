@@ -1,17 +1,28 @@
+import os
 import sys
 import argparse
 
 
-from passgen.generator import PasswordConfig, generate_password
+from passgen.generator import (
+    ALPHABET_PRESETS,
+    STRATEGIES,
+    CompiledPolicy,
+    PasswordConfig,
+    alphabet,
+    check_config,
+    generate_password,
+    generate_passwords,
+)
 from passgen.clipboard import copy_to_clipboard
+from passgen.secret import SecretBuffer, generate_secret, generate_secrets
+from passgen.client import default_socket_path, request_passwords, socket_is_trusted
 
+# Passwords per write() in --count mode; bounds memory for unbounded streams.
+STREAM_BATCH = 4096
 
-def parse_args(argv=None):
-    """Parse CLI arguments and return namespace with defaults."""
-    parser = argparse.ArgumentParser(
-        prog="passgen",
-        description="Generate a cryptographically secure password.",
-    )
+
+def add_password_options(parser):
+    """Add the options that describe a password (length, sets, policy)."""
     parser.add_argument(
         "--length",
         type=int,
@@ -31,13 +42,69 @@ def parse_args(argv=None):
         default=False,
         help="Exclude numeric characters from the password.",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--strategy",
+        choices=STRATEGIES,
+        default="shuffle",
+        help=(
+            "How the one-of-each-set rule is met: 'shuffle' places guaranteed "
+            "characters then shuffles, 'reject' redraws passwords missing a set "
+            "(default: shuffle)."
+        ),
+    )
+    for name in ("lowercase", "uppercase", "numbers", "symbols"):
+        parser.add_argument(
+            f"--min-{name}",
+            type=int,
+            default=1,
+            metavar="N",
+            help=f"Minimum number of {name} characters, if enabled (default: 1).",
+        )
+    parser.add_argument(
+        "--max-repeat",
+        type=int,
+        default=None,
+        metavar="K",
+        help="Allow at most K identical characters in a row.",
+    )
+    parser.add_argument(
+        "--exclude",
+        default="",
+        metavar="CHARS",
+        help="Never use any of these characters.",
+    )
+    parser.add_argument(
+        "--no-ambiguous",
+        action="store_true",
+        default=False,
+        help="Exclude easily confused characters (0 O 1 l I).",
+    )
+    parser.add_argument(
+        "--forbid",
+        action="append",
+        default=[],
+        metavar="TEXT",
+        help="Reject passwords containing TEXT (case-sensitive; repeatable).",
+    )
+    parser.add_argument(
+        "--alphabet",
+        action="append",
+        default=[],
+        metavar="CHARS",
+        help=(
+            "Use only these characters (any Unicode), or a preset: "
+            f"{', '.join(ALPHABET_PRESETS)}. Repeat to add further sets, "
+            "each used at least once; replaces the built-in sets and "
+            "--no-symbols, --no-numbers and --min-*."
+        ),
+    )
 
 
-def main(argv=None):
-    """CLI entry point."""
-    args = parse_args(argv)
+def config_from_args(args):
+    """Validate the add_password_options() values and build a PasswordConfig.
 
+    Writes an error to stderr and exits 1 if they are invalid.
+    """
     # Validate --length bounds
     if args.length < 8:
         sys.stderr.write("Error: --length must be at least 8.\n")
@@ -50,20 +117,788 @@ def main(argv=None):
         length=args.length,
         include_symbols=not args.no_symbols,
         include_numbers=not args.no_numbers,
+        strategy=args.strategy,
+        min_lowercase=args.min_lowercase,
+        min_uppercase=args.min_uppercase,
+        min_numbers=args.min_numbers,
+        min_symbols=args.min_symbols,
+        max_repeat=args.max_repeat,
+        exclude=args.exclude,
+        exclude_ambiguous=args.no_ambiguous,
+        forbidden=tuple(args.forbid),
+        alphabets=tuple(alphabet(spec) for spec in args.alphabet),
     )
+    try:
+        check_config(config, CompiledPolicy.from_config(config))
+    except ValueError as exc:
+        sys.stderr.write(f"Error: {exc}.\n")
+        sys.exit(1)
+    return config
 
-    password = generate_password(config)
-    sys.stdout.write(password + "\n")
 
-    success = copy_to_clipboard(password)
-    if success:
-        sys.stderr.write("Password copied to clipboard.\n")
-        sys.exit(0)
+def add_dedupe_options(parser):
+    """Add --unique and --dedupe-index."""
+    parser.add_argument(
+        "--unique",
+        action="store_true",
+        default=False,
+        help="Never output the same password twice in one run.",
+    )
+    parser.add_argument(
+        "--dedupe-index",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Never output a password recorded in the index file PATH, and record "
+            "every password output (created if missing; implies --unique)."
+        ),
+    )
+
+
+def open_dedupe_index(args):
+    """DedupeIndex for the add_dedupe_options() values, or None; exits 1 on error."""
+    if args.dedupe_index is None and not args.unique:
+        return None
+    from passgen.dedupe import DedupeIndex
+
+    try:
+        return DedupeIndex(args.dedupe_index)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+
+
+def parse_args(argv=None):
+    """Parse CLI arguments and return namespace with defaults."""
+    parser = argparse.ArgumentParser(
+        prog="passgen",
+        description="Generate a cryptographically secure password.",
+    )
+    add_password_options(parser)
+    parser.add_argument(
+        "--no-clipboard",
+        action="store_true",
+        default=False,
+        help="Print the password without copying it to the clipboard.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Fetch the password from a `passgen serve` daemon listening on PATH "
+            "(default: $PASSGEN_SOCKET or $XDG_RUNTIME_DIR/passgen.sock, if present)."
+        ),
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        default=False,
+        help="Always generate locally, even if a daemon socket is present.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=None,
+        metavar="N",
+        help=(
+            "Stream N passwords to stdout, one per line, without touching the "
+            "clipboard (-1 streams forever)."
+        ),
+    )
+    parser.add_argument(
+        "--show-entropy",
+        action="store_true",
+        default=False,
+        help="Report the exact entropy of the generated password(s) on stderr.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes used to generate passwords in --count mode (default: 1).",
+    )
+    add_dedupe_options(parser)
+    return parser.parse_args(argv)
+
+
+def _batches(config, count, index=None):
+    if index is not None:
+        from passgen.dedupe import unique_batches
+
+        # New passwords are written as they are found, so running out of
+        # unissued ones still outputs (and records) everything found first.
+        wanted = count
+
+        def candidates():
+            while True:
+                yield generate_passwords(
+                    config, STREAM_BATCH if wanted < 0 else min(STREAM_BATCH, wanted)
+                )
+
+        for fresh in unique_batches(candidates(), index, None if count < 0 else count):
+            if wanted > 0:
+                wanted -= len(fresh)
+            yield fresh
+        return
+    # Secret buffers hold ASCII only; other alphabets are generated as str.
+    ascii_only = CompiledPolicy.from_config(config).is_ascii
+    while count != 0:
+        n = STREAM_BATCH if count < 0 else min(STREAM_BATCH, count)
+        if ascii_only:
+            yield generate_secrets(config, n)
+        else:
+            yield generate_passwords(config, n)
+        if count > 0:
+            count -= n
+
+
+def stream_passwords(config, count, jobs=1, index=None):
+    """Write count passwords (forever if count is -1) to stdout in large batches.
+
+    With a DedupeIndex as index, only passwords new to it are written.
+    """
+    if jobs > 1:
+        from passgen.parallel import generate_parallel
+
+        limit = None if count < 0 else count
+        batches = generate_parallel(
+            config,
+            # Duplicates are dropped in this process, so keep the workers
+            # going until enough new passwords have come back.
+            limit if index is None else None,
+            workers=jobs,
+            chunk_size=STREAM_BATCH,
+            ordered=False,
+        )
+        if index is not None:
+            from passgen.dedupe import unique_batches
+
+            batches = unique_batches(batches, index, limit)
     else:
+        batches = _batches(config, count, index)
+    try:
+        for batch in batches:
+            if isinstance(batch, SecretBuffer):
+                # Newline-terminated passwords, written without a str copy.
+                with batch:
+                    _write_secret(batch.view)
+            else:
+                sys.stdout.write("\n".join(batch) + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. `passgen --count -1 | head`); silence the
+        # interpreter's own flush-at-exit error and stop cleanly.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+
+
+def fetch_from_daemon(path, config):
+    """Return a password from the daemon at path, or None to generate locally."""
+    if path is None or not socket_is_trusted(path):
+        return None
+    try:
+        return request_passwords(path, config)[0]
+    except (OSError, ValueError):
+        return None
+
+
+def serve_main(argv):
+    """`passgen serve`: run the warm generator daemon in the foreground."""
+    parser = argparse.ArgumentParser(
+        prog="passgen serve",
+        description="Serve passwords to local clients over a Unix domain socket.",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        metavar="PATH",
+        help="Socket path (default: $PASSGEN_SOCKET or $XDG_RUNTIME_DIR/passgen.sock).",
+    )
+    args = parser.parse_args(argv)
+    path = args.socket or default_socket_path()
+    if path is None:
         sys.stderr.write(
-            "Warning: could not copy to clipboard — paste from terminal output.\n"
+            "Error: no socket path; pass --socket or set PASSGEN_SOCKET "
+            "or XDG_RUNTIME_DIR.\n"
         )
-        sys.exit(2)
+        sys.exit(1)
+
+    from passgen.server import run
+
+    sys.stderr.write(f"Listening on {path}\n")
+    try:
+        run(path)
+    except OSError as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+    sys.exit(0)
+
+
+def _write_secret(data, end=b""):
+    """Write bytes-like data to stdout's binary buffer, after any pending text."""
+    stdout = getattr(sys.stdout, "buffer", None)
+    if stdout is None:  # a text-only replacement for sys.stdout
+        sys.stdout.write(str(data, "ascii") + end.decode("ascii"))
+        return
+    sys.stdout.flush()
+    stdout.write(data)
+    stdout.write(end)
+    stdout.flush()
+
+
+def deliver(secret, no_clipboard):
+    """Print secret, copy it to the clipboard unless disabled, and exit.
+
+    secret is a str or a SecretBuffer; the latter is written as bytes and
+    zeroed before exiting.
+    """
+    try:
+        if isinstance(secret, SecretBuffer):
+            _write_secret(secret.view, b"\n")
+        else:
+            sys.stdout.write(secret + "\n")
+        if no_clipboard:
+            sys.exit(0)
+
+        success = copy_to_clipboard(secret)
+        if success:
+            sys.stderr.write("Password copied to clipboard.\n")
+            sys.exit(0)
+        else:
+            sys.stderr.write(
+                "Warning: could not copy to clipboard — paste from terminal output.\n"
+            )
+            sys.exit(2)
+    finally:
+        if isinstance(secret, SecretBuffer):
+            secret.zero()
+
+
+def passphrase_main(argv):
+    """`passgen passphrase`: generate diceware-style passphrases."""
+    parser = argparse.ArgumentParser(
+        prog="passgen passphrase",
+        description="Generate a passphrase of random words from a wordlist.",
+    )
+    parser.add_argument(
+        "--wordlist",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Indexed wordlist built by `passgen wordlist` "
+            "(default: $PASSGEN_WORDLIST)."
+        ),
+    )
+    parser.add_argument(
+        "--words",
+        type=int,
+        default=6,
+        metavar="N",
+        help="Number of words in the passphrase (3–64, default: 6).",
+    )
+    parser.add_argument(
+        "--separator",
+        default="-",
+        metavar="S",
+        help="String placed between words (default: '-').",
+    )
+    parser.add_argument(
+        "--capitalize",
+        action="store_true",
+        default=False,
+        help="Upper-case the first letter of every word.",
+    )
+    parser.add_argument(
+        "--numbers",
+        action="store_true",
+        default=False,
+        help="Append a random digit to one randomly chosen word.",
+    )
+    parser.add_argument(
+        "--symbols",
+        action="store_true",
+        default=False,
+        help="Append a random symbol to one randomly chosen word.",
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Print N passphrases, one per line, without touching the clipboard.",
+    )
+    parser.add_argument(
+        "--no-clipboard",
+        action="store_true",
+        default=False,
+        help="Print the passphrase without copying it to the clipboard.",
+    )
+    args = parser.parse_args(argv)
+    if args.words < 3:
+        sys.stderr.write("Error: --words must be at least 3.\n")
+        sys.exit(1)
+    if args.words > 64:
+        sys.stderr.write("Error: --words must be at most 64.\n")
+        sys.exit(1)
+    if args.count is not None and args.count < 1:
+        sys.stderr.write("Error: --count must be a positive integer.\n")
+        sys.exit(1)
+
+    from passgen.passphrase import (
+        WORDLIST_ENV,
+        PassphraseConfig,
+        Wordlist,
+        generate_passphrases,
+    )
+
+    path = args.wordlist or os.environ.get(WORDLIST_ENV)
+    if not path:
+        sys.stderr.write(
+            f"Error: no wordlist; pass --wordlist or set {WORDLIST_ENV}.\n"
+        )
+        sys.exit(1)
+    try:
+        wordlist = Wordlist(path)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+
+    config = PassphraseConfig(
+        words=args.words,
+        separator=args.separator,
+        capitalize=args.capitalize,
+        include_numbers=args.numbers,
+        include_symbols=args.symbols,
+    )
+    with wordlist:
+        if args.count is not None:
+            for start in range(0, args.count, STREAM_BATCH):
+                n = min(STREAM_BATCH, args.count - start)
+                batch = generate_passphrases(config, wordlist, n)
+                sys.stdout.write("\n".join(batch) + "\n")
+            sys.exit(0)
+        passphrase = generate_passphrases(config, wordlist, 1)[0]
+    deliver(passphrase, args.no_clipboard)
+
+
+def template_main(argv):
+    """`passgen template`: generate passwords shaped by a pattern template."""
+    parser = argparse.ArgumentParser(
+        prog="passgen template",
+        description=(
+            "Generate a pronounceable or pattern-shaped password, e.g. "
+            "`passgen template Cvccvc-99-Cvccvc`."
+        ),
+        epilog=(
+            "Placeholders: c/C consonant, v/V vowel, l/u lower/upper-case letter, "
+            "a letter, x letter or digit, 9 digit, s symbol, [...] one of the "
+            "listed characters (ranges like a-f allowed). \\X is a literal X; "
+            "every other character is copied as is."
+        ),
+    )
+    parser.add_argument("pattern", help="The template, e.g. Cvccvc-99-Cvccvc.")
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Print N passwords, one per line, without touching the clipboard.",
+    )
+    parser.add_argument(
+        "--show-entropy",
+        action="store_true",
+        default=False,
+        help="Report the exact entropy of the template on stderr.",
+    )
+    parser.add_argument(
+        "--no-clipboard",
+        action="store_true",
+        default=False,
+        help="Print the password without copying it to the clipboard.",
+    )
+    args = parser.parse_args(argv)
+    if args.count is not None and args.count < 1:
+        sys.stderr.write("Error: --count must be a positive integer.\n")
+        sys.exit(1)
+
+    from passgen.template import compile_template, generate_template_passwords
+
+    try:
+        compiled = compile_template(args.pattern)
+    except ValueError as exc:
+        sys.stderr.write(f"Error: {exc}.\n")
+        sys.exit(1)
+    if args.show_entropy:
+        sys.stderr.write(f"Entropy: {compiled.entropy_bits:.1f} bits\n")
+
+    if args.count is not None:
+        for start in range(0, args.count, STREAM_BATCH):
+            n = min(STREAM_BATCH, args.count - start)
+            batch = generate_template_passwords(args.pattern, n)
+            sys.stdout.write("\n".join(batch) + "\n")
+        sys.exit(0)
+    deliver(generate_template_passwords(args.pattern, 1)[0], args.no_clipboard)
+
+
+def wordlist_main(argv):
+    """`passgen wordlist`: compile a text wordlist into the indexed format."""
+    parser = argparse.ArgumentParser(
+        prog="passgen wordlist",
+        description=(
+            "Build an indexed wordlist for `passgen passphrase` from a text "
+            "file with one word per line (EFF dice-numbered lists are accepted)."
+        ),
+    )
+    parser.add_argument("source", help="Text wordlist ('-' for stdin).")
+    parser.add_argument("output", help="Path of the indexed wordlist to write.")
+    args = parser.parse_args(argv)
+
+    from passgen.passphrase import read_words, write_wordlist
+
+    try:
+        if args.source == "-":
+            words = read_words(sys.stdin)
+        else:
+            with open(args.source, encoding="utf-8") as fh:
+                words = read_words(fh)
+        count = write_wordlist(words, args.output)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+    sys.stderr.write(f"Wrote {count} words to {args.output}\n")
+    sys.exit(0)
+
+
+def score_main(argv):
+    """`passgen score`: estimate the entropy of each password read from stdin."""
+    parser = argparse.ArgumentParser(
+        prog="passgen score",
+        description=(
+            "Read passwords from stdin, one per line, and print the estimated "
+            "entropy in bits of each, one per line. Passwords are never echoed."
+        ),
+    )
+    parser.parse_args(argv)
+
+    from passgen.strength import score_passwords
+
+    passwords = (line.rstrip("\r\n") for line in sys.stdin)
+    write = sys.stdout.write
+    for bits in score_passwords(passwords):
+        write(f"{bits:.1f}\n")
+    sys.exit(0)
+
+
+def _write_output(path, write):
+    """Return write(fh) for stdout ('-') or for path, created owner-only."""
+    if path == "-":
+        result = write(sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return result
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as out:
+        return write(out)
+
+
+def _import_encryption():
+    """passgen.encryption, or exit 1 if `cryptography` is not installed."""
+    try:
+        import passgen.encryption
+    except ImportError:
+        sys.stderr.write(
+            "Error: encryption needs the 'cryptography' package "
+            "(pip install 'passgen[encrypt]').\n"
+        )
+        sys.exit(1)
+    return passgen.encryption
+
+
+def export_main(argv):
+    """`passgen export`: one password per input ID, written as CSV/JSONL/binary."""
+    from passgen.export import FORMATS, MAX_ID_WIDTH, export_passwords
+
+    parser = argparse.ArgumentParser(
+        prog="passgen export",
+        description=(
+            "Read IDs, one per line, and write each with a freshly generated "
+            "password. Output files are created readable by the owner only."
+        ),
+    )
+    parser.add_argument(
+        "--input",
+        default="-",
+        metavar="PATH",
+        help="File of IDs, one per line (default: '-' for stdin).",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        metavar="PATH",
+        help="File to write (default: '-' for stdout).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="Output format (default: csv).",
+    )
+    parser.add_argument(
+        "--id-width",
+        type=int,
+        default=32,
+        metavar="W",
+        help=f"Bytes per ID in the binary format (1–{MAX_ID_WIDTH}, default: 32).",
+    )
+    parser.add_argument(
+        "--encrypt",
+        default=None,
+        metavar="KEYFILE",
+        help=(
+            "Encrypt the output with the AES-256-GCM key in KEYFILE (see "
+            "`passgen keygen`); read it back with `passgen decrypt`."
+        ),
+    )
+    add_password_options(parser)
+    add_dedupe_options(parser)
+    args = parser.parse_args(argv)
+    config = config_from_args(args)
+
+    key = None
+    if args.encrypt is not None:
+        encryption = _import_encryption()
+        try:
+            key = encryption.load_key(args.encrypt)
+        except (OSError, ValueError) as exc:
+            sys.stderr.write(f"Error: {exc}\n")
+            sys.exit(1)
+
+    def export_to(source, out):
+        options = {"fmt": args.format, "id_width": args.id_width, "index": index}
+        if key is None:
+            return export_passwords(source, config, out, **options)
+        with encryption.EncryptedWriter(out, key) as sink:
+            return export_passwords(source, config, sink, **options)
+
+    index = open_dedupe_index(args)
+    try:
+        if args.input == "-":
+            count = _write_output(args.output, lambda out: export_to(sys.stdin, out))
+        else:
+            with open(args.input, encoding="utf-8") as source:
+                count = _write_output(args.output, lambda out: export_to(source, out))
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+    finally:
+        if index is not None:
+            index.close()
+    if args.output != "-":
+        sys.stderr.write(f"Exported {count} passwords to {args.output}\n")
+    sys.exit(0)
+
+
+def keygen_main(argv):
+    """`passgen keygen`: create a key file for `export --encrypt`."""
+    parser = argparse.ArgumentParser(
+        prog="passgen keygen",
+        description=(
+            "Write a new random AES-256 key for `passgen export --encrypt` and "
+            "`passgen decrypt` to PATH (created readable by the owner only; "
+            "never overwritten)."
+        ),
+    )
+    parser.add_argument("path", help="Key file to create.")
+    args = parser.parse_args(argv)
+
+    encryption = _import_encryption()
+    try:
+        encryption.write_key(args.path)
+    except OSError as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+    sys.stderr.write(f"Wrote key to {args.path}\n")
+    sys.exit(0)
+
+
+def decrypt_main(argv):
+    """`passgen decrypt`: stream the plaintext of `export --encrypt` output."""
+    parser = argparse.ArgumentParser(
+        prog="passgen decrypt",
+        description=(
+            "Decrypt a stream written by `passgen export --encrypt`. Output is "
+            "written as it is authenticated; the command exits 1 if the stream "
+            "turns out to be truncated or tampered with."
+        ),
+    )
+    parser.add_argument(
+        "--key-file",
+        required=True,
+        metavar="KEYFILE",
+        help="Key the stream was encrypted with.",
+    )
+    parser.add_argument(
+        "--input",
+        default="-",
+        metavar="PATH",
+        help="Encrypted stream (default: '-' for stdin).",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        metavar="PATH",
+        help="File to write (default: '-' for stdout).",
+    )
+    args = parser.parse_args(argv)
+
+    encryption = _import_encryption()
+
+    def decrypt_to(source, out):
+        for chunk in encryption.decrypt_stream(source, key):
+            out.write(chunk)
+
+    try:
+        key = encryption.load_key(args.key_file)
+        if args.input == "-":
+            _write_output(args.output, lambda out: decrypt_to(sys.stdin.buffer, out))
+        else:
+            with open(args.input, "rb") as source:
+                _write_output(args.output, lambda out: decrypt_to(source, out))
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+    sys.exit(0)
+
+
+def fixtures_main(argv):
+    """`passgen fixtures`: deterministic, NOT SECRET passwords for load tests."""
+    parser = argparse.ArgumentParser(
+        prog="passgen fixtures",
+        description=(
+            "Print passwords START to STOP - 1 of a reproducible sequence "
+            "derived from a seed file, one per line. Anyone with the seed can "
+            "regenerate them: use them only as load-testing fixtures."
+        ),
+    )
+    parser.add_argument(
+        "--seed-file",
+        required=True,
+        metavar="PATH",
+        help="File whose contents seed the sequence (at least 16 bytes).",
+    )
+    parser.add_argument(
+        "--insecure",
+        action="store_true",
+        default=False,
+        help="Required: acknowledge that these passwords are not secret.",
+    )
+    parser.add_argument(
+        "--start",
+        type=int,
+        default=0,
+        metavar="A",
+        help="Index of the first password (default: 0).",
+    )
+    parser.add_argument(
+        "--stop",
+        type=int,
+        required=True,
+        metavar="B",
+        help="Index one past the last password.",
+    )
+    add_password_options(parser)
+    args = parser.parse_args(argv)
+    if not args.insecure:
+        sys.stderr.write(
+            "Error: fixtures are reproducible from the seed file and must never "
+            "be used as real passwords; pass --insecure to confirm.\n"
+        )
+        sys.exit(1)
+    if not 0 <= args.start <= args.stop:
+        sys.stderr.write("Error: need 0 <= --start <= --stop.\n")
+        sys.exit(1)
+    config = config_from_args(args)
+
+    from passgen.fixtures import BLOCK_SIZE, fixture_passwords, load_seed
+
+    try:
+        seed = load_seed(args.seed_file)
+        # Whole blocks at a time, so each is generated exactly once.
+        start = args.start
+        while start < args.stop:
+            stop = min((start // BLOCK_SIZE + 1) * BLOCK_SIZE, args.stop)
+            batch = fixture_passwords(config, seed, start, stop)
+            sys.stdout.write("\n".join(batch) + "\n")
+            start = stop
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Error: {exc}\n")
+        sys.exit(1)
+    sys.exit(0)
+
+
+# Subcommands dispatched on the first argument; anything else is the
+# default generate-one-password command.
+COMMANDS = {
+    "serve": serve_main,
+    "passphrase": passphrase_main,
+    "template": template_main,
+    "wordlist": wordlist_main,
+    "score": score_main,
+    "export": export_main,
+    "keygen": keygen_main,
+    "decrypt": decrypt_main,
+    "fixtures": fixtures_main,
+}
+
+
+def main(argv=None):
+    """CLI entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        COMMANDS[argv[0]](argv[1:])
+        return
+    args = parse_args(argv)
+    config = config_from_args(args)
+
+    if args.count is not None and args.count < 1 and args.count != -1:
+        sys.stderr.write("Error: --count must be a positive integer or -1.\n")
+        sys.exit(1)
+    if args.jobs < 1:
+        sys.stderr.write("Error: --jobs must be at least 1.\n")
+        sys.exit(1)
+    if args.jobs > 1 and args.count is None:
+        sys.stderr.write("Error: --jobs requires --count.\n")
+        sys.exit(1)
+    index = open_dedupe_index(args)
+    try:
+        if args.show_entropy:
+            from passgen.strength import config_entropy
+
+            sys.stderr.write(f"Entropy: {config_entropy(config):.1f} bits\n")
+        if args.count is not None:
+            stream_passwords(config, args.count, jobs=args.jobs, index=index)
+            sys.exit(0)
+
+        password = None
+        if index is not None:
+            from passgen.dedupe import generate_unique_passwords
+
+            password = generate_unique_passwords(config, 1, index)[0]
+        elif not args.no_daemon:
+            password = fetch_from_daemon(args.socket or default_socket_path(), config)
+        if password is None and CompiledPolicy.from_config(config).is_ascii:
+            password = generate_secret(config)
+        elif password is None:
+            password = generate_password(config)
+    except ValueError as exc:
+        sys.stderr.write(f"Error: {exc}.\n")
+        sys.exit(1)
+    finally:
+        if index is not None:
+            index.close()
+    deliver(password, args.no_clipboard)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+"""Thin client for the passgen daemon (see passgen.server).
+
+Only os and stat are imported at module level so the CLI can probe for a
+running daemon without paying for socket/json on the local path.
+"""
+from __future__ import annotations
+
+import os
+import stat
+
+from passgen.generator import PasswordConfig
+
+SOCKET_ENV = "PASSGEN_SOCKET"
+SOCKET_NAME = "passgen.sock"
+
+
+def default_socket_path() -> str | None:
+    """$PASSGEN_SOCKET, else $XDG_RUNTIME_DIR/passgen.sock, else None."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    return None
+
+
+def socket_is_trusted(path: str) -> bool:
+    """True if path is a Unix socket owned by the current user.
+
+    A socket planted by another user could hand out attacker-chosen
+    passwords, so anything else is ignored.
+    """
+    if not hasattr(os, "getuid"):
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def request_passwords(
+    path: str, config: PasswordConfig, count: int = 1, timeout: float = 2.0
+) -> list[str]:
+    """Ask the daemon at path for count passwords matching config.
+
+    Raises OSError if the daemon cannot be reached and ValueError if it
+    rejects the request or replies with something malformed. Configs using
+    policy fields the protocol does not carry (minimums, max_repeat,
+    exclusions, forbidden substrings) raise ValueError without connecting.
+    """
+    import json
+    import socket
+
+    basic = PasswordConfig(
+        length=config.length,
+        include_symbols=config.include_symbols,
+        include_numbers=config.include_numbers,
+        strategy=config.strategy,
+    )
+    if config != basic:
+        raise ValueError("the daemon protocol cannot express this password policy")
+    request = {
+        "length": config.length,
+        "symbols": config.include_symbols,
+        "numbers": config.include_numbers,
+        "strategy": config.strategy,
+        "count": count,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reply:
+            line = reply.readline()
+    response = json.loads(line)
+    if not isinstance(response, dict):
+        raise ValueError("malformed reply from daemon")
+    if "error" in response:
+        raise ValueError(f"daemon rejected request: {response['error']}")
+    passwords = response.get("passwords")
+    if (
+        not isinstance(passwords, list)
+        or len(passwords) != count
+        or not all(isinstance(p, str) and len(p) == config.length for p in passwords)
+    ):
+        raise ValueError("malformed reply from daemon")
+    return passwords
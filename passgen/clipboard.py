@@ -1,8 +1,19 @@
-import pyperclip
+def copy_to_clipboard(password) -> bool:
+    """Copy password to clipboard. Returns True on success, False on failure.
 
+    password is a str or a passgen.secret.SecretBuffer. pyperclip only
+    accepts str, so a SecretBuffer is decoded just for the copy call.
 
-def copy_to_clipboard(password: str) -> bool:
-    """Copy password to clipboard. Returns True on success, False on failure."""
+    pyperclip is imported on first use rather than at module import: it
+    probes for clipboard backends, which is wasted startup time whenever no
+    copy is requested.
+    """
+    try:
+        import pyperclip
+    except ImportError:
+        return False
+    if not isinstance(password, str):
+        password = password.decode()
     try:
         pyperclip.copy(password)
         return True
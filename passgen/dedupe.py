@@ -0,0 +1,333 @@
+"""Uniqueness across batches: a compact, optionally persistent password index.
+
+DedupeIndex stores a keyed 64-bit BLAKE2b fingerprint of every password it
+has seen in an open-addressing (linear probing) table of uint64 slots,
+kept at most two-thirds full: 12 to 24 bytes per entry, against roughly
+100 for a Python set of short strings, and an O(1) check-and-insert.
+
+A fingerprint match means "probably seen"; the false-positive rate is
+about n / 2**64 per check (under 1e-11 at 10 million entries), and a
+false positive only discards a fresh password, so uniqueness is never
+violated. There are no false negatives.
+
+Index file format (header little-endian, slots in host byte order):
+
+    magic     8 bytes   b"PGDEDUP1"
+    key      16 bytes   BLAKE2b key for this index
+    capacity  8 bytes   slot count, a power of two
+    count     8 bytes   occupied slots (an upper bound while a batch is added)
+    slots     8 * capacity bytes; 0 marks an empty slot
+
+Persistent indexes are memory-mapped and locked against concurrent use.
+They survive the process being killed at any point: the header count is
+raised before a batch is inserted, so it never understates how full the
+table is, and a grown table is written to a temporary file and renamed
+over the old one.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import secrets
+import struct
+from array import array
+from contextlib import suppress
+from hashlib import blake2b
+from typing import Iterable, Iterator
+
+from passgen.generator import (
+    EntropySource,
+    PasswordConfig,
+    _as_buffer,
+    generate_passwords,
+)
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+MAGIC = b"PGDEDUP1"
+HEADER = struct.Struct("<8s16sQQ")
+KEY_SIZE = 16
+MIN_CAPACITY = 1 << 10
+# Consecutive duplicate draws tolerated before the space counts as exhausted.
+EXHAUSTED_ATTEMPTS = 10_000
+
+
+class DedupeIndex:
+    """Set of password fingerprints, in memory or in a file at path."""
+
+    def __init__(self, path: str | None = None, capacity: int = MIN_CAPACITY):
+        self._path = path
+        self._fd = None
+        self._mm = None
+        self._slots = None
+        try:
+            if path is None:
+                self._key = secrets.token_bytes(KEY_SIZE)
+                self._count = 0
+                self._allocate(_capacity_for(capacity))
+            else:
+                self._open(path, _capacity_for(capacity))
+        except BaseException:
+            self.close()
+            raise
+
+    def _allocate(self, capacity: int) -> None:
+        """Point _slots at a zeroed table of capacity slots (a new file's, if any)."""
+        self._capacity = capacity
+        self._mask = capacity - 1
+        if self._path is None:
+            self._buffer = bytearray(8 * capacity)
+            self._slots = memoryview(self._buffer).cast("Q")
+            return
+        # The header goes last: until it is written the file reads as new.
+        os.ftruncate(self._fd, HEADER.size + 8 * capacity)
+        self._map()
+        self._write_header(self._count)
+
+    def _map(self) -> None:
+        self._mm = mmap.mmap(self._fd, 0)
+        self._slots = memoryview(self._mm)[HEADER.size:].cast("Q")
+
+    def _unmap(self) -> None:
+        if self._slots is not None:
+            self._slots.release()
+            self._slots = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+    def _open(self, path: str, capacity: int) -> None:
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise ValueError(f"{path}: index is in use by another process") from None
+        header = os.pread(self._fd, HEADER.size, 0)
+        if not header or header == bytes(HEADER.size):  # new, or never initialized
+            self._key = secrets.token_bytes(KEY_SIZE)
+            self._count = 0
+            self._allocate(capacity)
+            return
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path}: not a passgen dedupe index")
+        magic, self._key, capacity, self._count = HEADER.unpack(header)
+        if magic != MAGIC or capacity < MIN_CAPACITY or capacity & (capacity - 1):
+            raise ValueError(f"{path}: not a passgen dedupe index")
+        if os.fstat(self._fd).st_size != HEADER.size + 8 * capacity:
+            raise ValueError(f"{path}: truncated dedupe index")
+        self._capacity = capacity
+        self._mask = capacity - 1
+        self._map()
+
+    def _resize(self, capacity: int) -> None:
+        """Move to a table of capacity slots, re-inserting every fingerprint."""
+        table = bytearray(8 * capacity)
+        slots, mask = memoryview(table).cast("Q"), capacity - 1
+        old = array("Q")
+        old.frombytes(self._slots.cast("B"))
+        for fp in old:
+            if fp:
+                i = fp & mask
+                while slots[i]:
+                    i = (i + 1) & mask
+                slots[i] = fp
+        slots.release()
+        if self._path is None:
+            self._slots.release()
+            self._buffer = table
+            self._slots = memoryview(table).cast("Q")
+        else:
+            self._replace_file(table, capacity)
+        self._capacity = capacity
+        self._mask = mask
+
+    def _replace_file(self, table: bytearray, capacity: int) -> None:
+        """Atomically swap the index file for one holding table."""
+        tmp = f"{self._path}.tmp"
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            header = HEADER.pack(MAGIC, self._key, capacity, self._count)
+            _pwrite_all(fd, header + table, 0)
+            os.fsync(fd)
+            os.replace(tmp, self._path)
+        except BaseException:
+            os.close(fd)
+            with suppress(OSError):
+                os.unlink(tmp)
+            raise
+        self._unmap()
+        os.close(self._fd)  # drops the lock on the old file
+        self._fd = fd
+        self._map()
+        _fsync_dir(self._path)
+
+    def _write_header(self, count: int) -> None:
+        os.pwrite(self._fd, HEADER.pack(MAGIC, self._key, self._capacity, count), 0)
+
+    def _fingerprint(self, password: str) -> int:
+        digest = blake2b(password.encode("utf-8"), digest_size=8, key=self._key).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, password: str) -> bool:
+        fp = self._fingerprint(password)
+        slots, mask = self._slots, self._mask
+        i = fp & mask
+        while True:
+            slot = slots[i]
+            if slot == fp:
+                return True
+            if not slot:
+                return False
+            i = (i + 1) & mask
+
+    def add_new(self, passwords: Iterable[str]) -> list[str]:
+        """Add passwords; return, in order, those that were not already present."""
+        passwords = list(passwords)
+        # Grow up front so the probe loop below never has to.
+        capacity = _capacity_for(self._count + len(passwords))
+        if capacity > self._capacity:
+            self._resize(capacity)
+        key = self._key
+        fingerprints = [
+            int.from_bytes(
+                blake2b(p.encode("utf-8"), digest_size=8, key=key).digest(), "little"
+            ) or 1
+            for p in passwords
+        ]
+        if self._fd is not None:
+            # Claim the room first: a kill mid-batch then leaves the count
+            # too high (harmless) rather than too low (an overfull table).
+            self._write_header(self._count + len(passwords))
+        slots, mask = self._slots, self._mask
+        fresh = []
+        for password, fp in zip(passwords, fingerprints):
+            i = fp & mask
+            while True:
+                slot = slots[i]
+                if not slot:
+                    slots[i] = fp
+                    fresh.append(password)
+                    break
+                if slot == fp:
+                    break
+                i = (i + 1) & mask
+        self._count += len(fresh)
+        if self._fd is not None:
+            self._write_header(self._count)
+        return fresh
+
+    def add(self, password: str) -> bool:
+        """Add password; return False if it was already present."""
+        return bool(self.add_new((password,)))
+
+    def flush(self) -> None:
+        """Persist the header and table (no-op for in-memory indexes)."""
+        if self._fd is None or self._slots is None:
+            return
+        self._mm.flush()
+        self._write_header(self._count)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            self.flush()
+            self._unmap()
+            os.close(self._fd)  # also drops the lock
+            self._fd = None
+        elif self._slots is not None:
+            self._slots.release()
+            self._slots = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _capacity_for(entries: int) -> int:
+    """Smallest power-of-two table keeping entries at most two-thirds full."""
+    capacity = MIN_CAPACITY
+    while 2 * capacity < 3 * entries:
+        capacity *= 2
+    return capacity
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def _fsync_dir(path: str) -> None:
+    """Make a rename in path's directory durable, where directories can be synced."""
+    with suppress(OSError):
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def unique_batches(
+    batches: Iterable[list[str]], index: DedupeIndex, count: int | None = None
+) -> Iterator[list[str]]:
+    """Yield batches with every password already in index removed.
+
+    Stops after count passwords (never when count is None); raises
+    ValueError when the batches keep repeating seen passwords.
+    """
+    missed = 0
+    for batch in batches:
+        if count is not None:
+            batch = batch[:count]
+        fresh = index.add_new(batch)
+        missed = 0 if fresh else missed + len(batch)
+        if missed >= EXHAUSTED_ATTEMPTS:
+            raise ValueError("nearly every possible password has already been issued")
+        if fresh:
+            yield fresh
+        if count is not None:
+            count -= len(fresh)
+            if count == 0:
+                return
+
+
+def generate_unique_passwords(
+    config: PasswordConfig,
+    count: int,
+    index: DedupeIndex,
+    entropy: EntropySource | None = None,
+) -> list[str]:
+    """generate_passwords(), minus anything in index; the result is added to it.
+
+    Nothing is added if the space runs out first (ValueError), so the index
+    only ever records passwords that were returned.
+    """
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    entropy = _as_buffer(entropy)
+    passwords = []
+    taken = set()
+    missed = 0
+    while len(passwords) < count:
+        batch = generate_passwords(config, count - len(passwords), entropy=entropy)
+        fresh = [p for p in batch if p not in taken and p not in index]
+        fresh = list(dict.fromkeys(fresh))
+        taken.update(fresh)
+        passwords += fresh
+        missed = 0 if fresh else missed + len(batch)
+        if missed >= EXHAUSTED_ATTEMPTS:
+            raise ValueError("nearly every possible password has already been issued")
+    index.add_new(passwords)
+    return passwords
@@ -0,0 +1,216 @@
+"""Streaming AES-256-GCM encryption for bulk output (needs `cryptography`).
+
+Stream format:
+
+    magic   8 bytes  b"PGSEAL01"
+    prefix  7 bytes  random nonce prefix, fresh for every stream
+    frames  each: 4-byte big-endian header, then ciphertext + 16-byte tag
+
+The frame header holds the ciphertext length, with the top bit set on the
+final frame. Frame i is sealed under the nonce prefix || i (4 bytes) ||
+final flag (1 byte) with the stream header as associated data, so frames
+cannot be reordered, moved between streams or dropped from the end
+without decryption failing: a stream is only complete once its final
+frame has been authenticated.
+
+EncryptedWriter seals and writes frames on a background thread from a
+small pool of reusable plaintext buffers, so encryption and output I/O
+(both of which release the GIL) overlap with password generation, and
+each buffer is wiped as soon as its frame is sealed.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import secrets
+import struct
+import threading
+from typing import BinaryIO, Iterator
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+MAGIC = b"PGSEAL01"
+PREFIX_SIZE = 7
+HEADER_SIZE = len(MAGIC) + PREFIX_SIZE
+KEY_SIZE = 32
+TAG_SIZE = 16
+FRAME_SIZE = 1 << 20
+MAX_FRAMES = 1 << 32
+# Plaintext buffers in flight between the producer and the sealing thread.
+PIPELINE_DEPTH = 3
+
+_FRAME = struct.Struct(">I")
+_FINAL = 1 << 31
+
+
+def write_key(path: str) -> None:
+    """Create path holding a new random key, readable by the owner only.
+
+    Refuses to overwrite an existing file.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as fh:
+        fh.write(secrets.token_hex(KEY_SIZE) + "\n")
+
+
+def load_key(path: str) -> bytes:
+    """Read a key written by write_key()."""
+    with open(path) as fh:
+        text = fh.read().strip()
+    try:
+        key = bytes.fromhex(text)
+    except ValueError:
+        key = b""
+    if len(key) != KEY_SIZE:
+        raise ValueError(f"{path}: not a passgen key ({2 * KEY_SIZE} hex digits)")
+    return key
+
+
+def _nonce(prefix: bytes, index: int, final: bool) -> bytes:
+    if index >= MAX_FRAMES:
+        raise ValueError("stream has too many frames")
+    return prefix + index.to_bytes(4, "big") + (b"\x01" if final else b"\x00")
+
+
+class EncryptedWriter:
+    """Binary file-like sink that writes an encrypted stream to fh.
+
+    close() seals the final frame; leaving a `with` block by an exception
+    stops without it, so a partial stream never decrypts as complete.
+    """
+
+    def __init__(self, fh: BinaryIO, key: bytes):
+        self._fh = fh
+        self._aead = AESGCM(key)
+        prefix = secrets.token_bytes(PREFIX_SIZE)
+        self._header = MAGIC + prefix
+        self._prefix = prefix
+        self._index = 0
+        self._error = None
+        self._closed = False
+        self._free = queue.Queue()
+        for _ in range(PIPELINE_DEPTH):
+            self._free.put(bytearray(FRAME_SIZE))
+        self._full = queue.Queue()
+        fh.write(self._header)
+        self._thread = threading.Thread(target=self._seal_frames, daemon=True)
+        self._thread.start()
+
+    def _seal(self, data, final: bool) -> None:
+        sealed = self._aead.encrypt(
+            _nonce(self._prefix, self._index, final), data, self._header
+        )
+        self._index += 1
+        self._fh.write(_FRAME.pack(len(sealed) | (_FINAL if final else 0)))
+        self._fh.write(sealed)
+
+    def _seal_frames(self) -> None:
+        while True:
+            item = self._full.get()
+            if item is None:
+                return
+            buf, n = item
+            view = memoryview(buf)
+            try:
+                if self._error is None:
+                    self._seal(view[:n], final=False)
+            except Exception as exc:  # noqa: BLE001 - re-raised by the producer
+                self._error = exc
+            finally:
+                view[:n] = bytes(n)
+                view.release()
+                self._free.put(buf)
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data) -> int:
+        if self._closed:
+            raise ValueError("write to closed EncryptedWriter")
+        view = memoryview(data).cast("B")
+        for start in range(0, len(view), FRAME_SIZE):
+            piece = view[start:start + FRAME_SIZE]
+            buf = self._free.get()
+            self._check()
+            buf[:len(piece)] = piece
+            self._full.put((buf, len(piece)))
+        return len(view)
+
+    def flush(self) -> None:
+        self._check()
+
+    def _stop(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._full.put(None)
+            self._thread.join()
+
+    def close(self) -> None:
+        """Seal the final frame; the stream is complete only after this."""
+        if self._closed:
+            return
+        self._stop()
+        self._check()
+        self._seal(b"", final=True)
+        self._fh.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._stop()
+
+
+def _read_exactly(fh: BinaryIO, n: int) -> bytes:
+    data = fh.read(n)
+    while len(data) < n:
+        more = fh.read(n - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+
+def decrypt_stream(fh: BinaryIO, key: bytes) -> Iterator[bytes]:
+    """Yield the plaintext of an encrypted stream read from fh, frame by frame.
+
+    Every yielded frame is authenticated, but the stream as a whole is only
+    known to be complete when the generator finishes: truncation, tampering
+    or a wrong key raise ValueError, possibly after earlier frames.
+    """
+    aead = AESGCM(key)
+    header = _read_exactly(fh, HEADER_SIZE)
+    if len(header) != HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError("not a passgen encrypted stream")
+    prefix = header[len(MAGIC):]
+    index = 0
+    while True:
+        head = _read_exactly(fh, _FRAME.size)
+        if len(head) != _FRAME.size:
+            raise ValueError("encrypted stream is truncated")
+        (size,) = _FRAME.unpack(head)
+        final = bool(size & _FINAL)
+        size &= ~_FINAL
+        if not TAG_SIZE <= size <= FRAME_SIZE + TAG_SIZE:
+            raise ValueError("encrypted stream is corrupt")
+        sealed = _read_exactly(fh, size)
+        if len(sealed) != size:
+            raise ValueError("encrypted stream is truncated")
+        try:
+            plaintext = aead.decrypt(_nonce(prefix, index, final), sealed, header)
+        except InvalidTag:
+            raise ValueError(
+                "decryption failed: wrong key or corrupted stream"
+            ) from None
+        index += 1
+        if final and fh.read(1):
+            raise ValueError("data after the end of the encrypted stream")
+        if plaintext:
+            yield plaintext
+        if final:
+            return
@@ -0,0 +1,205 @@
+"""Bulk export: one generated password per input ID, as CSV, JSONL or binary.
+
+IDs are read lazily, batch_size at a time, and every batch of output is
+built into one preallocated buffer that is handed to the file in
+CHUNK_SIZE writes, so exporting millions of records allocates per batch,
+not per record, and stays bounded in memory.
+
+Binary format (integers little-endian):
+
+    magic    8 bytes  b"PGEXPRT1"
+    id_width 2 bytes  W, bytes per ID field
+    pw_width 2 bytes  L, bytes per password field (the password length
+                      times the widest UTF-8 character of its alphabets)
+    records  W + L bytes each: UTF-8 ID then password, both NUL-padded
+"""
+from __future__ import annotations
+
+import struct
+from functools import lru_cache
+from itertools import islice
+from json.encoder import encode_basestring
+from typing import BinaryIO, Iterable, Iterator
+
+from passgen.dedupe import DedupeIndex, generate_unique_passwords
+from passgen.generator import (
+    CompiledPolicy,
+    EntropyBuffer,
+    PasswordConfig,
+    generate_passwords,
+)
+
+FORMATS = ("csv", "jsonl", "binary")
+CHUNK_SIZE = 1 << 20
+
+MAGIC = b"PGEXPRT1"
+HEADER = struct.Struct("<8sHH")
+MAX_ID_WIDTH = 1024
+
+_CSV_SPECIAL = frozenset(',"\r\n')
+
+
+class _ChunkWriter:
+    """Fills one preallocated buffer and writes it to fh whenever it is full."""
+
+    def __init__(self, fh: BinaryIO, size: int = CHUNK_SIZE):
+        self._fh = fh
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._pos = 0
+
+    def reserve(self, n: int) -> int:
+        """Make room for n (<= size) contiguous bytes; return their offset in buf."""
+        if self._pos + n > len(self._buf):
+            self.flush()
+        pos = self._pos
+        self._pos += n
+        return pos
+
+    @property
+    def buf(self) -> bytearray:
+        return self._buf
+
+    def write(self, data: bytes) -> None:
+        if len(data) > len(self._buf):
+            self.flush()
+            self._fh.write(data)
+            return
+        pos = self.reserve(len(data))
+        self._view[pos:pos + len(data)] = data
+
+    def flush(self) -> None:
+        if self._pos:
+            self._fh.write(self._view[:self._pos])
+            self._pos = 0
+
+    def close(self) -> None:
+        """Flush, then wipe the buffer so no passwords linger in it."""
+        self.flush()
+        self._view[:] = bytes(len(self._buf))
+        self._view.release()
+
+
+def _csv_quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _csv_rows(ids: list[str], passwords: list[str]) -> bytes:
+    plain = _CSV_SPECIAL.isdisjoint
+    if not plain("".join(ids)):
+        ids = [i if plain(i) else _csv_quote(i) for i in ids]
+    passwords = [p if plain(p) else _csv_quote(p) for p in passwords]
+    return "".join(
+        f"{i},{p}\r\n" for i, p in zip(ids, passwords)
+    ).encode("utf-8")
+
+
+def _jsonl_rows(ids: list[str], passwords: list[str]) -> bytes:
+    return "".join(
+        f'{{"id": {encode_basestring(i)}, "password": {encode_basestring(p)}}}\n'
+        for i, p in zip(ids, passwords)
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=8)
+def _record_block(id_width: int, pw_width: int, count: int) -> struct.Struct:
+    """Struct packing count consecutive (ID, password) records."""
+    return struct.Struct(f"{id_width}s{pw_width}s" * count)
+
+
+def _read_ids(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line:
+            yield line
+
+
+def export_passwords(
+    ids: Iterable[str],
+    config: PasswordConfig,
+    out: BinaryIO,
+    fmt: str = "csv",
+    id_width: int = 32,
+    batch_size: int = 4096,
+    index: DedupeIndex | None = None,
+) -> int:
+    """Write one password per ID in ids to out in fmt; return the record count.
+
+    ids is any iterable of lines (a file, sys.stdin); trailing newlines are
+    stripped and blank lines skipped. out must accept bytes. The CSV output
+    starts with an "id,password" header row. Binary IDs longer than
+    id_width UTF-8 bytes raise ValueError. With a DedupeIndex as index,
+    every password is one the index has not seen, and is added to it.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {FORMATS}")
+    if not 1 <= id_width <= MAX_ID_WIDTH:
+        raise ValueError(f"id_width must be between 1 and {MAX_ID_WIDTH}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+
+    pool = CompiledPolicy.from_config(config).pool
+    char_width = 1 if pool.isascii() else max(len(c.encode("utf-8")) for c in pool)
+    pw_width = config.length * char_width
+    record = id_width + pw_width
+    if fmt == "binary":
+        # Keep every packed batch inside one chunk.
+        batch_size = max(1, min(batch_size, CHUNK_SIZE // record))
+    writer = _ChunkWriter(out)
+    entropy = EntropyBuffer(1 << 16)
+    lines = _read_ids(ids)
+    total = 0
+    try:
+        if fmt == "csv":
+            writer.write(b"id,password\r\n")
+        elif fmt == "binary":
+            writer.write(HEADER.pack(MAGIC, id_width, pw_width))
+        while True:
+            batch = list(islice(lines, batch_size))
+            if not batch:
+                break
+            if index is None:
+                passwords = generate_passwords(config, len(batch), entropy=entropy)
+            else:
+                passwords = generate_unique_passwords(
+                    config, len(batch), index, entropy=entropy
+                )
+            if fmt == "csv":
+                writer.write(_csv_rows(batch, passwords))
+            elif fmt == "jsonl":
+                writer.write(_jsonl_rows(batch, passwords))
+            else:
+                encoded = [i.encode("utf-8") for i in batch]
+                if max(map(len, encoded)) > id_width:
+                    raise ValueError(f"an ID is longer than {id_width} bytes")
+                fields = [None] * (2 * len(batch))
+                fields[::2] = encoded
+                fields[1::2] = [p.encode("utf-8") for p in passwords]
+                block = _record_block(id_width, pw_width, len(batch))
+                block.pack_into(writer.buf, writer.reserve(block.size), *fields)
+            total += len(batch)
+    finally:
+        writer.close()
+    return total
+
+
+def iter_binary_records(fh: BinaryIO) -> Iterator[tuple[str, str]]:
+    """Yield (id, password) from a binary export read from fh."""
+    header = fh.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise ValueError("not a passgen export")
+    magic, id_width, pw_width = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("not a passgen export")
+    record = struct.Struct(f"{id_width}s{pw_width}s")
+    per_chunk = max(1, CHUNK_SIZE // record.size)
+    while True:
+        data = fh.read(per_chunk * record.size)
+        if len(data) % record.size:
+            raise ValueError("truncated passgen export")
+        if not data:
+            return
+        for ident, password in record.iter_unpack(data):
+            yield ident.rstrip(b"\0").decode("utf-8"), password.rstrip(b"\0").decode(
+                "utf-8"
+            )
@@ -0,0 +1,117 @@
+"""Deterministic, NOT SECRET passwords for load-testing fixtures.
+
+Everything here is reproducible by anyone holding the seed: use it to
+generate the same test credentials on every run and every node, never for
+real accounts. Nothing in passgen reaches this module unless it is
+imported explicitly (or via the guarded `passgen fixtures` command).
+
+The sequence for a (seed, config) pair is split into blocks of BLOCK_SIZE
+passwords. Block j is generate_passwords(config, BLOCK_SIZE) drawing from
+SeededEntropy stream j, a SHAKE-256 keystream keyed by the seed, so any
+range [start, stop) is produced from the blocks it overlaps without
+generating the prefix.
+
+The key hashes a canonical encoding of only what shapes the output (see
+config_encoding), so equivalent configs share a sequence and unrelated
+PasswordConfig fields can be added without changing any. Random words are
+read little-endian on every host. Bump _DOMAIN whenever a sequence has to
+change.
+"""
+from __future__ import annotations
+
+import json
+from hashlib import blake2b, shake_256
+
+from passgen.generator import (
+    CompiledPolicy,
+    EntropyBuffer,
+    PasswordConfig,
+    _forbidden_substrings,
+    class_minimums,
+    generate_passwords,
+)
+
+BLOCK_SIZE = 1024
+MIN_SEED_SIZE = 16
+_DOMAIN = b"passgen fixtures v2"
+
+
+def load_seed(path: str) -> bytes:
+    """Read a seed file (any content, at least MIN_SEED_SIZE bytes)."""
+    with open(path, "rb") as fh:
+        seed = fh.read()
+    if len(seed) < MIN_SEED_SIZE:
+        raise ValueError(f"{path}: a seed needs at least {MIN_SEED_SIZE} bytes")
+    return seed
+
+
+def config_encoding(config: PasswordConfig) -> bytes:
+    """Canonical JSON of the settings that shape config's passwords.
+
+    Exclusions and forbidden substrings appear only through their effect
+    (the remaining character classes, the sorted multi-character
+    substrings), so their order and container type do not matter.
+    """
+    return json.dumps(
+        {
+            "classes": CompiledPolicy.from_config(config).classes,
+            "forbidden": _forbidden_substrings(config),
+            "length": config.length,
+            "max_repeat": config.max_repeat,
+            "minimums": class_minimums(config),
+            "strategy": config.strategy,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("ascii")
+
+
+def derive_key(seed: bytes, config: PasswordConfig) -> bytes:
+    """Key for the sequence of config; different configs get unrelated streams."""
+    return blake2b(
+        _DOMAIN + b"\0" + config_encoding(config),
+        digest_size=32, key=blake2b(seed).digest(), person=b"passgen-fixtures",
+    ).digest()
+
+
+class SeededEntropy(EntropyBuffer):
+    """Deterministic keystream standing in for the CSPRNG. NOT SECRET.
+
+    Each refill or large read is SHAKE-256(domain || key || stream || counter).
+    """
+
+    def __init__(self, key: bytes, stream: int, block_size: int = 4096):
+        super().__init__(block_size)
+        self._prefix = _DOMAIN + key + stream.to_bytes(8, "big")
+        self._counter = 0
+
+    def _draw(self, n: int) -> bytes:
+        block = shake_256(self._prefix + self._counter.to_bytes(8, "big")).digest(n)
+        self._counter += 1
+        return block
+
+    def _after_fork(self) -> None:
+        # The keystream is meant to be reproduced, in any process.
+        pass
+
+
+def fixture_passwords(
+    config: PasswordConfig, seed: bytes, start: int, stop: int
+) -> list[str]:
+    """Passwords [start, stop) of the deterministic sequence for seed and config."""
+    if not 0 <= start <= stop:
+        raise ValueError("need 0 <= start <= stop")
+    key = derive_key(seed, config)
+    passwords = []
+    for block in range(start // BLOCK_SIZE, -(-stop // BLOCK_SIZE)):
+        base = block * BLOCK_SIZE
+        batch = generate_passwords(
+            config, BLOCK_SIZE, entropy=SeededEntropy(key, block)
+        )
+        passwords += batch[max(start - base, 0):min(stop - base, BLOCK_SIZE)]
+    return passwords
+
+
+def fixture_password(config: PasswordConfig, seed: bytes, index: int) -> str:
+    """Password number index of the deterministic sequence for seed and config."""
+    return fixture_passwords(config, seed, index, index + 1)[0]
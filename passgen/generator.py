@@ -1,5 +1,19 @@
+from __future__ import annotations
+
+import math
+import os
 import secrets
-from dataclasses import dataclass
+import sys
+import threading
+import weakref
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from time import perf_counter
+from typing import Iterator, Protocol
+
+from passgen.metrics import GenerationStats
 
 
 class CharacterSet:
@@ -7,47 +21,1013 @@ class CharacterSet:
     UPPERCASE = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
     NUMBERS = "0123456789"
     SYMBOLS = "!@#$%^&*()-_=+[]{}|;:,.<>?"
+    # Easily confused glyphs dropped by PasswordConfig.exclude_ambiguous.
+    AMBIGUOUS = "0O1lI"
+
+
+# Named alphabets for PasswordConfig.alphabets (see alphabet()).
+ALPHABET_PRESETS = {
+    "pin": CharacterSet.NUMBERS,
+    "hex": "0123456789abcdef",
+    "base58": "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz",
+    "lowercase": CharacterSet.LOWERCASE,
+    "uppercase": CharacterSet.UPPERCASE,
+    "numbers": CharacterSet.NUMBERS,
+    "symbols": CharacterSet.SYMBOLS,
+}
+
+
+def alphabet(spec: str) -> str:
+    """The characters of the preset named spec, or spec itself."""
+    return ALPHABET_PRESETS.get(spec, spec)
 
 
 @dataclass
 class PasswordConfig:
+    """What to generate.
+
+    The min_* counts apply to enabled sets only. max_repeat limits runs of
+    one identical character. exclude (plus AMBIGUOUS when exclude_ambiguous
+    is set) removes characters from every set. No password contains any
+    forbidden substring (case-sensitive).
+
+    alphabets, when given, replaces the built-in sets (and the include_*
+    and min_* fields) with these strings of arbitrary Unicode characters,
+    each guaranteed at least once. They are NFC-normalized and
+    deduplicated when compiled and must not share characters.
+    """
+
     length: int = 16
     include_symbols: bool = True
     include_numbers: bool = True
+    strategy: str = "shuffle"
+    min_lowercase: int = 1
+    min_uppercase: int = 1
+    min_numbers: int = 1
+    min_symbols: int = 1
+    max_repeat: int | None = None
+    exclude: str = ""
+    exclude_ambiguous: bool = False
+    forbidden: tuple = field(default_factory=tuple)
+    alphabets: tuple = field(default_factory=tuple)
+
+
+# Batch engines accepted by generate_passwords().
+ENGINES = ("python", "numpy")
+
+# Generation strategies selectable via PasswordConfig.strategy:
+#   "shuffle" — one character from each enabled set, the rest from the pool,
+#               then a Fisher-Yates shuffle (the original method).
+#   "reject"  — every character from the pool; passwords missing an enabled
+#               set are discarded and redrawn. Exactly uniform over all valid
+#               passwords and needs no shuffle.
+# Configs with other minimums than one per set, with max_repeat or with
+# forbidden substrings are sampled by passgen.policy instead, exactly
+# uniformly over every valid password whichever strategy is named.
+STRATEGIES = ("shuffle", "reject")
+
+# Active GenerationStats, or None. Every hook is a single `is not None` test
+# on this global, so disabled instrumentation costs one check per call, never
+# per character.
+_stats: GenerationStats | None = None
+
+
+@contextmanager
+def instrument(stats: GenerationStats | None = None) -> Iterator[GenerationStats]:
+    """Count draws, bytes, rejections, swaps and stage timings inside the block.
+
+    Yields the GenerationStats being filled (a new one unless stats is given).
+    Counts are process-wide: work done by other threads while the block is
+    active is included, work done in worker processes is not.
+    """
+    global _stats
+    previous = _stats
+    _stats = GenerationStats() if stats is None else stats
+    try:
+        yield _stats
+    finally:
+        _stats = previous
+
+
+def _token_bytes(n: int) -> bytes:
+    """secrets.token_bytes(n), counted when instrumentation is active."""
+    if _stats is not None:
+        _stats.add(os_reads=1, os_bytes=n)
+    return secrets.token_bytes(n)
+
+
+class EntropySource(Protocol):
+    """Where random bytes come from: read(n) returns n fresh bytes.
+
+    Every generation function accepts one as its entropy argument; sources
+    that are not EntropyBuffers are wrapped in one, so cheap small draws
+    never turn into one read per character.
+    """
+
+    def read(self, n: int) -> bytes: ...
+
+
+class UrandomSource:
+    """Unbuffered os.urandom(): one syscall per read."""
+
+    def read(self, n: int) -> bytes:
+        if _stats is not None:
+            _stats.add(os_reads=1, os_bytes=n)
+        return os.urandom(n)
+
+
+class GetrandomSource:
+    """Unbuffered getrandom(2) with flags such as os.GRND_NONBLOCK (Linux).
+
+    With GRND_NONBLOCK, reads before the kernel pool is initialised raise
+    BlockingIOError instead of waiting.
+    """
+
+    def __init__(self, flags: int = 0):
+        if not hasattr(os, "getrandom"):
+            raise ValueError("getrandom() is not available on this platform")
+        self.flags = flags
+
+    def read(self, n: int) -> bytes:
+        if _stats is not None:
+            _stats.add(os_reads=1, os_bytes=n)
+        out = os.getrandom(n, self.flags)
+        while len(out) < n:  # large requests may be served in parts
+            out += os.getrandom(n - len(out), self.flags)
+        return out
+
+
+# Every live EntropyBuffer, so a forked child can drop the bytes it
+# inherited before it hands any of them out.
+_live_buffers: weakref.WeakSet = weakref.WeakSet()
+
+
+def _discard_after_fork() -> None:
+    for buffer in list(_live_buffers):
+        buffer._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_discard_after_fork)
+
+
+class EntropyBuffer:
+    """Block-buffered random bytes, refilled from source.
+
+    The source is secrets.token_bytes unless another EntropySource is
+    given. One draw from it serves many small reads; large reads bypass the
+    buffer. Bytes are handed out exactly once and never reused: a process
+    forked from this one starts with an empty buffer.
+    """
+
+    def __init__(self, block_size: int = 4096, source: EntropySource | None = None):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.block_size = block_size
+        self.source = source
+        self._buf = b""
+        self._pos = 0
+        _live_buffers.add(self)
+
+    def read(self, n: int) -> bytes:
+        """Return n fresh random bytes."""
+        available = len(self._buf) - self._pos
+        if n <= available:
+            out = self._buf[self._pos:self._pos + n]
+            self._pos += n
+            return out
+        if n > self.block_size:
+            return self._draw(n)
+        head = self._buf[self._pos:]
+        self.refill()
+        self._pos = n - available
+        return head + self._buf[:self._pos]
+
+    def refill(self) -> None:
+        """Discard any unread bytes and draw a fresh block (e.g. to pre-warm)."""
+        self._buf = self._draw(self.block_size)
+        self._pos = 0
+
+    def _draw(self, n: int) -> bytes:
+        """n bytes from the underlying source."""
+        if self.source is None:
+            return _token_bytes(n)
+        return self.source.read(n)
+
+    def _after_fork(self) -> None:
+        """Called in a forked child: forget the bytes shared with the parent."""
+        self._buf = b""
+        self._pos = 0
+
+    def randbelow(self, n: int) -> int:
+        """Return a uniform int in [0, n) using rejection sampling (no modulo bias)."""
+        if n <= 0:
+            raise ValueError("n must be positive")
+        if n <= 256:
+            limit = 256 - 256 % n
+            while True:
+                if self._pos >= len(self._buf):
+                    self.refill()
+                b = self._buf[self._pos]
+                self._pos += 1
+                if b < limit:
+                    if _stats is not None:
+                        _stats.add(draws=1, bytes_consumed=1)
+                    return b % n
+                if _stats is not None:
+                    _stats.add(rejections=1, bytes_consumed=1)
+        k = n.bit_length()
+        nbytes = (k + 7) // 8
+        mask = (1 << k) - 1
+        while True:
+            r = int.from_bytes(self.read(nbytes), "big") & mask
+            if r < n:
+                if _stats is not None:
+                    _stats.add(draws=1, bytes_consumed=nbytes)
+                return r
+            if _stats is not None:
+                _stats.add(rejections=1, bytes_consumed=nbytes)
+
+
+def _as_buffer(entropy: EntropySource | None, block_size: int = 4096) -> EntropyBuffer:
+    """entropy itself if it is an EntropyBuffer, else a buffer over it."""
+    if isinstance(entropy, EntropyBuffer):
+        return entropy
+    return EntropyBuffer(block_size, source=entropy)
+
+
+class _ByteSampler:
+    """Uniform sampler over 1 to 256 byte symbols with precomputed tables.
+
+    Random bytes at or above the largest multiple of len(symbols) are
+    rejected; the rest map to symbols[b % len(symbols)]. Both steps run in C
+    via bytes.translate.
+    """
+
+    __slots__ = ("_mapping", "_rejected", "limit", "symbols")
+
+    def __init__(self, symbols: bytes):
+        if not 1 <= len(symbols) <= 256:
+            raise ValueError("a byte sampler needs 1 to 256 symbols")
+        size = len(symbols)
+        self.symbols = symbols
+        self.limit = 256 - 256 % size
+        self._mapping = bytes(symbols[b % size] for b in range(256))
+        self._rejected = bytes(range(self.limit, 256))
+
+    def sample(self, n: int, entropy: EntropyBuffer) -> bytes:
+        """Draw n symbols."""
+        out = b""
+        while len(out) < n:
+            # Ask for enough bytes that a single round usually suffices.
+            want = (n - len(out)) * 256 // self.limit + 16
+            chunk = entropy.read(want).translate(self._mapping, self._rejected)
+            if _stats is not None:
+                _stats.add(rejections=want - len(chunk), bytes_consumed=want)
+            out += chunk
+        if _stats is not None:
+            _stats.draws += n
+        return out[:n]
+
+    def text(self, n: int, entropy: EntropyBuffer) -> str:
+        """Draw n symbols as a str (ASCII symbols only)."""
+        return self.sample(n, entropy).decode("ascii")
+
+    def sample_into(self, out: memoryview, entropy: EntropyBuffer) -> None:
+        """Fill the writable byte view out with symbols.
+
+        Symbols only ever live in out and in wiped scratch space, never in
+        an immutable bytes object.
+        """
+        pos, n = 0, len(out)
+        while pos < n:
+            want = (n - pos) * 256 // self.limit + 16
+            raw = bytearray(entropy.read(want))
+            chunk = raw.translate(self._mapping, self._rejected)
+            take = min(len(chunk), n - pos)
+            out[pos:pos + take] = memoryview(chunk)[:take]
+            pos += take
+            if _stats is not None:
+                _stats.add(rejections=want - len(chunk), bytes_consumed=want)
+            raw[:] = bytes(want)
+            chunk[:] = bytes(len(chunk))
+        if _stats is not None:
+            _stats.draws += n
+
+
+class _IndexedSampler:
+    """Uniform sampler over any number of str symbols, held in a tuple.
+
+    Indices are drawn from single bytes up to 256 symbols, from 16-bit words
+    below a precomputed rejection limit up to 65536 (looked up in a table
+    of the symbols repeated to that limit, so no modulo is needed) and by
+    Lemire's method beyond, so every character costs O(1) whatever the
+    alphabet size.
+    """
+
+    __slots__ = ("_table", "limit", "symbols")
+
+    def __init__(self, symbols: str):
+        if not symbols:
+            raise ValueError("a sampler needs at least one symbol")
+        size = len(symbols)
+        self.symbols = tuple(symbols)
+        self.limit = 0x10000 - 0x10000 % size if 256 < size <= 0x10000 else 0
+        self._table = self.symbols * (self.limit // size)
+
+    def text(self, n: int, entropy: EntropyBuffer) -> str:
+        """Draw n symbols as a str."""
+        size = len(self.symbols)
+        if size <= 256:
+            indices = _index_sampler(size).sample(n, entropy)
+            return "".join(map(self.symbols.__getitem__, indices))
+        if not self.limit:
+            indices = _lemire_below(size, n, entropy)
+            return "".join(map(self.symbols.__getitem__, indices))
+        chars = []
+        while len(chars) < n:
+            want = (n - len(chars)) * 0x10000 // self.limit + 8
+            words = _le_words(entropy.read(2 * want), "H")
+            chunk = list(map(self._table.__getitem__, filter(self.limit.__gt__, words)))
+            if _stats is not None:
+                _stats.add(rejections=want - len(chunk), bytes_consumed=2 * want)
+            chars += chunk
+        if _stats is not None:
+            _stats.draws += n
+        return "".join(chars[:n])
+
+
+def _sampler(chars: str):
+    """The fastest uniform sampler for the characters of chars."""
+    if chars.isascii():
+        return _ByteSampler(chars.encode("ascii"))
+    return _IndexedSampler(chars)
+
+
+@lru_cache(maxsize=256)
+def _index_sampler(n: int) -> _ByteSampler:
+    """Sampler over the indices [0, n), used for Fisher-Yates swap targets."""
+    return _ByteSampler(bytes(range(n)))
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """Character tables for one PasswordConfig, built once and cached.
+
+    classes holds the enabled character sets in guarantee order; pool is
+    their concatenation, so class c occupies pool[offsets[c]:offsets[c] +
+    len(classes[c])]. class_codes (byte values) is only filled in when the
+    pool is ASCII.
+    """
+
+    classes: tuple
+    pool: str
+    offsets: tuple
+    pool_sampler: _ByteSampler | _IndexedSampler
+    class_samplers: tuple
+    class_sets: tuple
+    class_codes: tuple
+
+    @classmethod
+    def from_config(cls, config: PasswordConfig) -> CompiledPolicy:
+        """Return the cached policy for config (length does not affect it)."""
+        excluded = set(config.exclude)
+        if config.exclude_ambiguous:
+            excluded.update(CharacterSet.AMBIGUOUS)
+        # A one-character forbidden substring is just an excluded character.
+        excluded.update(s for s in config.forbidden if len(s) == 1)
+        return _compile_policy(
+            config.include_symbols,
+            config.include_numbers,
+            "".join(sorted(excluded)),
+            tuple(config.alphabets),
+        )
+
+    @property
+    def rejection_limit(self) -> int:
+        """Random bytes at or above this value are rejected when sampling the pool."""
+        return self.pool_sampler.limit
+
+    @property
+    def is_ascii(self) -> bool:
+        return self.pool.isascii()
+
+    @property
+    def bits_per_char(self) -> float:
+        return math.log2(len(self.pool))
+
+    def entropy_bits(self, length: int) -> float:
+        """Naive length * log2(pool size) estimate for a password of length."""
+        return length * self.bits_per_char
 
 
-def secure_shuffle(lst: list) -> None:
-    """Fisher-Yates in-place shuffle using secrets.randbelow (CSPRNG)."""
-    for i in range(len(lst) - 1, 0, -1):
-        j = secrets.randbelow(i + 1)
+@lru_cache(maxsize=256)
+def _compile_policy(
+    include_symbols: bool,
+    include_numbers: bool,
+    excluded: str = "",
+    alphabets: tuple = (),
+) -> CompiledPolicy:
+    if alphabets:
+        classes = _normalize_alphabets(alphabets)
+    else:
+        classes = [CharacterSet.LOWERCASE, CharacterSet.UPPERCASE]
+        if include_numbers:
+            classes.append(CharacterSet.NUMBERS)
+        if include_symbols:
+            classes.append(CharacterSet.SYMBOLS)
+    if excluded:
+        classes = ["".join(c for c in chars if c not in excluded) for chars in classes]
+        if not all(classes):
+            raise ValueError("exclude removes every character of an enabled set")
+    offsets = []
+    start = 0
+    for chars in classes:
+        offsets.append(start)
+        start += len(chars)
+    pool = "".join(classes)
+    return CompiledPolicy(
+        classes=tuple(classes),
+        pool=pool,
+        offsets=tuple(offsets),
+        pool_sampler=_sampler(pool),
+        class_samplers=tuple(_sampler(c) for c in classes),
+        class_sets=tuple(frozenset(c) for c in classes),
+        class_codes=(
+            tuple(frozenset(c.encode("ascii")) for c in classes)
+            if pool.isascii() else ()
+        ),
+    )
+
+
+def _normalize_alphabets(alphabets: tuple) -> list:
+    """NFC-normalize and deduplicate each alphabet; check they are usable."""
+    import unicodedata
+
+    classes = []
+    seen = set()
+    for chars in alphabets:
+        chars = "".join(dict.fromkeys(unicodedata.normalize("NFC", chars)))
+        if not chars:
+            raise ValueError("alphabets must not be empty")
+        for c in chars:
+            if not c.isprintable() or c.isspace() or unicodedata.combining(c):
+                raise ValueError(
+                    f"alphabet character U+{ord(c):04X} is not a printable, "
+                    "non-combining character"
+                )
+        if not seen.isdisjoint(chars):
+            raise ValueError("alphabets must not share characters")
+        seen.update(chars)
+        classes.append(chars)
+    return classes
+
+
+def check_strategy(config: PasswordConfig, policy: CompiledPolicy) -> None:
+    """Raise ValueError if config.strategy is unknown or cannot be satisfied."""
+    if config.strategy not in STRATEGIES:
+        raise ValueError(
+            f"unknown strategy {config.strategy!r}; expected one of {STRATEGIES}"
+        )
+    required = sum(class_minimums(config))
+    if config.strategy == "reject" and config.length < required:
+        raise ValueError(
+            f"length must be at least {required} for the reject strategy"
+        )
+
+
+def check_config(config: PasswordConfig, policy: CompiledPolicy) -> None:
+    """Raise ValueError if config is malformed or no password can satisfy it."""
+    check_strategy(config, policy)
+    minimums = class_minimums(config)
+    if min(minimums) < 0:
+        raise ValueError("per-set minimums must be non-negative")
+    if config.max_repeat is not None and config.max_repeat < 1:
+        raise ValueError("max_repeat must be at least 1")
+    if "" in config.forbidden:
+        raise ValueError("forbidden substrings must be non-empty")
+    if sum(minimums) > config.length:
+        raise ValueError(
+            f"length must be at least {sum(minimums)} to meet the per-set minimums"
+        )
+    sampler = _policy_sampler(config, policy)
+    if sampler is not None and not sampler.count(config.length):
+        raise ValueError("no password satisfies this policy")
+
+
+def class_minimums(config: PasswordConfig) -> tuple[int, ...]:
+    """Required count for each enabled set, in CompiledPolicy.classes order."""
+    if config.alphabets:
+        return (1,) * len(config.alphabets)
+    minimums = [config.min_lowercase, config.min_uppercase]
+    if config.include_numbers:
+        minimums.append(config.min_numbers)
+    if config.include_symbols:
+        minimums.append(config.min_symbols)
+    return tuple(minimums)
+
+
+def _policy_sampler(config: PasswordConfig, policy: CompiledPolicy):
+    """passgen.policy sampler for config, or None if the strategies apply as-is."""
+    minimums = class_minimums(config)
+    max_repeat = config.max_repeat
+    if max_repeat is not None and max_repeat >= config.length:
+        max_repeat = None  # cannot bind
+    forbidden = _forbidden_substrings(config)
+    if max_repeat is None and not forbidden and all(m == 1 for m in minimums):
+        return None
+    from passgen.policy import policy_sampler
+
+    return policy_sampler(policy.classes, minimums, max_repeat, forbidden)
+
+
+def _forbidden_substrings(config: PasswordConfig) -> tuple:
+    # Single characters are excluded from the pool by CompiledPolicy instead.
+    return tuple(sorted({s for s in config.forbidden if len(s) > 1}))
+
+
+def _has_every_class(password: str, policy: CompiledPolicy) -> bool:
+    return not any(chars.isdisjoint(password) for chars in policy.class_sets)
+
+
+def _le_words(data: bytes, code: str):
+    """data as little-endian unsigned words of typecode "H" or "I" on any host.
+
+    Seeded output (passgen.fixtures) must not depend on the byte order.
+    """
+    if sys.byteorder == "little":
+        return memoryview(data).cast(code)
+    words = array(code, data)
+    words.byteswap()
+    return words
+
+
+def _lemire_below(n: int, count: int, entropy: EntropyBuffer) -> list[int]:
+    """Draw count uniform ints in [0, n) for 256 < n <= 2**32.
+
+    Lemire's method: a 32-bit word x maps to (x * n) >> 32, and words whose
+    low product half falls below 2**32 % n are rejected and redrawn.
+    """
+    threshold = (0x100000000 - n) % n
+    words = _le_words(entropy.read(4 * count), "I")
+    out = []
+    for x in words:
+        m = x * n
+        while m & 0xFFFFFFFF < threshold:
+            if _stats is not None:
+                _stats.add(rejections=1, bytes_consumed=4)
+            m = int.from_bytes(entropy.read(4), "little") * n
+        out.append(m >> 32)
+    if _stats is not None:
+        _stats.add(draws=count, bytes_consumed=4 * count)
+    return out
+
+
+def _swap_targets(length: int, count: int, entropy: EntropyBuffer) -> list:
+    """Fisher-Yates swap targets for count rows of up to length items.
+
+    targets[i][r] is the index in [0, i] that position i of row r is
+    exchanged with. Each step's targets are drawn together: by byte
+    rejection sampling (bytes.translate, in C) while i + 1 <= 256 and by
+    Lemire bounded integers on 32-bit words beyond that. Both are exactly
+    uniform, so every row receives a uniformly random permutation.
+    """
+    targets = [b""]  # position 0 is never swapped
+    for i in range(1, length):
+        if i < 256:
+            targets.append(_index_sampler(i + 1).sample(count, entropy))
+        else:
+            targets.append(_lemire_below(i + 1, count, entropy))
+    return targets
+
+
+def shuffle_many(rows: list, entropy: EntropySource | None = None) -> None:
+    """Fisher-Yates shuffle every list in rows in place, in one pass."""
+    entropy = _as_buffer(entropy)
+    targets = _swap_targets(max(map(len, rows), default=0), len(rows), entropy)
+    for r, row in enumerate(rows):
+        for i in range(len(row) - 1, 0, -1):
+            j = targets[i][r]
+            row[i], row[j] = row[j], row[i]
+    if _stats is not None:
+        _stats.swaps += sum(max(len(row) - 1, 0) for row in rows)
+
+
+def secure_shuffle(lst: list, entropy: EntropySource | None = None) -> None:
+    """Fisher-Yates in-place shuffle from a single CSPRNG draw.
+
+    Swap targets are Lemire bounded integers on 32-bit words (see
+    _lemire_below); use shuffle_many() to shuffle many lists at once.
+    """
+    if len(lst) < 2:
+        return
+    if entropy is None:
+        entropy = EntropyBuffer(4 * len(lst) + 64)
+    words = _le_words(entropy.read(4 * (len(lst) - 1)), "I")
+    for x, i in zip(words, range(len(lst) - 1, 0, -1)):
+        n = i + 1
+        m = x * n
+        if m & 0xFFFFFFFF < n:
+            # Only here can the low half fall below the rejection threshold.
+            threshold = (0x100000000 - n) % n
+            while m & 0xFFFFFFFF < threshold:
+                if _stats is not None:
+                    _stats.add(rejections=1, bytes_consumed=4)
+                m = int.from_bytes(entropy.read(4), "little") * n
+        j = m >> 32
         lst[i], lst[j] = lst[j], lst[i]
+    if _stats is not None:
+        steps = len(lst) - 1
+        _stats.add(draws=steps, bytes_consumed=4 * steps, swaps=steps)
+
+
+def generate_password(
+    config: PasswordConfig, entropy: EntropySource | None = None
+) -> str:
+    """Generate a cryptographically secure password per the given config.
+
+    Randomness comes from entropy (see EntropySource), by default a small
+    buffer over secrets.token_bytes sized so one OS read usually suffices.
+    """
+    stats = _stats
+    if stats is not None:
+        mark = perf_counter()
+
+    # 1. Cached pool and enabled sets (letters always included)
+    policy = CompiledPolicy.from_config(config)
+    check_config(config, policy)
+    sampler = _policy_sampler(config, policy)
+    entropy = _as_buffer(entropy, block_size=8 * config.length + 64)
+    if stats is not None:
+        stats.lap("pool_build", mark)
+        stats.passwords += 1
+    return _generate_one(config, policy, sampler, entropy)
+
 
+def _generate_one(
+    config: PasswordConfig, policy: CompiledPolicy, sampler, entropy: EntropyBuffer
+) -> str:
+    stats = _stats
+    if stats is not None:
+        mark = perf_counter()
 
-def generate_password(config: PasswordConfig) -> str:
-    """Generate a cryptographically secure password per the given config."""
-    # 1. Mandatory pool (always included)
-    pool = CharacterSet.LOWERCASE + CharacterSet.UPPERCASE
+    if sampler is not None:
+        rank = entropy.randbelow(sampler.count(config.length))
+        password = sampler.unrank(config.length, rank)
+        if stats is not None:
+            stats.lap("filler", mark)
+        return password
+
+    if config.strategy == "reject":
+        while True:
+            password = policy.pool_sampler.text(config.length, entropy)
+            if stats is not None:
+                mark = stats.lap("filler", mark)
+            if _has_every_class(password, policy):
+                return password
+            if stats is not None:
+                stats.rejected_passwords += 1
 
     # 2. Guarantee at least one character from each enabled set
     guaranteed = [
-        secrets.choice(CharacterSet.LOWERCASE),
-        secrets.choice(CharacterSet.UPPERCASE),
+        class_sampler.text(1, entropy) for class_sampler in policy.class_samplers
     ]
-
-    if config.include_numbers:
-        guaranteed.append(secrets.choice(CharacterSet.NUMBERS))
-        pool += CharacterSet.NUMBERS
-
-    if config.include_symbols:
-        guaranteed.append(secrets.choice(CharacterSet.SYMBOLS))
-        pool += CharacterSet.SYMBOLS
+    if stats is not None:
+        mark = stats.lap("guaranteed", mark)
 
     # 3. Fill remaining positions from combined pool
     remaining = config.length - len(guaranteed)
-    filler = [secrets.choice(pool) for _ in range(remaining)]
+    filler = list(policy.pool_sampler.text(remaining, entropy))
+    if stats is not None:
+        mark = stats.lap("filler", mark)
 
     # 4. Cryptographically secure shuffle
     chars = guaranteed + filler
-    secure_shuffle(chars)
+    secure_shuffle(chars, entropy)
+    if stats is not None:
+        mark = stats.lap("shuffle", mark)
+
+    password = "".join(chars)
+    if stats is not None:
+        stats.lap("join", mark)
+    return password
+
+
+def generate_passwords(
+    config: PasswordConfig,
+    count: int,
+    engine: str = "python",
+    entropy: EntropySource | None = None,
+) -> list[str]:
+    """Generate count passwords per the given config from buffered CSPRNG draws.
+
+    Each password follows the same distribution as generate_password() for
+    config.strategy. Entropy for the whole batch is pulled in large blocks
+    instead of one syscall per character.
+
+    engine="numpy" uses the vectorized engine in passgen.vectorized and
+    falls back to the pure-Python path when NumPy is not installed, the
+    config needs the policy sampler or its alphabets are not ASCII.
+
+    Both engines draw from entropy when given (ideally a long-lived,
+    pre-warmed EntropyBuffer owned by one thread; any other EntropySource
+    is buffered) and from a fresh EntropyBuffer otherwise.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {ENGINES}")
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    stats = _stats
+    if stats is not None:
+        mark = perf_counter()
+    policy = CompiledPolicy.from_config(config)
+    check_config(config, policy)
+    sampler = _policy_sampler(config, policy)
+    if stats is not None:
+        stats.lap("pool_build", mark)
+        stats.passwords += count
+    entropy = _as_buffer(entropy)
+    return _generate_batch(config, policy, sampler, count, engine, entropy)
+
+
+def _generate_batch(
+    config: PasswordConfig,
+    policy: CompiledPolicy,
+    sampler,
+    count: int,
+    engine: str,
+    entropy: EntropyBuffer,
+) -> list[str]:
+    stats = _stats
+    if stats is not None:
+        mark = perf_counter()
+    if sampler is not None:
+        total = sampler.count(config.length)
+        passwords = [
+            sampler.unrank(config.length, entropy.randbelow(total))
+            for _ in range(count)
+        ]
+        if stats is not None:
+            stats.lap("filler", mark)
+        return passwords
+    if engine == "numpy" and policy.is_ascii:
+        try:
+            from passgen.vectorized import generate_passwords_numpy
+        except ImportError:
+            pass  # NumPy not installed
+        else:
+            return generate_passwords_numpy(config, count, entropy)
+
+    if config.strategy == "reject":
+        return _generate_rejected(policy, config.length, count, entropy)
+
+    remaining = max(config.length - len(policy.classes), 0)
+    columns = [
+        class_sampler.text(count, entropy) for class_sampler in policy.class_samplers
+    ]
+    if stats is not None:
+        mark = stats.lap("guaranteed", mark)
+    filler = policy.pool_sampler.text(count * remaining, entropy)
+    if stats is not None:
+        mark = stats.lap("filler", mark)
+    # Same pass as shuffle_many(), inlined to skip its per-row length checks.
+    length = len(columns) + remaining
+    targets = _swap_targets(length, count, entropy)
+    steps = range(length - 1, 0, -1)
+
+    rows = []
+    for n in range(count):
+        chars = [column[n] for column in columns]
+        chars.extend(filler[n * remaining:(n + 1) * remaining])
+        for i in steps:
+            j = targets[i][n]
+            chars[i], chars[j] = chars[j], chars[i]
+        rows.append(chars)
+    if stats is not None:
+        stats.swaps += count * len(steps)
+        mark = stats.lap("shuffle", mark)
+    passwords = list(map("".join, rows))
+    if stats is not None:
+        stats.lap("join", mark)
+    return passwords
+
+
+def _generate_rejected(
+    policy: CompiledPolicy, length: int, count: int, entropy: EntropyBuffer
+) -> list[str]:
+    """Batch form of the reject strategy: redraw only the failing passwords."""
+    stats = _stats
+    if stats is not None:
+        mark = perf_counter()
+    passwords = []
+    while len(passwords) < count:
+        need = count - len(passwords)
+        text = policy.pool_sampler.text(need * length, entropy)
+        if stats is not None:
+            mark = stats.lap("filler", mark)
+        for n in range(need):
+            password = text[n * length:(n + 1) * length]
+            if _has_every_class(password, policy):
+                passwords.append(password)
+        if stats is not None:
+            stats.rejected_passwords += count - len(passwords)
+            mark = stats.lap("join", mark)
+    return passwords
+
+
+def generate_into(
+    config: PasswordConfig,
+    out,
+    count: int = 1,
+    stride: int | None = None,
+    offset: int = 0,
+    entropy: EntropySource | None = None,
+) -> None:
+    """Write count passwords as ASCII bytes into the bytearray or mmap out.
+
+    Password r occupies out[offset + r * stride:][:config.length] (stride
+    defaults to the length); bytes between passwords are left untouched.
+    Characters are drawn, checked and shuffled in place, so unlike
+    generate_passwords() no str or bytes copy of any password is made.
+    """
+    stats = _stats
+    if stats is not None:
+        mark = perf_counter()
+    policy = CompiledPolicy.from_config(config)
+    check_config(config, policy)
+    length = config.length
+    if stride is None:
+        stride = length
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    if stride < length:
+        raise ValueError("stride must be at least the password length")
+    if not policy.is_ascii:
+        raise ValueError("writing passwords as bytes needs ASCII alphabets")
+    if offset < 0 or (count and offset + (count - 1) * stride + length > len(out)):
+        raise ValueError("out is too small for count passwords")
+    sampler = _policy_sampler(config, policy)
+    entropy = _as_buffer(entropy, block_size=min(8 * length * count + 64, 4096))
+    if stats is not None:
+        stats.lap("pool_build", mark)
+        stats.passwords += count
+    view = memoryview(out)
+    try:
+        _fill_passwords(config, policy, sampler, view, offset, count, stride, entropy)
+    finally:
+        view.release()
+
+
+def _fill_passwords(
+    config: PasswordConfig,
+    policy: CompiledPolicy,
+    sampler,
+    view: memoryview,
+    offset: int,
+    count: int,
+    stride: int,
+    entropy: EntropyBuffer,
+) -> None:
+    stats = _stats
+    if stats is not None:
+        mark = perf_counter()
+    length = config.length
+    starts = range(offset, offset + count * stride, stride)
+    if sampler is not None:
+        total = sampler.count(length)
+        for start in starts:
+            sampler.unrank_into(length, entropy.randbelow(total), view[start:])
+        if stats is not None:
+            stats.lap("filler", mark)
+        return
+
+    end = offset + count * stride
+    if config.strategy == "reject":
+        # Every position of every password from the pool; redraw the
+        # passwords that miss a class.
+        pending = list(starts)
+        while pending:
+            for start in pending:
+                policy.pool_sampler.sample_into(view[start:start + length], entropy)
+            pending = [
+                start for start in pending
+                if any(codes.isdisjoint(view[start:start + length])
+                       for codes in policy.class_codes)
+            ]
+            if stats is not None:
+                stats.rejected_passwords += len(pending)
+                mark = stats.lap("filler", mark)
+        return
+
+    # Position c of every password at once (a strided view): guaranteed
+    # classes first, then the filler.
+    guaranteed = len(policy.class_samplers)
+    for c, class_sampler in enumerate(policy.class_samplers):
+        class_sampler.sample_into(view[offset + c:end:stride], entropy)
+    if stats is not None:
+        mark = stats.lap("guaranteed", mark)
+    if count == 1:
+        policy.pool_sampler.sample_into(view[offset + guaranteed:offset + length], entropy)
+    else:
+        for c in range(guaranteed, length):
+            policy.pool_sampler.sample_into(view[offset + c:end:stride], entropy)
+    if stats is not None:
+        mark = stats.lap("filler", mark)
+
+    # Shuffle each password in one scratch row, wiped afterwards.
+    row = bytearray(length)
+    if count == 1:
+        row[:] = view[offset:offset + length]
+        secure_shuffle(row, entropy)
+        view[offset:offset + length] = row
+    else:
+        targets = _swap_targets(length, count, entropy)
+        steps = range(length - 1, 0, -1)
+        for start, row_targets in zip(starts, zip(*targets[:0:-1])):
+            stop = start + length
+            row[:] = view[start:stop]
+            for i, j in zip(steps, row_targets):
+                row[i], row[j] = row[j], row[i]
+            view[start:stop] = row
+        if stats is not None:
+            stats.swaps += count * len(steps)
+    row[:] = bytes(length)
+    if stats is not None:
+        stats.lap("shuffle", mark)
+
+
+def iter_passwords(
+    config: PasswordConfig,
+    count: int | None = None,
+    batch_size: int = 4096,
+    engine: str = "python",
+    entropy: EntropySource | None = None,
+) -> Iterator[str]:
+    """Lazily yield count passwords (forever when count is None).
+
+    Passwords are produced batch_size at a time via generate_passwords(), so
+    memory stays bounded regardless of count; every batch draws from the
+    same entropy buffer.
+    """
+    if count is not None and count < 0:
+        raise ValueError("count must be non-negative")
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    entropy = _as_buffer(entropy)
+    while count is None or count > 0:
+        n = batch_size if count is None else min(batch_size, count)
+        yield from generate_passwords(config, n, engine=engine, entropy=entropy)
+        if count is not None:
+            count -= n
+
+
+class PasswordGenerator:
+    """Generator for one PasswordConfig, safe to share between threads.
+
+    The policy is compiled and checked once, up front. Every thread draws
+    from its own EntropyBuffer (held in a threading.local), so the hot
+    path takes no lock and no two threads ever hand out the same random
+    bytes, with or without the GIL. source, when given, must itself be
+    safe to call from several threads (UrandomSource and GetrandomSource
+    are).
+    """
+
+    def __init__(
+        self,
+        config: PasswordConfig | None = None,
+        block_size: int = 1 << 16,
+        source: EntropySource | None = None,
+    ):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.config = config if config is not None else PasswordConfig()
+        self.policy = CompiledPolicy.from_config(self.config)
+        check_config(self.config, self.policy)
+        self.block_size = block_size
+        self.source = source
+        self._sampler = _policy_sampler(self.config, self.policy)
+        self._local = threading.local()
+
+    def entropy(self) -> EntropyBuffer:
+        """The calling thread's buffer, created on its first use."""
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = EntropyBuffer(self.block_size, self.source)
+            return buffer
+
+    def password(self) -> str:
+        """One password, as generate_password() would return."""
+        if _stats is not None:
+            _stats.passwords += 1
+        return _generate_one(self.config, self.policy, self._sampler, self.entropy())
+
+    def passwords(self, count: int, engine: str = "python") -> list[str]:
+        """count passwords, as generate_passwords() would return."""
+        return generate_passwords(self.config, count, engine, self.entropy())
 
-    return "".join(chars)
+    def generate_into(
+        self, out, count: int = 1, stride: int | None = None, offset: int = 0
+    ) -> None:
+        """generate_into() for this config, from this thread's buffer."""
+        generate_into(self.config, out, count, stride, offset, self.entropy())
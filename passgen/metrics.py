@@ -0,0 +1,77 @@
+"""Counters collected by passgen.generator.instrument().
+
+Counters only ever grow while instrumentation is active; they can be read
+as attributes or dumped as JSON or Prometheus text exposition.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from time import perf_counter
+
+# Generation stages timed by the generator, in pipeline order.
+STAGES = ("pool_build", "guaranteed", "filler", "shuffle", "join")
+
+_HELP = {
+    "passwords": "Passwords generated.",
+    "draws": "Uniform random values drawn (characters and swap targets).",
+    "bytes_consumed": "CSPRNG bytes consumed by sampling, including rejected bytes.",
+    "os_reads": "Reads from the OS entropy source.",
+    "os_bytes": "Bytes requested from the OS entropy source.",
+    "rejections": "Random values rejected and redrawn to avoid modulo bias.",
+    "rejected_passwords": "Passwords discarded by the reject strategy.",
+    "swaps": "Fisher-Yates shuffle swaps.",
+}
+
+
+@dataclass
+class GenerationStats:
+    """Entropy and timing counters for one instrumented run."""
+
+    passwords: int = 0
+    draws: int = 0
+    bytes_consumed: int = 0
+    os_reads: int = 0
+    os_bytes: int = 0
+    rejections: int = 0
+    rejected_passwords: int = 0
+    swaps: int = 0
+    seconds: dict = field(default_factory=lambda: dict.fromkeys(STAGES, 0.0))
+
+    def add(self, **counts: int) -> None:
+        """Increment the named counters."""
+        for name, n in counts.items():
+            setattr(self, name, getattr(self, name) + n)
+
+    def lap(self, stage: str, since: float) -> float:
+        """Charge the time elapsed since `since` to stage; return the current time."""
+        now = perf_counter()
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + (now - since)
+        return now
+
+    def as_dict(self) -> dict:
+        out = {f.name: getattr(self, f.name) for f in fields(self)}
+        out["seconds"] = dict(self.seconds)
+        return out
+
+    def to_json(self, **kwargs) -> str:
+        """Serialize the counters as a JSON object; kwargs go to json.dumps."""
+        import json
+
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "passgen") -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        lines = []
+        for f in fields(self):
+            if f.name == "seconds":
+                continue
+            name = f"{prefix}_{f.name}_total"
+            lines.append(f"# HELP {name} {_HELP[f.name]}")
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {getattr(self, f.name)}")
+        name = f"{prefix}_stage_seconds_total"
+        lines.append(f"# HELP {name} Wall time spent in each generation stage.")
+        lines.append(f"# TYPE {name} counter")
+        for stage, seconds in self.seconds.items():
+            lines.append(f'{name}{{stage="{stage}"}} {seconds!r}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,66 @@
+"""Multi-process batch generation on top of generate_passwords()."""
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator
+
+from passgen.generator import PasswordConfig, generate_passwords
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def _generate_chunk(config: PasswordConfig, count: int, engine: str) -> list[str]:
+    # Runs in a worker process. generate_passwords() owns a fresh entropy
+    # buffer per call, so each worker draws from the OS CSPRNG on its own and
+    # nothing buffered in the parent is ever inherited or shared.
+    return generate_passwords(config, count, engine=engine)
+
+
+def generate_parallel(
+    config: PasswordConfig,
+    count: int | None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ordered: bool = True,
+    engine: str = "python",
+) -> Iterator[list[str]]:
+    """Yield lists of passwords generated across worker processes.
+
+    count passwords are split into chunks of at most chunk_size (count=None
+    streams forever). With ordered=True chunks come back in submission
+    order; otherwise each is yielded as soon as it completes. At most two
+    chunks per worker are in flight, so memory stays bounded.
+    """
+    if count is not None and count < 0:
+        raise ValueError("count must be non-negative")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be positive")
+
+    remaining = count
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        try:
+            while True:
+                while len(pending) < 2 * workers and remaining != 0:
+                    n = chunk_size if remaining is None else min(chunk_size, remaining)
+                    pending.append(executor.submit(_generate_chunk, config, n, engine))
+                    if remaining is not None:
+                        remaining -= n
+                if not pending:
+                    return
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
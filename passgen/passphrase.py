@@ -0,0 +1,187 @@
+"""Diceware-style passphrases drawn from a memory-mapped, indexed wordlist.
+
+Wordlist file format (all integers little-endian uint32):
+
+    magic   8 bytes  b"PGWORDS1"
+    count   4 bytes  number of words N
+    offsets 4 * (N + 1) bytes; word i is blob[offsets[i]:offsets[i + 1]]
+    blob    the UTF-8 words, concatenated
+
+Opening a wordlist maps the file and validates only the header, so startup
+cost does not grow with the list, and looking up word i reads two offsets
+and decodes one slice.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Iterable
+
+from passgen.generator import (
+    CharacterSet,
+    EntropyBuffer,
+    EntropySource,
+    _as_buffer,
+    _index_sampler,
+    _lemire_below,
+)
+
+MAGIC = b"PGWORDS1"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<2I")
+MAX_WORDS = 1 << 24
+
+WORDLIST_ENV = "PASSGEN_WORDLIST"
+
+
+@dataclass
+class PassphraseConfig:
+    words: int = 6
+    separator: str = "-"
+    capitalize: bool = False
+    include_numbers: bool = False
+    include_symbols: bool = False
+
+
+def read_words(lines: Iterable[str]) -> list[str]:
+    """Words from a plain or EFF-style (dice roll, tab, word) wordlist.
+
+    The last whitespace-separated field of each non-blank line is the word;
+    repeats are dropped so every entry is equally likely.
+    """
+    seen = {}
+    for line in lines:
+        fields = line.split()
+        if fields:
+            seen.setdefault(fields[-1], None)
+    return list(seen)
+
+
+def write_wordlist(words: Iterable[str], path: str) -> int:
+    """Write words to path in the indexed format; return the word count."""
+    encoded = [word.encode("utf-8") for word in words]
+    if len(encoded) < 2:
+        raise ValueError("a wordlist needs at least 2 words")
+    if len(encoded) > MAX_WORDS:
+        raise ValueError(f"a wordlist holds at most {MAX_WORDS} words")
+    if len(set(encoded)) != len(encoded):
+        raise ValueError("wordlist contains duplicate words")
+    if not all(encoded):
+        raise ValueError("wordlist contains an empty word")
+    offsets = [0]
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    with open(path, "wb") as fh:
+        fh.write(HEADER.pack(MAGIC, len(encoded)))
+        fh.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        fh.write(b"".join(encoded))
+    return len(encoded)
+
+
+class Wordlist:
+    """Read-only, memory-mapped view of a wordlist file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as fh:
+            try:
+                self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError(f"{path}: not a passgen wordlist") from None
+        try:
+            self._check(path)
+        except ValueError:
+            self._mm.close()
+            raise
+
+    def _check(self, path: str) -> None:
+        size = len(self._mm)
+        if size < HEADER.size:
+            raise ValueError(f"{path}: not a passgen wordlist")
+        magic, count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a passgen wordlist")
+        self._count = count
+        self._blob = HEADER.size + 4 * (count + 1)
+        if count < 2 or size < self._blob:
+            raise ValueError(f"{path}: truncated wordlist")
+        (end,) = struct.unpack_from("<I", self._mm, self._blob - 4)
+        if self._blob + end != size:
+            raise ValueError(f"{path}: truncated wordlist")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+        start, end = OFFSET.unpack_from(self._mm, HEADER.size + 4 * index)
+        return self._mm[self._blob + start:self._blob + end].decode("utf-8")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _draw_below(n: int, count: int, entropy: EntropyBuffer):
+    """count uniform indices in [0, n), as bytes (n <= 256) or a list."""
+    if n <= 256:
+        return _index_sampler(n).sample(count, entropy)
+    return _lemire_below(n, count, entropy)
+
+
+def check_passphrase_config(config: PassphraseConfig) -> None:
+    """Raise ValueError if config cannot produce a passphrase."""
+    if config.words < 1:
+        raise ValueError("a passphrase needs at least 1 word")
+
+
+def generate_passphrases(
+    config: PassphraseConfig,
+    wordlist: Wordlist,
+    count: int,
+    entropy: EntropySource | None = None,
+) -> list[str]:
+    """Generate count passphrases of config.words uniformly drawn words.
+
+    With include_numbers / include_symbols, one digit / symbol is appended
+    to a uniformly chosen word of every passphrase, mirroring the
+    one-of-each-set guarantee of PasswordConfig. capitalize upper-cases the
+    first letter of every word.
+    """
+    check_passphrase_config(config)
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    entropy = _as_buffer(entropy)
+    n = config.words
+    picks = _draw_below(len(wordlist), count * n, entropy)
+    injected = [
+        (chars, _draw_below(len(chars), count, entropy), _draw_below(n, count, entropy))
+        for enabled, chars in (
+            (config.include_numbers, CharacterSet.NUMBERS),
+            (config.include_symbols, CharacterSet.SYMBOLS),
+        )
+        if enabled
+    ]
+
+    lookup = wordlist.__getitem__
+    separator = config.separator
+    passphrases = []
+    for r in range(count):
+        words = [lookup(i) for i in picks[r * n:(r + 1) * n]]
+        if config.capitalize:
+            words = [word[:1].upper() + word[1:] for word in words]
+        for chars, which, where in injected:
+            words[where[r]] += chars[which[r]]
+        passphrases.append(separator.join(words))
+    return passphrases
+
+
+def generate_passphrase(config: PassphraseConfig, wordlist: Wordlist) -> str:
+    """Generate one passphrase per config (see generate_passphrases)."""
+    return generate_passphrases(config, wordlist, 1)[0]
@@ -0,0 +1,347 @@
+"""Exact uniform sampling of passwords under per-class minimums, run limits
+and forbidden substrings.
+
+Generating and discarding passwords until one meets a strict policy (say,
+at least 3 digits and 3 symbols in 8 characters, no character three times
+in a row, never "aa") can take thousands of attempts, or never finish when
+almost nothing qualifies. Instead, the samplers here count the valid
+passwords and unrank one uniform random integer into a password.
+
+With minimums alone, positions are interchangeable: CompositionSampler
+convolves the per-class counts (size**n once n reaches the minimum) over
+the choice of positions each class takes, O(classes * length**2) to build
+whatever the minimums.
+
+Run limits and forbidden substrings need PolicySampler's dynamic
+programme. State after a prefix: how many characters each class still needs
+(minimums count down to 0), the group of the last character and the length
+of its current run of identical characters, and the state of an
+Aho-Corasick automaton over the forbidden substrings (moves that complete
+one are never taken). A character that occurs in no forbidden substring
+always sends the automaton back to its root, so those characters are
+interchangeable within their class and form one group, contributing its
+size (or size - 1 when the next character must differ from the last) as a
+multiplicity; every other character is a group of its own.
+
+The DP has a state per combination of outstanding minimums, so its tables
+grow with their product; policies that would take more than
+MAX_TABLE_WORK steps to count are rejected with a ValueError.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from itertools import accumulate
+from math import comb
+from typing import Iterator
+
+# Upper bound on the (state, next character) steps PolicySampler may take
+# to build its counting tables, about a second of work.
+MAX_TABLE_WORK = 3_000_000
+
+
+def _too_complex() -> ValueError:
+    return ValueError(
+        "policy is too complex to count exactly; relax the minimums, "
+        "max_repeat or forbidden substrings"
+    )
+
+
+class _Sampler:
+    """unrank() and unrank_into() over a subclass's count() and _walk()."""
+
+    def count(self, length: int) -> int:
+        """Number of valid passwords of length."""
+        raise NotImplementedError
+
+    def unrank(self, length: int, rank: int) -> str:
+        """Return the rank-th valid password of length (0 <= rank < count(length))."""
+        return "".join(self._walk(length, rank))
+
+    def unrank_into(self, length: int, rank: int, out) -> None:
+        """unrank(), written as ASCII into the writable byte view out."""
+        for i, char in enumerate(self._walk(length, rank)):
+            out[i] = ord(char)
+
+    def _walk(self, length: int, rank: int) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class CompositionSampler(_Sampler):
+    """Counts and unranks passwords over classes with per-class minimums only."""
+
+    def __init__(self, classes: tuple[str, ...], minimums: tuple[int, ...]):
+        if len(classes) != len(minimums):
+            raise ValueError("need one minimum per class")
+        self.classes = classes
+        self.minimums = minimums
+        # _tables[i][n]: passwords of n characters over classes[:i + 1];
+        # _blocks[i, n]: running totals of its terms, by positions left to
+        # classes[:i].
+        self._tables = [[] for _ in classes]
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    def _own(self, k: int, n: int) -> int:
+        """Strings of n characters from class k alone meeting its minimum."""
+        return len(self.classes[k]) ** n if n >= self.minimums[k] else 0
+
+    def _terms(self, i: int, n: int) -> list:
+        """Running totals of comb(n, j) * _tables[i - 1][j] * _own(i, n - j)."""
+        blocks = self._blocks.get((i, n))
+        if blocks is None:
+            prev = self._tables[i - 1]
+            blocks = self._blocks[i, n] = list(accumulate(
+                comb(n, j) * prev[j] * self._own(i, n - j) for j in range(n + 1)
+            ))
+        return blocks
+
+    def count(self, length: int) -> int:
+        """Number of valid passwords of length."""
+        if length >= len(self._tables[0]):
+            with self._lock:
+                for n in range(len(self._tables[0]), length + 1):
+                    self._tables[0].append(self._own(0, n))
+                    for i in range(1, len(self.classes)):
+                        self._tables[i].append(self._terms(i, n)[-1])
+        return self._tables[-1][length]
+
+    def _walk(self, length: int, rank: int) -> Iterator[str]:
+        if not 0 <= rank < self.count(length):
+            raise ValueError("rank out of range")
+        out = [""] * length
+        free = list(range(length))
+        for i in range(len(self.classes) - 1, 0, -1):
+            n = len(free)
+            blocks = self._terms(i, n)
+            j = bisect_right(blocks, rank)  # positions left to classes[:i]
+            if j:
+                rank -= blocks[j - 1]
+            rank, chars = divmod(rank, self._own(i, n - j))
+            rank, subset = divmod(rank, comb(n, j))
+            taken = _unrank_subset(n, n - j, subset)
+            self._place(i, chars, [free[p] for p in taken], out)
+            taken = set(taken)
+            free = [spot for p, spot in enumerate(free) if p not in taken]
+        self._place(0, rank, free, out)
+        return iter(out)
+
+    def _place(self, k: int, rank: int, spots: list, out: list) -> None:
+        chars = self.classes[k]
+        for spot in spots:
+            rank, d = divmod(rank, len(chars))
+            out[spot] = chars[d]
+
+
+def _unrank_subset(n: int, size: int, rank: int) -> list:
+    """The rank-th size-element subset of range(n), in lexicographic order."""
+    chosen = []
+    for p in range(n):
+        if size == 0:
+            break
+        with_p = comb(n - p - 1, size - 1)
+        if rank < with_p:
+            chosen.append(p)
+            size -= 1
+        else:
+            rank -= with_p
+    return chosen
+
+
+class PolicySampler(_Sampler):
+    """Counts and unranks passwords over classes with per-class minimums.
+
+    max_repeat=None places no limit on runs of identical characters. No
+    password contains any of the forbidden substrings.
+    """
+
+    def __init__(
+        self,
+        classes: tuple[str, ...],
+        minimums: tuple[int, ...],
+        max_repeat: int | None = None,
+        forbidden: tuple[str, ...] = (),
+    ):
+        if len(classes) != len(minimums):
+            raise ValueError("need one minimum per class")
+        if max_repeat is not None and max_repeat < 1:
+            raise ValueError("max_repeat must be at least 1")
+        if "" in forbidden:
+            raise ValueError("forbidden substrings must be non-empty")
+        self.classes = classes
+        self.minimums = minimums
+        self.max_repeat = max_repeat
+        # A substring using a character outside every class can never occur.
+        pool = set("".join(classes))
+        self.forbidden = tuple(f for f in forbidden if pool.issuperset(f))
+        self._delta, self._dead = _automaton(self.forbidden)
+        relevant = set("".join(self.forbidden))
+        groups = []
+        for k, chars in enumerate(classes):
+            groups.extend((k, c) for c in chars if c in relevant)
+            other = "".join(c for c in chars if c not in relevant)
+            if other:
+                groups.append((k, other))
+        self._groups = tuple(groups)
+        states = self._all_states()
+        index = {state: i for i, state in enumerate(states)}
+        # _moves[s]: (group, repeats_last, multiplicity, next state id) for
+        # every character that may follow state s.
+        self._moves = [
+            tuple(
+                (g, repeats, mult, index[nxt])
+                for g, repeats, mult, nxt in self._next(*state)
+            )
+            for state in states
+        ]
+        self._start = 0
+        # States still needing more characters than a length has count 0
+        # there and are skipped; _work[t] counts the moves of states needing
+        # at most t.
+        self._short = [sum(state[0]) for state in states]
+        self._work = [0] * (sum(minimums) + 1)
+        for short, moves in zip(self._short, self._moves):
+            self._work[short] += len(moves)
+        self._work = list(accumulate(self._work))
+        self._tables = [[int(not short) for short in self._short]]
+        self._lock = threading.Lock()
+
+    def _all_states(self) -> list:
+        """Every state reachable from the start, the start first."""
+        start = (self.minimums, -1, 0, 0)
+        states = [start]
+        seen = {start}
+        queue = deque(states)
+        work = 0
+        while queue:
+            for *_, nxt in self._next(*queue.popleft()):
+                work += 1
+                if work > MAX_TABLE_WORK:
+                    raise _too_complex()
+                if nxt not in seen:
+                    seen.add(nxt)
+                    states.append(nxt)
+                    queue.append(nxt)
+        return states
+
+    def _next(self, need: tuple, last: int, run: int, ac: int) -> Iterator[tuple]:
+        """Yield (group, repeats_last, multiplicity, next_state) for one character."""
+        delta, dead = self._delta[ac], self._dead
+        for g, (k, chars) in enumerate(self._groups):
+            # Multi-character groups hold only characters the automaton
+            # ignores, which all lead back to its root.
+            step = delta.get(chars[0], 0)
+            if dead[step]:
+                continue
+            left = need[:k] + (max(need[k] - 1, 0),) + need[k + 1:]
+            if self.max_repeat is None:
+                yield g, False, len(chars), (left, -1, 0, step)
+            elif g == last:
+                if run < self.max_repeat:
+                    yield g, True, 1, (left, g, run + 1, step)
+                if len(chars) > 1:
+                    yield g, False, len(chars) - 1, (left, g, 1, step)
+            else:
+                yield g, False, len(chars), (left, g, 1, step)
+
+    def _table(self, n: int) -> list:
+        """Number of valid n-character completions from every state id."""
+        if n >= len(self._tables):
+            top = len(self._work) - 1
+            work = sum(self._work[1:n + 1]) + max(n - top, 0) * self._work[top]
+            if work > MAX_TABLE_WORK:
+                raise _too_complex()
+            with self._lock:
+                while n >= len(self._tables):
+                    m = len(self._tables)
+                    prev = self._tables[-1]
+                    self._tables.append([
+                        sum(mult * prev[j] for _, _, mult, j in moves)
+                        if short <= m else 0
+                        for moves, short in zip(self._moves, self._short)
+                    ])
+        return self._tables[n]
+
+    def count(self, length: int) -> int:
+        """Number of valid passwords of length."""
+        return self._table(length)[self._start]
+
+    def _walk(self, length: int, rank: int) -> Iterator[str]:
+        if not 0 <= rank < self.count(length):
+            raise ValueError("rank out of range")
+        self._table(length)
+        tables = self._tables
+        state = self._start
+        last = -1
+        prev = -1
+        for n in range(length - 1, -1, -1):
+            table = tables[n]
+            for g, repeats, mult, nxt in self._moves[state]:
+                block = mult * table[nxt]
+                if rank < block:
+                    break
+                rank -= block
+            j, rank = divmod(rank, table[nxt])
+            if repeats:
+                j = prev
+            elif g == last and j >= prev:
+                j += 1  # skip the character that would extend the run
+            yield self._groups[g][1][j]
+            prev = j
+            if self.max_repeat is not None:
+                last = g
+            state = nxt
+
+
+def _automaton(patterns: tuple[str, ...]) -> tuple[list, list]:
+    """Aho-Corasick automaton over patterns, as (delta, dead).
+
+    delta[s] maps each character occurring in a pattern to the next state
+    (any other character leads back to the root, state 0); dead[s] is True
+    when entering s completes a pattern.
+    """
+    goto = [{}]
+    dead = [False]
+    for pattern in patterns:
+        state = 0
+        for char in pattern:
+            if char not in goto[state]:
+                goto[state][char] = len(goto)
+                goto.append({})
+                dead.append(False)
+            state = goto[state][char]
+        dead[state] = True
+    alphabet = sorted(set("".join(patterns)))
+    fail = [0] * len(goto)
+    delta = [{} for _ in goto]
+    for char in alphabet:
+        delta[0][char] = goto[0].get(char, 0)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        # fail[state] is shallower, so its dead flag is already final.
+        dead[state] = dead[state] or dead[fail[state]]
+        for char in alphabet:
+            child = goto[state].get(char)
+            if child is None:
+                delta[state][char] = delta[fail[state]][char]
+            else:
+                fail[child] = delta[fail[state]][char]
+                delta[state][char] = child
+                queue.append(child)
+    return delta, dead
+
+
+@lru_cache(maxsize=64)
+def policy_sampler(
+    classes: tuple[str, ...],
+    minimums: tuple[int, ...],
+    max_repeat: int | None,
+    forbidden: tuple[str, ...] = (),
+) -> CompositionSampler | PolicySampler:
+    """Shared, cached sampler for the policy; its counting tables grow on demand."""
+    if max_repeat is None and not forbidden:
+        return CompositionSampler(classes, minimums)
+    return PolicySampler(classes, minimums, max_repeat, forbidden)
@@ -0,0 +1,170 @@
+"""Wipeable password buffers: generation without immutable string copies.
+
+A Python str or bytes cannot be overwritten, so every password returned as
+one stays on the heap until the allocator happens to reuse its memory.
+SecretBuffer instead holds passwords in a mutable buffer that generation
+writes into directly (see passgen.generator.generate_into) and that zero()
+overwrites. With lock=True the buffer is an anonymous mmap locked into RAM
+(mlock) and, where supported, excluded from core dumps.
+
+Only the password text is protected this way: the raw random bytes it was
+sampled from still pass through ordinary bytes objects, and decode() (for
+APIs that insist on a str) makes exactly the kind of copy this avoids.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+from contextlib import suppress
+
+from passgen.generator import EntropySource, PasswordConfig, generate_into
+
+
+class SecretBuffer:
+    """size mutable bytes that are zeroed by zero(), on `with` exit or on collection."""
+
+    def __init__(self, size: int, lock: bool = False):
+        if size < 0:
+            raise ValueError("size must be non-negative")
+        self.locked = False
+        self._mm = None
+        self._view = None
+        if lock and size:
+            self._mm = mmap.mmap(-1, size)
+            self._buf = self._mm
+            try:
+                _mlock(self._mm, size)
+            except BaseException:
+                self._mm.close()
+                raise
+            self.locked = True
+            if hasattr(mmap, "MADV_DONTDUMP"):
+                self._mm.madvise(mmap.MADV_DONTDUMP)
+        else:
+            self._buf = bytearray(size)
+        self._size = size
+        self._view = memoryview(self._buf)
+
+    @property
+    def buffer(self):
+        """The underlying bytearray or mmap, for writing into."""
+        self._check()
+        return self._buf
+
+    @property
+    def view(self) -> memoryview:
+        """A memoryview of the contents; pass it to file.write() or slice it."""
+        self._check()
+        return self._view
+
+    def _check(self) -> None:
+        if self._view is None:
+            raise ValueError("secret has been zeroed")
+
+    def __len__(self) -> int:
+        return self._size
+
+    def decode(self, encoding: str = "ascii") -> str:
+        """The contents as a str: an immutable copy, for APIs that need one."""
+        return str(self.view, encoding)
+
+    def zero(self) -> None:
+        """Overwrite the contents with zero bytes and release the buffer."""
+        if self._view is None:
+            return
+        self._view[:] = bytes(self._size)
+        self._view.release()
+        self._view = None
+        if self._mm is not None:
+            if self.locked:
+                _munlock(self._mm, self._size)
+            self._mm.close()
+            self._mm = None
+        self._buf = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.zero()
+
+    def __del__(self):
+        # Nothing to report a failure to at collection or shutdown.
+        with suppress(Exception):
+            self.zero()
+
+    def __repr__(self) -> str:
+        state = "zeroed" if self._view is None else f"{self._size} bytes"
+        return f"<SecretBuffer {state}>"
+
+
+def _libc():
+    import ctypes
+
+    return ctypes, ctypes.CDLL(None, use_errno=True)
+
+
+def _mlock(mm: mmap.mmap, size: int) -> None:
+    """mlock(2) the pages of mm; ValueError if the platform or limits refuse."""
+    try:
+        ctypes, libc = _libc()
+        mlock = libc.mlock
+    except (OSError, AttributeError):
+        raise ValueError("locking memory is not supported on this platform") from None
+    anchor = ctypes.c_char.from_buffer(mm)
+    try:
+        if mlock(ctypes.c_void_p(ctypes.addressof(anchor)), ctypes.c_size_t(size)):
+            error = ctypes.get_errno()
+            raise ValueError(f"could not lock secret memory: {os.strerror(error)}")
+    finally:
+        del anchor
+
+
+def _munlock(mm: mmap.mmap, size: int) -> None:
+    ctypes, libc = _libc()
+    anchor = ctypes.c_char.from_buffer(mm)
+    try:
+        libc.munlock(ctypes.c_void_p(ctypes.addressof(anchor)), ctypes.c_size_t(size))
+    finally:
+        del anchor
+
+
+def generate_secret(
+    config: PasswordConfig, entropy: EntropySource | None = None, lock: bool = False
+) -> SecretBuffer:
+    """generate_password(), as a SecretBuffer holding the ASCII password."""
+    secret = SecretBuffer(config.length, lock=lock)
+    try:
+        generate_into(config, secret.buffer, entropy=entropy)
+    except BaseException:
+        secret.zero()
+        raise
+    return secret
+
+
+def generate_secrets(
+    config: PasswordConfig,
+    count: int,
+    entropy: EntropySource | None = None,
+    lock: bool = False,
+    terminator: bytes = b"\n",
+) -> SecretBuffer:
+    """count passwords in one SecretBuffer, each followed by terminator.
+
+    Password r is view[r * stride:r * stride + config.length] with stride =
+    config.length + len(terminator); with the default newline terminator
+    the whole buffer can be written out as is.
+    """
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    stride = config.length + len(terminator)
+    secret = SecretBuffer(count * stride, lock=lock)
+    try:
+        if terminator:
+            for i, byte in enumerate(terminator):
+                secret.view[config.length + i::stride] = bytes([byte]) * count
+        generate_into(config, secret.buffer, count, stride, entropy=entropy)
+    except BaseException:
+        secret.zero()
+        raise
+    return secret
@@ -0,0 +1,202 @@
+"""Warm password daemon on a Unix domain socket (`passgen serve`).
+
+The daemon keeps compiled character pools in memory and answers many
+concurrent clients from one asyncio loop. Passwords are generated in a
+small thread pool, each worker drawing from its own pre-filled entropy
+buffer, so a large request never stalls the loop for other clients.
+
+Protocol: one JSON object per line in, one JSON object per line out.
+Request fields, all optional: length (8-128, default 16), symbols and
+numbers (booleans, default true), strategy ("shuffle" or "reject") and
+count (1-MAX_COUNT, default 1). The reply is {"passwords": [...]} or
+{"error": "<message>"}.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from passgen.generator import (
+    STRATEGIES,
+    CompiledPolicy,
+    EntropyBuffer,
+    PasswordConfig,
+    generate_passwords,
+)
+
+# Same bounds as the CLI's --length validation.
+MIN_LENGTH = 8
+MAX_LENGTH = 128
+MAX_COUNT = 10_000
+MAX_LINE = 4096
+BUFFER_SIZE = 1 << 16
+WORKERS = 4
+
+
+def parse_request(request: object) -> tuple[PasswordConfig, int]:
+    """Validate a decoded request; return (config, count) or raise ValueError."""
+    if not isinstance(request, dict):
+        raise ValueError("request must be a JSON object")
+    unknown = set(request) - {"length", "symbols", "numbers", "strategy", "count"}
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(sorted(unknown))}")
+    length = request.get("length", 16)
+    count = request.get("count", 1)
+    symbols = request.get("symbols", True)
+    numbers = request.get("numbers", True)
+    strategy = request.get("strategy", "shuffle")
+    for name, value in (("length", length), ("count", count)):
+        if type(value) is not int:
+            raise ValueError(f"{name} must be an integer")
+    for name, value in (("symbols", symbols), ("numbers", numbers)):
+        if type(value) is not bool:
+            raise ValueError(f"{name} must be a boolean")
+    if not MIN_LENGTH <= length <= MAX_LENGTH:
+        raise ValueError(f"length must be between {MIN_LENGTH} and {MAX_LENGTH}")
+    if not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"count must be between 1 and {MAX_COUNT}")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {', '.join(STRATEGIES)}")
+    config = PasswordConfig(
+        length=length,
+        include_symbols=symbols,
+        include_numbers=numbers,
+        strategy=strategy,
+    )
+    return config, count
+
+
+def handle_line(line: bytes, entropy: EntropyBuffer) -> dict:
+    """Answer one protocol line."""
+    try:
+        config, count = parse_request(json.loads(line))
+    except ValueError as exc:  # includes json.JSONDecodeError
+        return {"error": str(exc)}
+    except RecursionError:  # deeply nested JSON, still under MAX_LINE
+        return {"error": "request is nested too deeply"}
+    return {"passwords": generate_passwords(config, count, entropy=entropy)}
+
+
+_worker = threading.local()
+
+
+def _worker_entropy() -> EntropyBuffer:
+    """The calling thread's pre-filled buffer (EntropyBuffer is not thread-safe)."""
+    try:
+        return _worker.entropy
+    except AttributeError:
+        entropy = _worker.entropy = EntropyBuffer(block_size=BUFFER_SIZE)
+        entropy.refill()
+        return entropy
+
+
+def _reply_in_worker(line: bytes) -> bytes:
+    """Encoded reply to line, built on an executor thread."""
+    reply = handle_line(line, _worker_entropy())
+    return json.dumps(reply).encode("utf-8") + b"\n"
+
+
+def warm_up() -> None:
+    """Compile every pool the protocol can ask for."""
+    for symbols in (True, False):
+        for numbers in (True, False):
+            CompiledPolicy.from_config(
+                PasswordConfig(include_symbols=symbols, include_numbers=numbers)
+            )
+
+
+async def _serve_client(reader, writer, executor: ThreadPoolExecutor) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.LimitOverrunError:
+                writer.write(b'{"error": "request line too long"}\n')
+                break
+            except asyncio.IncompleteReadError:
+                break
+            writer.write(await loop.run_in_executor(executor, _reply_in_worker, line))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def _claim_socket_path(path: str) -> None:
+    """Remove a stale socket at path; refuse if a daemon is still listening.
+
+    Only a socket owned by the current user is ever removed: anything else
+    at path (a regular file, a symlink, another user's socket) is an error.
+    """
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise OSError(f"{path} exists and is not a socket")
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise OSError(f"{path} is a socket owned by another user")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"a daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+async def serve(path: str, stop: asyncio.Event | None = None, ready=None) -> None:
+    """Listen on path until stop is set (or SIGINT/SIGTERM in the main thread).
+
+    ready, if given, is called once the socket accepts connections.
+    """
+    warm_up()
+    _claim_socket_path(path)
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # not the main thread, or unsupported platform
+
+    # Workers fill their buffer when they start, not on their first request.
+    executor = ThreadPoolExecutor(
+        WORKERS, "passgen-serve", initializer=_worker_entropy
+    )
+    # Create the socket owner-only from the start; chmod after bind would
+    # leave a window where other users could connect.
+    old_umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(
+            lambda r, w: _serve_client(r, w, executor), path, limit=MAX_LINE
+        )
+    finally:
+        os.umask(old_umask)
+    try:
+        if ready is not None:
+            ready()
+        await stop.wait()
+    finally:
+        server.close()
+        await server.wait_closed()
+        executor.shutdown(wait=False)
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def run(path: str) -> None:
+    """Blocking entry point used by `passgen serve`."""
+    asyncio.run(serve(path))
@@ -0,0 +1,330 @@
+"""Password strength: exact entropy of generated passwords, estimates for others.
+
+config_entropy() is the Shannon entropy of what generate_password(config)
+actually outputs, so it accounts for the one-of-each-set guarantee rather
+than assuming length * log2(pool). Results are cached per configuration,
+so tagging every generated password with its entropy costs a dict lookup.
+
+estimate_entropy() scores an arbitrary string. It is a pattern-aware
+heuristic (runs, sequences, keyboard walks, repeated blocks, years and
+dates, very common passwords and words, also in leetspeak), not a model of
+real-world cracking: words outside the short COMMON list, names and
+phrases are scored as random characters, so treat high scores for
+human-chosen passwords as an upper bound. Only lookup tables are memoized,
+never the scored strings themselves.
+"""
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from itertools import combinations
+from typing import Iterable, Iterator
+
+from passgen.generator import (
+    CharacterSet,
+    CompiledPolicy,
+    PasswordConfig,
+    _policy_sampler,
+    check_config,
+)
+
+
+def config_entropy(config: PasswordConfig) -> float:
+    """Exact Shannon entropy, in bits, of generate_password(config)."""
+    policy = CompiledPolicy.from_config(config)
+    check_config(config, policy)
+    sampler = _policy_sampler(config, policy)
+    if sampler is not None:
+        # The policy sampler is uniform over every valid password.
+        return _log2_count(sampler.count(config.length))
+    sizes = tuple(len(chars) for chars in policy.classes)
+    if config.strategy == "reject":
+        return _reject_entropy(sizes, config.length)
+    return _shuffle_entropy(sizes, config.length)
+
+
+@lru_cache(maxsize=1024)
+def _reject_entropy(sizes: tuple, length: int) -> float:
+    """log2 of the number of passwords using every class (inclusion-exclusion)."""
+    total = sum(sizes)
+    count = 0
+    for r in range(len(sizes) + 1):
+        for missing in combinations(sizes, r):
+            count += (-1) ** r * (total - sum(missing)) ** length
+    return _log2_count(count)
+
+
+def _log2_count(count: int) -> float:
+    if not count:
+        raise ValueError("no password satisfies this policy")
+    return math.log2(count)
+
+
+@lru_cache(maxsize=1024)
+def _shuffle_entropy(sizes: tuple, length: int) -> float:
+    """Entropy of "one of each class, pool filler, uniform shuffle".
+
+    A password with n_k characters from class k is produced with
+    probability prod(n_k / |C_k|) * N**-(L - m) / (L! / (L - m)!), and n_k
+    is 1 + Binomial(L - m, |C_k| / N). So the entropy, -E[log2 P], needs
+    only E[log2 n_k] per class: O(m * L) work.
+    """
+    m = len(sizes)
+    free = length - m
+    if free < 0:
+        raise ValueError(f"length must be at least {m}")
+    total = sum(sizes)
+    bits = sum(map(math.log2, sizes)) + free * math.log2(total)
+    bits += math.log2(math.perm(length, m))
+    for size in sizes:
+        p = size / total
+        bits -= sum(
+            math.comb(free, j) * p**j * (1 - p) ** (free - j) * math.log2(1 + j)
+            for j in range(free + 1)
+        )
+    return bits
+
+
+# ---------------------------------------------------------------------------
+# Pattern-aware estimator
+# ---------------------------------------------------------------------------
+
+# Alphabet size assumed for characters outside the four ASCII sets.
+OTHER_SIZE = 100
+MIN_PATTERN = 3
+
+_CLASS_OF = str.maketrans(
+    {
+        **dict.fromkeys(CharacterSet.LOWERCASE, "l"),
+        **dict.fromkeys(CharacterSet.UPPERCASE, "u"),
+        **dict.fromkeys(CharacterSet.NUMBERS, "d"),
+        **dict.fromkeys(CharacterSet.SYMBOLS, "s"),
+    }
+)
+_CLASS_SIZE = {
+    "l": len(CharacterSet.LOWERCASE),
+    "u": len(CharacterSet.UPPERCASE),
+    "d": len(CharacterSet.NUMBERS),
+    "s": len(CharacterSet.SYMBOLS),
+}
+
+KEYBOARD_ROWS = (
+    "`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./",
+    "~!@#$%^&*()_+", "QWERTYUIOP{}|", 'ASDFGHJKL:"', "ZXCVBNM<>?",
+)
+_KEY_POSITION = {
+    key: (row, col)
+    for row, keys in enumerate(KEYBOARD_ROWS)
+    for col, key in enumerate(keys)
+}
+_KEYBOARD_BITS = math.log2(len(_KEY_POSITION))
+
+# A handful of the most common leaked passwords and words, matched
+# case-insensitively as substrings.
+COMMON = (
+    "password", "123456", "qwerty", "letmein", "welcome", "admin", "login",
+    "dragon", "monkey", "iloveyou", "sunshine", "princess", "football",
+    "baseball", "master", "shadow", "superman", "trustno1", "passw0rd",
+    "abc123", "starwars", "whatever", "freedom", "secret", "hello",
+    "summer", "winter", "spring", "autumn", "love", "qazwsx",
+)
+_COMMON_BITS = math.log2(len(COMMON))
+
+# Common leetspeak substitutions, undone on both sides before matching
+# COMMON; each character differing from the listed spelling costs one bit.
+_UNLEET = str.maketrans("@4310!$57+", "aaeioisstt")
+
+
+def _spellings() -> dict:
+    """COMMON grouped by their spelling with the substitutions undone."""
+    spellings = {}
+    for word in COMMON:
+        spellings.setdefault(word.translate(_UNLEET), []).append(word)
+    return spellings
+
+
+_SPELLINGS = _spellings()
+
+# Years from FIRST_YEAR on, alone or in a date (day, month and year in any
+# of the usual orders, optionally separated by - / or .).
+FIRST_YEAR = 1900
+YEARS = 200
+_YEAR_BITS = math.log2(YEARS)
+_DATE_BITS = math.log2(31 * 12 * YEARS) + 2  # + which order, which separator
+
+
+@lru_cache(maxsize=None)
+def _bits_per_char(classes: frozenset, other: bool) -> float:
+    return math.log2(sum(_CLASS_SIZE[c] for c in classes) + other * OTHER_SIZE)
+
+
+def _class_bits(char: str) -> float:
+    code = char.translate(_CLASS_OF)
+    return math.log2(_CLASS_SIZE.get(code, OTHER_SIZE))
+
+
+def _runs(password: str, step) -> Iterator[tuple[int, int]]:
+    """Maximal (start, end) spans where step(prev, cur) holds between neighbours."""
+    start = 0
+    for i in range(1, len(password) + 1):
+        if i == len(password) or not step(password[i - 1], password[i]):
+            if i - start >= MIN_PATTERN:
+                yield start, i
+            start = i
+
+
+def _sequence_step(a: str, b: str) -> bool:
+    """Neighbours in code point order within one of the ASCII sets (abc, 987)."""
+    code = a.translate(_CLASS_OF)
+    return abs(ord(a) - ord(b)) == 1 and code in _CLASS_SIZE and code == b.translate(
+        _CLASS_OF
+    )
+
+
+def _keyboard_step(a: str, b: str) -> bool:
+    """Horizontal neighbours on a US QWERTY keyboard (asd, poi)."""
+    pa, pb = _KEY_POSITION.get(a), _KEY_POSITION.get(b)
+    return (
+        pa is not None and pb is not None and pa[0] == pb[0] and abs(pa[1] - pb[1]) == 1
+    )
+
+
+@lru_cache(maxsize=None)
+def _walks() -> re.Pattern:
+    """Regex matching any MIN_PATTERN-long sequence or keyboard walk."""
+    chars = sorted(set(_KEY_POSITION) | set(map(chr, _CLASS_OF)))
+    walks = set()
+    for step in (_sequence_step, _keyboard_step):
+        following = {a: [b for b in chars if step(a, b)] for a in chars}
+        stretches = chars
+        for _ in range(MIN_PATTERN - 1):
+            stretches = [s + b for s in stretches for b in following[s[-1]]]
+        walks.update(stretches)
+    return re.compile(_alternation(walks))
+
+
+def _alternation(words) -> str:
+    """Regex source matching any of the equal-length words, nested by prefix.
+
+    A flat a|b|c alternation of hundreds of literals tries each one at every
+    position; grouping by first character lets the engine branch once.
+    """
+    groups = {}
+    for word in words:
+        groups.setdefault(word[0], set()).add(word[1:])
+    parts = []
+    for head, tails in sorted(groups.items()):
+        if tails == {""}:
+            parts.append(re.escape(head))
+        else:
+            parts.append(f"{re.escape(head)}(?:{_alternation(tails)})")
+    return "|".join(parts)
+
+
+_REPEAT = re.compile(rf"(.)\1{{{MIN_PATTERN - 1},}}", re.DOTALL)
+_BLOCK = re.compile(r"(.{2,}?)\1+", re.DOTALL)
+_COMMON = re.compile("(?=({}))".format("|".join(map(re.escape, _SPELLINGS))))
+_DATE_LIKE = re.compile(r"\d\d?[-/.]?\d\d?[-/.]?\d\d")
+_YEAR = re.compile(r"(?=((?:19|20)\d\d))")
+_DATE = re.compile(
+    r"(?=(\d\d?([-/.]?)\d\d?\2(?:\d\d)?\d\d|(?:19|20)\d\d([-/.]?)\d\d?\3\d\d?))"
+)
+
+
+def _is_date(text: str) -> bool:
+    """Whether text reads as day, month and year in some usual order."""
+    parts = re.split(r"[-/.]", text)
+    if len(parts) != 3:
+        digits = text
+        if len(digits) == 6:
+            parts = [digits[:2], digits[2:4], digits[4:]]
+        elif len(digits) == 8 and digits[:2] in ("19", "20"):
+            parts = [digits[:4], digits[4:6], digits[6:]]
+        elif len(digits) == 8:
+            parts = [digits[:2], digits[2:4], digits[4:]]
+        else:
+            return False
+    if len(parts[0]) == 4:
+        parts = parts[1:] + parts[:1]
+    first, second, year = map(int, parts)
+    if len(parts[2]) == 4 and not FIRST_YEAR <= year < FIRST_YEAR + YEARS:
+        return False
+    return (1 <= first <= 31 and 1 <= second <= 12) or (
+        1 <= first <= 12 and 1 <= second <= 31
+    )
+
+
+def _matches(password: str) -> list[tuple[int, int, float]]:
+    """(start, end, bits) for every recognised pattern in password.
+
+    C-level regexes find repeats, repeated blocks, common words, years and
+    dates and rule out sequences and keyboard walks, so random passwords
+    never reach the per-pair scans.
+    """
+    found = []
+    for m in _REPEAT.finditer(password):
+        start, end = m.span()
+        bits = _class_bits(password[start]) + math.log2(end - start)
+        found.append((start, end, bits))
+    if _walks().search(password):
+        for start, end in _runs(password, _sequence_step):
+            bits = _class_bits(password[start]) + math.log2(end - start) + 1
+            found.append((start, end, bits))
+        for start, end in _runs(password, _keyboard_step):
+            found.append((start, end, _KEYBOARD_BITS + math.log2(end - start) + 1))
+    lowered = password.lower()
+    for m in _COMMON.finditer(lowered.translate(_UNLEET)):
+        start, end = m.span(1)
+        typed = lowered[start:end]
+        swaps = min(
+            sum(a != b for a, b in zip(typed, word)) for word in _SPELLINGS[m.group(1)]
+        )
+        bits = _COMMON_BITS + (password[start:end] != typed) + swaps
+        found.append((start, end, bits))
+    if _DATE_LIKE.search(password):
+        for m in _YEAR.finditer(password):
+            found.append((*m.span(1), _YEAR_BITS))
+        for m in _DATE.finditer(password):
+            if _is_date(m.group(1)):
+                found.append((*m.span(1), _DATE_BITS))
+    # A repeated block repeats its first two characters.
+    pairs = set(zip(password, password[1:]))
+    for m in _BLOCK.finditer(password) if len(pairs) < len(password) - 1 else ():
+        start, end = m.span()
+        block = m.group(1)
+        bits = estimate_entropy(block) + math.log2((end - start) // len(block))
+        found.append((start, end, bits))
+    return found
+
+
+def estimate_entropy(password: str) -> float:
+    """Estimated bits of entropy of an arbitrary password.
+
+    Each character costs log2 of the combined size of the character sets
+    the password uses, unless it is cheaper to describe a span as a
+    pattern; the cheapest cover of the whole string is found by dynamic
+    programming.
+    """
+    if not password:
+        return 0.0
+    codes = set(password.translate(_CLASS_OF))
+    classes = frozenset(codes & _CLASS_SIZE.keys())
+    per_char = _bits_per_char(classes, len(codes) > len(classes))
+    matches = _matches(password)
+    if not matches:
+        return len(password) * per_char
+    ending = {}
+    for start, end, bits in matches:
+        ending.setdefault(end, []).append((start, bits))
+    best = [0.0] * (len(password) + 1)
+    for i in range(1, len(password) + 1):
+        best[i] = best[i - 1] + per_char
+        for start, bits in ending.get(i, ()):
+            best[i] = min(best[i], best[start] + bits)
+    return best[-1]
+
+
+def score_passwords(passwords: Iterable[str]) -> Iterator[float]:
+    """estimate_entropy() over many passwords, lazily."""
+    return map(estimate_entropy, passwords)
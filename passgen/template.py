@@ -0,0 +1,169 @@
+"""Pattern-shaped and pronounceable passwords from templates like Cvccvc-99-Cvccvc.
+
+Each character of a template is either a placeholder, drawn uniformly from
+its set, or a literal copied through as is:
+
+    c  lowercase consonant      C  uppercase consonant
+    v  lowercase vowel          V  uppercase vowel
+    l  lowercase letter         u  uppercase letter
+    a  letter of either case    x  letter or digit
+    9  digit                    s  symbol
+    [...]  one of the listed characters (x-y ranges allowed, e.g. [a-f0-9])
+    \\X  the literal character X
+
+A template is parsed once into a CompiledTemplate of per-position character
+sets and cached by template string. Positions are independent and uniform,
+so the exact entropy is the sum of log2 of their set sizes, and generating
+a batch draws every position sharing a set in one sampler call.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+from passgen.generator import (
+    CharacterSet,
+    EntropySource,
+    _as_buffer,
+    _normalize_alphabets,
+    _sampler,
+)
+
+VOWELS = "aeiou"
+CONSONANTS = "".join(c for c in CharacterSet.LOWERCASE if c not in VOWELS)
+
+PLACEHOLDERS = {
+    "c": CONSONANTS,
+    "C": CONSONANTS.upper(),
+    "v": VOWELS,
+    "V": VOWELS.upper(),
+    "l": CharacterSet.LOWERCASE,
+    "u": CharacterSet.UPPERCASE,
+    "a": CharacterSet.LOWERCASE + CharacterSet.UPPERCASE,
+    "x": CharacterSet.LOWERCASE + CharacterSet.UPPERCASE + CharacterSet.NUMBERS,
+    "9": CharacterSet.NUMBERS,
+    "s": CharacterSet.SYMBOLS,
+}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Per-position character sets of one template, built once and cached.
+
+    positions holds one str per output character: a single literal
+    character or the set a placeholder draws from. groups maps each
+    distinct set to its sampler and the positions that use it.
+    """
+
+    template: str
+    positions: tuple
+    groups: tuple
+
+    @property
+    def length(self) -> int:
+        return len(self.positions)
+
+    @property
+    def combinations(self) -> int:
+        """Number of distinct passwords the template can produce."""
+        return math.prod(len(chars) for chars in self.positions)
+
+    @property
+    def entropy_bits(self) -> float:
+        """Exact Shannon entropy, in bits, of one generated password."""
+        return math.log2(self.combinations)
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> CompiledTemplate:
+    """Parse template (see the module docstring); raise ValueError if malformed."""
+    positions = _parse(template)
+    if not any(len(chars) > 1 for chars in positions):
+        raise ValueError("template has no random positions")
+    columns = {}
+    for i, chars in enumerate(positions):
+        if len(chars) > 1:
+            columns.setdefault(chars, []).append(i)
+    return CompiledTemplate(
+        template=template,
+        positions=tuple(positions),
+        groups=tuple(
+            (_sampler(chars), tuple(cols)) for chars, cols in columns.items()
+        ),
+    )
+
+
+def _parse(template: str) -> list:
+    positions = []
+    i = 0
+    while i < len(template):
+        char = template[i]
+        if char == "\\":
+            if i + 1 == len(template):
+                raise ValueError("template ends with a lone backslash")
+            positions.append(template[i + 1])
+            i += 2
+        elif char == "[":
+            end, chars = _parse_set(template, i + 1)
+            positions.append(chars)
+            i = end + 1
+        else:
+            positions.append(PLACEHOLDERS.get(char, char))
+            i += 1
+    return positions
+
+
+def _parse_set(template: str, start: int) -> tuple[int, str]:
+    """The index of the closing ] of the set opened before start, and its characters."""
+    chars = []
+    i = start
+    while i < len(template) and template[i] != "]":
+        char = template[i]
+        if char == "\\":
+            i += 1
+            if i == len(template):
+                break
+            char = template[i]
+        if (
+            chars and char == "-" and template[i - 1] != "\\"
+            and i + 1 < len(template) and template[i + 1] != "]"
+        ):
+            low, high = chars.pop(), template[i + 1]
+            if ord(low) > ord(high):
+                raise ValueError(f"bad range {low}-{high} in template")
+            chars.extend(map(chr, range(ord(low), ord(high) + 1)))
+            i += 2
+            continue
+        chars.append(char)
+        i += 1
+    if i == len(template):
+        raise ValueError("unterminated [ in template")
+    if not chars:
+        raise ValueError("empty [] in template")
+    return i, _normalize_alphabets(("".join(chars),))[0]
+
+
+def generate_template_passwords(
+    template: str, count: int, entropy: EntropySource | None = None
+) -> list[str]:
+    """Generate count passwords shaped by template.
+
+    Every set is sampled once for the whole batch, count * (positions using
+    it) characters at a time, and the columns are zipped into passwords.
+    """
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    compiled = compile_template(template)
+    entropy = _as_buffer(entropy)
+    columns = [[chars] * count for chars in compiled.positions]
+    for sampler, cols in compiled.groups:
+        drawn = sampler.text(count * len(cols), entropy)
+        for j, col in enumerate(cols):
+            columns[col] = drawn[j::len(cols)]
+    return list(map("".join, zip(*columns)))
+
+
+def generate_template_password(template: str, entropy: EntropySource | None = None) -> str:
+    """Generate one password shaped by template (see generate_template_passwords)."""
+    return generate_template_passwords(template, 1, entropy)[0]
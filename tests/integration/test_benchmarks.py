@@ -0,0 +1,41 @@
+"""Smoke test: the benchmark suite runs and emits well-formed JSON."""
+import json
+import pathlib
+import subprocess
+import sys
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def test_quick_suite_emits_json():
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--quick",
+         "--filter", "single_latency", "--filter", "entropy"],
+        capture_output=True, text=True, cwd=REPO_ROOT,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    assert set(report["meta"]) >= {"passgen", "python", "platform", "timestamp"}
+    names = {r["name"] for r in report["results"]}
+    assert names == {"single_latency", "entropy_draws", "entropy_bytes"}
+    for r in report["results"]:
+        assert set(r) >= {"name", "params", "unit", "value", "lower_is_better"}
+        assert r["value"] > 0
+
+
+def test_compare_flags_regressions():
+    sys.path.insert(0, str(REPO_ROOT))
+    try:
+        from benchmarks.run import compare
+    finally:
+        sys.path.remove(str(REPO_ROOT))
+    old = {"results": [
+        {"name": "a", "params": {}, "value": 10.0, "lower_is_better": True},
+        {"name": "b", "params": {}, "value": 100.0, "lower_is_better": False},
+    ]}
+    new = {"results": [
+        {"name": "a", "params": {}, "value": 20.0, "lower_is_better": True},
+        {"name": "b", "params": {}, "value": 95.0, "lower_is_better": False},
+    ]}
+    regressions = compare(old, new, threshold=1.25)
+    assert [(r["name"], round(ratio, 2)) for r, ratio in regressions] == [("a", 2.0)]
@@ -138,3 +138,30 @@ class TestPassgenCharSets:
         letters = LOWERCASE + UPPERCASE
         for ch in password:
             assert ch in letters
+
+
+# ---------------------------------------------------------------------------
+# passgen --count N (streaming mode)
+# ---------------------------------------------------------------------------
+
+class TestPassgenCount:
+    def test_count_outputs_n_lines_exit_0(self):
+        code, stdout, stderr = run_passgen("--count", "5000")
+        assert code == 0
+        lines = stdout.splitlines()
+        assert len(lines) == 5000
+        assert all(len(line) == 16 for line in lines)
+        assert stderr == ""
+
+    def test_infinite_count_stops_cleanly_when_reader_closes(self):
+        proc = subprocess.Popen(
+            [PYTHON, "-m", "passgen.cli", "--count", "-1"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        for _ in range(10):
+            assert len(proc.stdout.readline().rstrip(b"\n")) == 16
+        proc.stdout.close()
+        stderr = proc.stderr.read()
+        assert proc.wait(timeout=30) == 0
+        assert b"Traceback" not in stderr
@@ -0,0 +1,53 @@
+"""Startup-time checks for the passgen CLI, based on `python -X importtime`."""
+import subprocess
+import sys
+
+PYTHON = sys.executable
+
+# Cumulative import time allowed for passgen.cli and everything it pulls in
+# on the `passgen --no-clipboard` path. Locally this is ~45 ms; the budget
+# leaves headroom for slow CI machines while still catching an eager import
+# of pyperclip, NumPy or similar.
+IMPORT_BUDGET_US = 150_000
+
+
+def run_importtime(argv):
+    """Run passgen.cli.main(argv) under -X importtime; return (code, stdout, table)."""
+    code = f"from passgen.cli import main; main({argv!r})"
+    result = subprocess.run(
+        [PYTHON, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    table = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        table[name.strip()] = int(cumulative)
+    return result.returncode, result.stdout, table
+
+
+class TestStartupImportTime:
+    def test_no_clipboard_run_succeeds(self):
+        code, stdout, _ = run_importtime(["--no-clipboard"])
+        assert code == 0
+        assert len(stdout.strip()) == 16
+
+    def test_no_clipboard_does_not_import_pyperclip(self):
+        _, _, table = run_importtime(["--no-clipboard"])
+        assert "passgen.cli" in table
+        assert "pyperclip" not in table
+
+    def test_count_mode_does_not_import_pyperclip(self):
+        _, _, table = run_importtime(["--count", "3"])
+        assert "pyperclip" not in table
+
+    def test_no_optional_heavy_modules_at_startup(self):
+        _, _, table = run_importtime(["--no-clipboard"])
+        for module in ("numpy", "concurrent.futures", "passgen.parallel"):
+            assert module not in table
+
+    def test_cli_import_within_budget(self):
+        _, _, table = run_importtime(["--no-clipboard"])
+        assert table["passgen.cli"] < IMPORT_BUDGET_US
@@ -0,0 +1,37 @@
+"""Shared fixtures for unit tests."""
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Run passgen.server.serve on a temporary socket in a background thread."""
+    from passgen.server import serve
+
+    path = str(tmp_path / "passgen.sock")
+    started = threading.Event()
+    state = {}
+
+    async def run():
+        state["loop"] = asyncio.get_running_loop()
+        state["stop"] = asyncio.Event()
+        await serve(path, state["stop"], ready=started.set)
+
+    thread = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+    thread.start()
+    assert started.wait(10), "daemon did not start"
+    yield path
+    state["loop"].call_soon_threadsafe(state["stop"].set)
+    thread.join(10)
+
+
+@pytest.fixture
+def wordlist_path(tmp_path):
+    """An indexed wordlist of 1000 distinct words ("w000" .. "w999")."""
+    from passgen.passphrase import write_wordlist
+
+    path = str(tmp_path / "words.pgw")
+    write_wordlist([f"w{i:03d}" for i in range(1000)], path)
+    return path
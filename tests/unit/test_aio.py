@@ -0,0 +1,117 @@
+"""Unit tests for passgen.aio."""
+import asyncio
+import secrets
+import threading
+
+import pytest
+
+from passgen.generator import CharacterSet, PasswordConfig
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncEntropyPool:
+    def test_invalid_watermarks_raise(self):
+        from passgen.aio import AsyncEntropyPool
+        with pytest.raises(ValueError):
+            AsyncEntropyPool(low_watermark=10, high_watermark=5)
+
+    def test_ensure_fills_to_high_watermark(self):
+        from passgen.aio import AsyncEntropyPool
+        pool = AsyncEntropyPool(chunk_size=1024, low_watermark=4096, high_watermark=8192)
+
+        async def scenario():
+            await pool.ensure(1)
+            await pool._filling
+            return pool.available()
+
+        assert run(scenario()) >= 8192
+
+    def test_ensure_waits_for_requested_bytes(self):
+        from passgen.aio import AsyncEntropyPool
+        pool = AsyncEntropyPool(chunk_size=1024, low_watermark=0, high_watermark=0)
+
+        async def scenario():
+            await pool.ensure(50_000)
+            return pool.available()
+
+        assert run(scenario()) >= 50_000
+
+    def test_reads_span_blocks_without_repeats(self):
+        from passgen.aio import AsyncEntropyPool
+        pool = AsyncEntropyPool(chunk_size=64, low_watermark=0, high_watermark=0)
+
+        async def scenario():
+            await pool.ensure(4096)
+            return [pool.read(100) for _ in range(40)]
+
+        chunks = run(scenario())
+        assert all(len(chunk) == 100 for chunk in chunks)
+        assert len(set(chunks)) == len(chunks)
+
+    def test_empty_pool_falls_back_to_synchronous_draw(self):
+        from passgen.aio import AsyncEntropyPool
+        pool = AsyncEntropyPool(chunk_size=64, low_watermark=0, high_watermark=0)
+        assert len(pool.read(10)) == 10
+
+
+class TestAsyncGeneration:
+    def test_generate_password_async(self):
+        from passgen.aio import generate_password_async
+        config = PasswordConfig(length=20, include_symbols=False)
+        result = run(generate_password_async(config))
+        assert len(result) == 20
+        assert not any(ch in CharacterSet.SYMBOLS for ch in result)
+
+    def test_iter_passwords_async_count(self):
+        from passgen.aio import iter_passwords_async
+
+        async def collect():
+            return [pw async for pw in iter_passwords_async(PasswordConfig(), 1000, 64)]
+
+        result = run(collect())
+        assert len(result) == 1000
+        assert len(set(result)) == 1000
+
+    def test_iter_passwords_async_negative_count_raises(self):
+        from passgen.aio import iter_passwords_async
+
+        async def collect():
+            return [pw async for pw in iter_passwords_async(PasswordConfig(), -1)]
+
+        with pytest.raises(ValueError):
+            run(collect())
+
+    def test_default_pool_is_per_loop(self):
+        from passgen.aio import default_pool
+
+        async def get():
+            return default_pool(), default_pool()
+
+        a1, a2 = run(get())
+        b1, _ = run(get())
+        assert a1 is a2
+        assert a1 is not b1
+
+    def test_no_entropy_syscalls_on_loop_thread_once_warm(self, monkeypatch):
+        from passgen.aio import AsyncEntropyPool, generate_password_async
+        loop_thread_draws = []
+        real_token_bytes = secrets.token_bytes
+
+        def recording_token_bytes(n):
+            if threading.current_thread() is threading.main_thread():
+                loop_thread_draws.append(n)
+            return real_token_bytes(n)
+
+        monkeypatch.setattr(secrets, "token_bytes", recording_token_bytes)
+        pool = AsyncEntropyPool(chunk_size=4096)
+
+        async def scenario():
+            await pool.ensure(pool.high_watermark)
+            return [await generate_password_async(PasswordConfig(), pool) for _ in range(500)]
+
+        passwords = run(scenario())
+        assert len(passwords) == 500
+        assert loop_thread_draws == []
@@ -141,3 +141,827 @@ class TestStdoutStderrIsolation:
         assert exit_code == 2
         assert "\n" in captured.out
         assert captured.out.count("\n") == 1
+
+
+# ---------------------------------------------------------------------------
+# --count streaming mode
+# ---------------------------------------------------------------------------
+
+class TestCountMode:
+    def test_count_default_none(self):
+        from passgen.cli import parse_args
+        assert parse_args([]).count is None
+
+    def test_count_parsed(self):
+        from passgen.cli import parse_args
+        assert parse_args(["--count", "5"]).count == 5
+
+    def test_count_writes_n_lines_and_exits_0(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "25", "--length", "12"])
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 0
+        lines = captured.out.split("\n")
+        assert lines[-1] == ""
+        assert len(lines[:-1]) == 25
+        assert all(len(line) == 12 for line in lines[:-1])
+        assert captured.err == ""
+
+    def test_count_spans_multiple_batches(self, capsys, monkeypatch):
+        import passgen.cli as cli_mod
+        from passgen.cli import main
+        monkeypatch.setattr(cli_mod, "STREAM_BATCH", 7)
+        with pytest.raises(SystemExit):
+            main(["--count", "30"])
+        assert capsys.readouterr().out.count("\n") == 30
+
+    def test_count_skips_clipboard(self, capsys, monkeypatch):
+        import passgen.cli as cli_mod
+        from passgen.cli import main
+
+        def fail(_):
+            raise AssertionError("clipboard must not be used in --count mode")
+
+        monkeypatch.setattr(cli_mod, "copy_to_clipboard", fail)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "3"])
+        assert exc_info.value.code == 0
+
+    @pytest.mark.parametrize("value", ["0", "-2"])
+    def test_invalid_count_exits_1(self, value, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", value])
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert captured.out == ""
+        assert "Error: --count must be a positive integer or -1." in captured.err
+
+    def test_count_respects_charset_flags(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit):
+            main(["--count", "50", "--no-symbols", "--no-numbers"])
+        out = capsys.readouterr().out.replace("\n", "")
+        assert out.isalpha()
+
+
+# ---------------------------------------------------------------------------
+# --jobs N (parallel --count mode)
+# ---------------------------------------------------------------------------
+
+class TestJobsOption:
+    def test_jobs_default_1(self):
+        from passgen.cli import parse_args
+        assert parse_args([]).jobs == 1
+
+    def test_jobs_with_count_streams_all_passwords(self, capsys, monkeypatch):
+        import passgen.cli as cli_mod
+        from passgen.cli import main
+        monkeypatch.setattr(cli_mod, "STREAM_BATCH", 16)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "100", "--jobs", "2"])
+        assert exc_info.value.code == 0
+        assert capsys.readouterr().out.count("\n") == 100
+
+    def test_jobs_without_count_exits_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--jobs", "2"])
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert captured.out == ""
+        assert "Error: --jobs requires --count." in captured.err
+
+    def test_jobs_zero_exits_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "5", "--jobs", "0"])
+        assert exc_info.value.code == 1
+        assert "Error: --jobs must be at least 1." in capsys.readouterr().err
+
+
+# ---------------------------------------------------------------------------
+# --strategy
+# ---------------------------------------------------------------------------
+
+class TestStrategyOption:
+    def test_strategy_default_shuffle(self):
+        from passgen.cli import parse_args
+        assert parse_args([]).strategy == "shuffle"
+
+    def test_strategy_reject(self):
+        from passgen.cli import parse_args
+        assert parse_args(["--strategy", "reject"]).strategy == "reject"
+
+    def test_unknown_strategy_exits_nonzero(self):
+        from passgen.cli import parse_args
+        with pytest.raises(SystemExit) as exc_info:
+            parse_args(["--strategy", "guess"])
+        assert exc_info.value.code != 0
+
+    def test_reject_strategy_count_mode(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--strategy", "reject", "--count", "20", "--length", "8"])
+        assert exc_info.value.code == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 20
+        assert all(len(line) == 8 for line in lines)
+
+
+# ---------------------------------------------------------------------------
+# --no-clipboard
+# ---------------------------------------------------------------------------
+
+class TestNoClipboard:
+    def test_no_clipboard_default_false(self):
+        from passgen.cli import parse_args
+        assert parse_args([]).no_clipboard is False
+
+    def test_no_clipboard_prints_password_and_exits_0(self, capsys, monkeypatch):
+        import passgen.cli as cli_mod
+
+        def fail(_):
+            raise AssertionError("clipboard must not be used with --no-clipboard")
+
+        monkeypatch.setattr(cli_mod, "copy_to_clipboard", fail)
+        with pytest.raises(SystemExit) as exc_info:
+            cli_mod.main(["--no-clipboard"])
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 0
+        assert captured.out.count("\n") == 1
+        assert len(captured.out.strip()) == 16
+        assert captured.err == ""
+
+
+class TestLazyClipboard:
+    def test_pyperclip_missing_reports_failure(self, monkeypatch):
+        import sys
+
+        from passgen.clipboard import copy_to_clipboard
+        monkeypatch.setitem(sys.modules, "pyperclip", None)
+        assert copy_to_clipboard("secret") is False
+
+    def test_secret_buffer_is_copied_as_text(self, monkeypatch):
+        import sys
+        import types
+
+        from passgen.clipboard import copy_to_clipboard
+        from passgen.secret import SecretBuffer
+        copied = []
+        fake = types.SimpleNamespace(copy=copied.append, PyperclipException=Exception)
+        monkeypatch.setitem(sys.modules, "pyperclip", fake)
+        secret = SecretBuffer(6)
+        secret.view[:] = b"s3cr3t"
+        assert copy_to_clipboard(secret) is True
+        assert copied == ["s3cr3t"]
+
+
+class TestAlphabetOption:
+    def test_preset(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--alphabet", "pin", "--length", "8", "--no-clipboard", "--no-daemon"])
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert out.endswith("\n") and out[:-1].isdigit() and len(out) == 9
+
+    def test_unicode_sets_in_count_mode(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--alphabet", "абвгд", "--alphabet", "hex", "--count", "20",
+                  "--length", "10"])
+        assert exc_info.value.code == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 20
+        for line in lines:
+            assert len(line) == 10
+            assert set(line) <= set("абвгд0123456789abcdef")
+            assert any(c in "абвгд" for c in line)
+
+    def test_overlapping_sets_exit_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--alphabet", "abc", "--alphabet", "cde", "--no-clipboard"])
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert captured.out == ""
+        assert "share characters" in captured.err
+
+    def test_more_sets_than_length_exit_1(self, capsys):
+        from passgen.cli import main
+        sets = [f"--alphabet={chr(0x3b1 + 2 * i)}{chr(0x3b2 + 2 * i)}" for i in range(10)]
+        with pytest.raises(SystemExit) as exc_info:
+            main([*sets, "--length", "8", "--count", "2"])
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert captured.out == ""
+        assert "length must be at least 10" in captured.err
+
+
+class TestSecretOutput:
+    def test_deliver_writes_bytes_and_zeroes(self, capsys, monkeypatch):
+        import passgen.cli as cli_mod
+        from passgen.secret import SecretBuffer
+        copied = []
+        monkeypatch.setattr(cli_mod, "copy_to_clipboard", lambda s: copied.append(
+            s.decode()) or True)
+        secret = SecretBuffer(6)
+        buffer = secret.buffer
+        buffer[:] = b"s3cr3t"
+        with pytest.raises(SystemExit) as exc_info:
+            cli_mod.deliver(secret, no_clipboard=False)
+        assert exc_info.value.code == 0
+        assert capsys.readouterr().out == "s3cr3t\n"
+        assert copied == ["s3cr3t"]
+        assert buffer == bytes(6)
+
+    def test_count_mode_writes_secret_batches(self, capsysbinary):
+        from passgen.cli import main
+        with pytest.raises(SystemExit):
+            main(["--count", "10", "--length", "12"])
+        out = capsysbinary.readouterr().out
+        assert len(out) == 10 * 13
+        assert out.count(b"\n") == 10
+
+
+# ---------------------------------------------------------------------------
+# Daemon client mode (--socket / --no-daemon) and `passgen serve`
+# ---------------------------------------------------------------------------
+
+DAEMON_PASSWORD = "Daemon-Password!"
+
+
+class TestDaemonClientMode:
+    @pytest.fixture
+    def fixed_daemon(self, daemon, monkeypatch):
+        import passgen.server as server_mod
+        monkeypatch.setattr(
+            server_mod, "generate_passwords",
+            lambda config, count, entropy=None: [DAEMON_PASSWORD] * count,
+        )
+        return daemon
+
+    def _run(self, argv, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(argv)
+        return exc_info.value.code, capsys.readouterr()
+
+    def test_password_fetched_from_socket(self, fixed_daemon, capsys):
+        code, captured = self._run(["--socket", fixed_daemon, "--no-clipboard"], capsys)
+        assert code == 0
+        assert captured.out == DAEMON_PASSWORD + "\n"
+
+    def test_socket_from_environment(self, fixed_daemon, capsys, monkeypatch):
+        monkeypatch.setenv("PASSGEN_SOCKET", fixed_daemon)
+        code, captured = self._run(["--no-clipboard"], capsys)
+        assert captured.out == DAEMON_PASSWORD + "\n"
+
+    def test_no_daemon_generates_locally(self, fixed_daemon, capsys):
+        code, captured = self._run(
+            ["--socket", fixed_daemon, "--no-daemon", "--no-clipboard"], capsys
+        )
+        assert code == 0
+        assert captured.out != DAEMON_PASSWORD + "\n"
+        assert len(captured.out.strip()) == 16
+
+    def test_unreachable_socket_falls_back_to_local(self, tmp_path, capsys):
+        code, captured = self._run(
+            ["--socket", str(tmp_path / "missing.sock"), "--no-clipboard"], capsys
+        )
+        assert code == 0
+        assert len(captured.out.strip()) == 16
+        assert captured.err == ""
+
+    def test_untrusted_path_ignored(self, tmp_path, capsys):
+        path = tmp_path / "plain-file"
+        path.write_text("")
+        code, captured = self._run(["--socket", str(path), "--no-clipboard"], capsys)
+        assert code == 0
+        assert len(captured.out.strip()) == 16
+
+
+class TestServeCommand:
+    def test_serve_without_socket_path_exits_1(self, capsys, monkeypatch):
+        from passgen.cli import main
+        monkeypatch.delenv("PASSGEN_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["serve"])
+        assert exc_info.value.code == 1
+        assert "Error: no socket path" in capsys.readouterr().err
+
+    def test_serve_help_exits_0(self):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["serve", "--help"])
+        assert exc_info.value.code == 0
+
+
+# ---------------------------------------------------------------------------
+# passgen passphrase / passgen wordlist
+# ---------------------------------------------------------------------------
+
+class TestPassphraseCommand:
+    def test_prints_passphrase_and_copies_it(self, capsys, monkeypatch, wordlist_path):
+        import passgen.cli as cli
+        copied = []
+        monkeypatch.setattr(cli, "copy_to_clipboard", lambda s: copied.append(s) or True)
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["passphrase", "--wordlist", wordlist_path, "--words", "4"])
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        phrase = captured.out.strip()
+        assert len(phrase.split("-")) == 4
+        assert copied == [phrase]
+        assert phrase not in captured.err
+
+    def test_wordlist_from_environment(self, capsys, monkeypatch, wordlist_path):
+        from passgen.cli import main
+        monkeypatch.setenv("PASSGEN_WORDLIST", wordlist_path)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["passphrase", "--no-clipboard", "--separator", "_", "--numbers"])
+        assert exc_info.value.code == 0
+        words = capsys.readouterr().out.strip().split("_")
+        assert len(words) == 6
+        assert sum(len(w) - 4 for w in words) == 1
+
+    def test_count_streams_without_clipboard(self, capsys, monkeypatch, wordlist_path):
+        import passgen.cli as cli
+        monkeypatch.setattr(cli, "copy_to_clipboard", lambda s: pytest.fail("copied"))
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["passphrase", "--wordlist", wordlist_path, "--count", "5"])
+        assert exc_info.value.code == 0
+        assert len(capsys.readouterr().out.splitlines()) == 5
+
+    def test_missing_wordlist_exits_1(self, capsys, monkeypatch):
+        from passgen.cli import main
+        monkeypatch.delenv("PASSGEN_WORDLIST", raising=False)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["passphrase"])
+        assert exc_info.value.code == 1
+        assert "Error: no wordlist" in capsys.readouterr().err
+
+    def test_unreadable_wordlist_exits_1(self, capsys, tmp_path):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["passphrase", "--wordlist", str(tmp_path / "missing.pgw")])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
+
+    @pytest.mark.parametrize("words", ["2", "65"])
+    def test_word_count_bounds(self, capsys, wordlist_path, words):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["passphrase", "--wordlist", wordlist_path, "--words", words])
+        assert exc_info.value.code == 1
+        assert "--words" in capsys.readouterr().err
+
+
+class TestWordlistCommand:
+    def test_builds_indexed_wordlist(self, capsys, tmp_path):
+        from passgen.cli import main
+        from passgen.passphrase import Wordlist
+        source = tmp_path / "eff.txt"
+        source.write_text("11111\tabacus\n11112\tabdomen\n11113\tabdominal\n")
+        output = str(tmp_path / "eff.pgw")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["wordlist", str(source), output])
+        assert exc_info.value.code == 0
+        assert "Wrote 3 words" in capsys.readouterr().err
+        with Wordlist(output) as wordlist:
+            assert [wordlist[i] for i in range(len(wordlist))] == [
+                "abacus", "abdomen", "abdominal",
+            ]
+
+    def test_too_few_words_exits_1(self, capsys, tmp_path):
+        from passgen.cli import main
+        source = tmp_path / "one.txt"
+        source.write_text("lonely\n")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["wordlist", str(source), str(tmp_path / "one.pgw")])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
+
+
+class TestTemplateCommand:
+    def test_prints_password_and_copies_it(self, capsys, monkeypatch):
+        import re
+
+        import passgen.cli as cli
+        copied = []
+        monkeypatch.setattr(cli, "copy_to_clipboard", lambda s: copied.append(s) or True)
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["template", "Cvccvc-99-Cvccvc"])
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        password = captured.out.strip()
+        assert re.fullmatch(r"[A-Z][a-z]{5}-\d\d-[A-Z][a-z]{5}", password)
+        assert copied == [password]
+        assert password not in captured.err
+
+    def test_count_and_entropy(self, capsys, monkeypatch):
+        import passgen.cli as cli
+        monkeypatch.setattr(cli, "copy_to_clipboard", lambda s: pytest.fail("copied"))
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["template", "[a-f0-9]" * 8, "--count", "5", "--show-entropy"])
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        assert len(captured.out.split()) == 5
+        assert captured.err == "Entropy: 32.0 bits\n"
+
+    @pytest.mark.parametrize("argv", [["[ab"], ["#.#"], ["cvc", "--count", "0"]])
+    def test_errors_exit_1(self, capsys, argv):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["template", *argv])
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert captured.err.startswith("Error:")
+        assert captured.out == ""
+
+
+# ---------------------------------------------------------------------------
+# Policy options (--min-*, --max-repeat, --exclude, --no-ambiguous, --forbid)
+# ---------------------------------------------------------------------------
+
+class TestPolicyOptions:
+    def test_policy_flags_reach_the_generator(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "--length", "10", "--min-numbers", "4", "--max-repeat", "1",
+                "--no-ambiguous", "--exclude", "xyz", "--forbid", "ab",
+                "--count", "200",
+            ])
+        assert exc_info.value.code == 0
+        passwords = capsys.readouterr().out.splitlines()
+        assert len(passwords) == 200
+        for password in passwords:
+            assert sum(c.isdigit() for c in password) >= 4
+            assert all(a != b for a, b in zip(password, password[1:]))
+            assert not set(password) & set("xyz0O1lI")
+            assert "ab" not in password
+
+    def test_unsatisfiable_policy_exits_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--length", "8", "--min-symbols", "5", "--min-numbers", "5"])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error: length must be at least")
+
+    def test_policy_without_valid_passwords_exits_1(self, capsys):
+        from passgen.cli import main
+        from passgen.generator import CharacterSet
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--exclude", CharacterSet.SYMBOLS[1:], "--min-symbols", "5",
+                  "--max-repeat", "1", "--length", "8", "--show-entropy"])
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err == "Error: no password satisfies this policy.\n"
+
+    def test_tight_forbidden_substrings_still_generate(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--no-clipboard", "--alphabet", "ab", "--length", "16",
+                  "--forbid", "aa", "--forbid", "bb", "--count", "20"])
+        assert exc_info.value.code == 0
+        assert set(capsys.readouterr().out.split()) <= {"ab" * 8, "ba" * 8}
+
+    def test_policy_too_complex_to_count_exits_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--no-clipboard", "--length", "128", "--max-repeat", "2",
+                  "--min-lowercase", "5", "--min-uppercase", "5",
+                  "--min-numbers", "5", "--min-symbols", "5"])
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err.startswith("Error: policy is too complex")
+
+    def test_excluding_a_whole_set_exits_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--exclude", "0123456789"])
+        assert exc_info.value.code == 1
+        assert "Error:" in capsys.readouterr().err
+
+    def test_policy_configs_skip_the_daemon(self, capsys, monkeypatch, daemon):
+        import passgen.cli as cli
+        monkeypatch.setattr(cli, "copy_to_clipboard", lambda s: True)
+        with pytest.raises(SystemExit) as exc_info:
+            cli.main(["--socket", daemon, "--exclude", "abc", "--no-clipboard"])
+        assert exc_info.value.code == 0
+        password = capsys.readouterr().out.strip()
+        assert len(password) == 16
+        assert not set(password) & set("abc")
+
+
+# ---------------------------------------------------------------------------
+# --show-entropy and passgen score
+# ---------------------------------------------------------------------------
+
+class TestShowEntropy:
+    def test_entropy_goes_to_stderr_only(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--show-entropy", "--no-clipboard", "--no-daemon"])
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        assert len(captured.out.strip()) == 16
+        assert captured.err.startswith("Entropy: 103.0 bits")
+
+    def test_entropy_reported_once_in_count_mode(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit):
+            main(["--show-entropy", "--count", "3", "--length", "8"])
+        captured = capsys.readouterr()
+        assert len(captured.out.splitlines()) == 3
+        assert captured.err.count("Entropy:") == 1
+
+    def test_entropy_error_exits_1(self, capsys, monkeypatch):
+        import passgen.strength
+        from passgen.cli import main
+
+        def fail(config):
+            raise ValueError("no password satisfies this policy")
+
+        monkeypatch.setattr(passgen.strength, "config_entropy", fail)
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--show-entropy", "--no-clipboard", "--no-daemon"])
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err == "Error: no password satisfies this policy.\n"
+
+
+class TestScoreCommand:
+    def test_scores_each_line_without_echoing(self, capsys, monkeypatch):
+        import io
+
+        from passgen.cli import main
+        monkeypatch.setattr("sys.stdin", io.StringIO("password\nXk9#mP2$vL\n\n"))
+        with pytest.raises(SystemExit) as exc_info:
+            main(["score"])
+        assert exc_info.value.code == 0
+        out = capsys.readouterr().out
+        assert "password" not in out
+        scores = [float(x) for x in out.split()]
+        assert len(scores) == 3
+        assert scores[0] < 10 < scores[1]
+        assert scores[2] == 0.0
+
+
+# ---------------------------------------------------------------------------
+# export subcommand
+# ---------------------------------------------------------------------------
+
+class TestExportCommand:
+    def test_stdin_to_stdout_csv(self, capsysbinary, monkeypatch):
+        import io
+
+        from passgen.cli import main
+        monkeypatch.setattr("sys.stdin", io.StringIO("alice\nbob\n"))
+        with pytest.raises(SystemExit) as exc_info:
+            main(["export", "--length", "10", "--no-symbols"])
+        assert exc_info.value.code == 0
+        captured = capsysbinary.readouterr()
+        lines = captured.out.decode().splitlines()
+        assert lines[0] == "id,password"
+        assert [line.split(",")[0] for line in lines[1:]] == ["alice", "bob"]
+        assert all(len(line.split(",")[1]) == 10 for line in lines[1:])
+        assert captured.err == b""
+
+    def test_file_to_private_file_binary(self, capsys, tmp_path):
+        import os
+        import stat
+
+        from passgen.cli import main
+        from passgen.export import iter_binary_records
+        source = tmp_path / "ids.txt"
+        source.write_text("".join(f"{i}\n" for i in range(100)))
+        output = tmp_path / "out.bin"
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "export", "--input", str(source), "--output", str(output),
+                "--format", "binary", "--id-width", "4",
+            ])
+        assert exc_info.value.code == 0
+        assert "Exported 100 passwords" in capsys.readouterr().err
+        assert stat.S_IMODE(os.stat(output).st_mode) == 0o600
+        with open(output, "rb") as fh:
+            assert [i for i, _ in iter_binary_records(fh)] == [
+                str(i) for i in range(100)
+            ]
+
+    def test_long_id_exits_1(self, capsys, tmp_path):
+        from passgen.cli import main
+        source = tmp_path / "ids.txt"
+        source.write_text("much-too-long\n")
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "export", "--input", str(source), "--output", str(tmp_path / "o"),
+                "--format", "binary", "--id-width", "4",
+            ])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
+
+    def test_missing_input_exits_1(self, capsys, tmp_path):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["export", "--input", str(tmp_path / "missing")])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
+
+    def test_invalid_password_options_exit_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["export", "--length", "4"])
+        assert exc_info.value.code == 1
+        assert "--length" in capsys.readouterr().err
+
+
+# ---------------------------------------------------------------------------
+# Encrypted export: keygen, export --encrypt, decrypt
+# ---------------------------------------------------------------------------
+
+class TestEncryptedExportCommands:
+    @pytest.fixture
+    def key_path(self, tmp_path):
+        pytest.importorskip("cryptography")
+        from passgen.cli import main
+        path = str(tmp_path / "export.key")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["keygen", path])
+        assert exc_info.value.code == 0
+        return path
+
+    def test_export_then_decrypt(self, capsys, tmp_path, key_path):
+        from passgen.cli import main
+        source = tmp_path / "ids.txt"
+        source.write_text("alice\nbob\n")
+        sealed = tmp_path / "out.sealed"
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "export", "--input", str(source), "--output", str(sealed),
+                "--encrypt", key_path, "--format", "jsonl",
+            ])
+        assert exc_info.value.code == 0
+        assert b"alice" not in sealed.read_bytes()
+        plain = tmp_path / "out.jsonl"
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "decrypt", "--key-file", key_path, "--input", str(sealed),
+                "--output", str(plain),
+            ])
+        assert exc_info.value.code == 0
+        lines = plain.read_text().splitlines()
+        assert [line.split('"')[3] for line in lines] == ["alice", "bob"]
+
+    def test_decrypt_truncated_exits_1(self, capsys, tmp_path, key_path):
+        from passgen.cli import main
+        source = tmp_path / "ids.txt"
+        source.write_text("alice\n")
+        sealed = tmp_path / "out.sealed"
+        with pytest.raises(SystemExit):
+            main([
+                "export", "--input", str(source), "--output", str(sealed),
+                "--encrypt", key_path,
+            ])
+        sealed.write_bytes(sealed.read_bytes()[:-1])
+        capsys.readouterr()
+        with pytest.raises(SystemExit) as exc_info:
+            main(["decrypt", "--key-file", key_path, "--input", str(sealed)])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
+
+    def test_keygen_refuses_to_overwrite(self, capsys, key_path):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["keygen", key_path])
+        assert exc_info.value.code == 1
+
+    def test_bad_key_file_exits_1(self, capsys, tmp_path):
+        pytest.importorskip("cryptography")
+        from passgen.cli import main
+        bad = tmp_path / "bad.key"
+        bad.write_text("not a key")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["export", "--encrypt", str(bad)])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
+
+
+# ---------------------------------------------------------------------------
+# --unique / --dedupe-index
+# ---------------------------------------------------------------------------
+
+TINY_ARGS = [
+    "--length", "8", "--no-symbols", "--no-numbers",
+    "--exclude", "bcdefghijklmnopqrstuvwxyzACDEFGHIJKLMNOPQRSTUVWXYZ",
+]
+
+
+class TestDedupeOptions:
+    def test_unique_count(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "254", "--unique", *TINY_ARGS])
+        assert exc_info.value.code == 0
+        assert len(set(capsys.readouterr().out.split())) == 254
+
+    def test_exhausted_space_exits_1(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "255", "--unique", *TINY_ARGS])
+        assert exc_info.value.code == 1
+        assert "Error:" in capsys.readouterr().err
+
+    def test_exhausted_index_outputs_everything_it_records(self, capsys, tmp_path):
+        from passgen.cli import main
+        from passgen.dedupe import DedupeIndex
+        path = str(tmp_path / "issued.idx")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "20000", "--dedupe-index", path, *TINY_ARGS])
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        printed = captured.out.split()
+        assert len(set(printed)) == len(printed) == 254
+        assert "Error:" in captured.err
+        with DedupeIndex(path) as index:
+            assert len(index) == 254
+
+    def test_index_persists_across_runs(self, capsys, tmp_path):
+        from passgen.cli import main
+        path = str(tmp_path / "issued.idx")
+        with pytest.raises(SystemExit):
+            main(["--count", "200", "--dedupe-index", path, *TINY_ARGS])
+        first = set(capsys.readouterr().out.split())
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--no-clipboard", "--dedupe-index", path, *TINY_ARGS])
+        assert exc_info.value.code == 0
+        second = capsys.readouterr().out.strip()
+        assert len(first) == 200
+        assert second not in first
+
+    def test_unreadable_index_exits_1(self, capsys, tmp_path):
+        from passgen.cli import main
+        bad = tmp_path / "bad.idx"
+        bad.write_bytes(b"not an index at all, really not")
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--count", "3", "--dedupe-index", str(bad)])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
+
+
+# ---------------------------------------------------------------------------
+# fixtures subcommand
+# ---------------------------------------------------------------------------
+
+class TestFixturesCommand:
+    @pytest.fixture
+    def seed_file(self, tmp_path):
+        path = tmp_path / "seed"
+        path.write_bytes(b"0123456789abcdef0123456789abcdef")
+        return str(path)
+
+    def test_requires_insecure_flag(self, capsys, seed_file):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["fixtures", "--seed-file", seed_file, "--stop", "5"])
+        assert exc_info.value.code == 1
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "--insecure" in captured.err
+
+    def test_ranges_agree_across_runs(self, capsys, seed_file):
+        from passgen.cli import main
+        base = ["fixtures", "--seed-file", seed_file, "--insecure"]
+        with pytest.raises(SystemExit) as exc_info:
+            main([*base, "--stop", "2100", "--length", "12"])
+        assert exc_info.value.code == 0
+        full = capsys.readouterr().out.splitlines()
+        with pytest.raises(SystemExit):
+            main([*base, "--start", "1000", "--stop", "2050", "--length", "12"])
+        assert capsys.readouterr().out.splitlines() == full[1000:2050]
+        assert len(full) == 2100
+        assert all(len(p) == 12 for p in full)
+
+    def test_default_command_has_no_deterministic_mode(self, capsys):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--seed-file", "x", "--count", "1"])
+        assert exc_info.value.code == 2
+
+    def test_missing_seed_file_exits_1(self, capsys, tmp_path):
+        from passgen.cli import main
+        with pytest.raises(SystemExit) as exc_info:
+            main([
+                "fixtures", "--seed-file", str(tmp_path / "none"), "--insecure",
+                "--stop", "1",
+            ])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error:")
@@ -0,0 +1,162 @@
+import pytest
+
+
+# "a" and "B" only: 2**8 - 2 valid passwords.
+TINY = {
+    "length": 8, "include_symbols": False, "include_numbers": False,
+    "exclude": "bcdefghijklmnopqrstuvwxyzACDEFGHIJKLMNOPQRSTUVWXYZ",
+}
+
+
+# ---------------------------------------------------------------------------
+# DedupeIndex
+# ---------------------------------------------------------------------------
+
+class TestDedupeIndex:
+    def test_add_and_contains(self):
+        from passgen.dedupe import DedupeIndex
+        with DedupeIndex() as index:
+            assert index.add("hunter22")
+            assert not index.add("hunter22")
+            assert "hunter22" in index
+            assert "hunter23" not in index
+            assert len(index) == 1
+
+    def test_add_new_keeps_first_occurrence_in_order(self):
+        from passgen.dedupe import DedupeIndex
+        with DedupeIndex() as index:
+            assert index.add_new(["b", "a", "b", "c", "a"]) == ["b", "a", "c"]
+            assert index.add_new(["c", "d"]) == ["d"]
+            assert len(index) == 4
+
+    def test_grows_and_keeps_entries(self):
+        from passgen.dedupe import MIN_CAPACITY, DedupeIndex
+        words = [f"pw{i}" for i in range(5 * MIN_CAPACITY)]
+        with DedupeIndex() as index:
+            for start in range(0, len(words), 100):
+                index.add_new(words[start:start + 100])
+            assert len(index) == len(words)
+            assert all(w in index for w in words)
+            assert index.add_new(words) == []
+
+    def test_persisted_index_round_trip(self, tmp_path):
+        import os
+        import stat
+
+        from passgen.dedupe import DedupeIndex
+        path = str(tmp_path / "issued.idx")
+        words = [f"pw{i}" for i in range(3000)]
+        with DedupeIndex(path) as index:
+            index.add_new(words)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        with DedupeIndex(path) as index:
+            assert len(index) == 3000
+            assert index.add_new(words[:10] + ["new"]) == ["new"]
+        with DedupeIndex(path) as index:
+            assert len(index) == 3001
+
+    def test_persisted_index_is_locked(self, tmp_path):
+        from passgen.dedupe import DedupeIndex
+        path = str(tmp_path / "issued.idx")
+        with DedupeIndex(path), pytest.raises(ValueError, match="in use"):
+            DedupeIndex(path)
+
+    def test_rejects_foreign_and_truncated_files(self, tmp_path):
+        from passgen.dedupe import DedupeIndex
+        foreign = tmp_path / "foreign"
+        foreign.write_bytes(b"x" * 100)
+        with pytest.raises(ValueError):
+            DedupeIndex(str(foreign))
+        path = tmp_path / "issued.idx"
+        with DedupeIndex(str(path)) as index:
+            index.add("pw")
+        path.write_bytes(path.read_bytes()[:-8])
+        with pytest.raises(ValueError, match="truncated"):
+            DedupeIndex(str(path))
+
+    @pytest.mark.parametrize("words", [100, 3000])
+    def test_survives_kill_without_close(self, tmp_path, words):
+        import os
+        import subprocess
+        import sys
+
+        from passgen.dedupe import DedupeIndex
+        path = str(tmp_path / "issued.idx")
+        # 3000 words grow the table twice; the process never flushes or closes.
+        script = (
+            "import os, sys\n"
+            "from passgen.dedupe import DedupeIndex\n"
+            "index = DedupeIndex(sys.argv[1])\n"
+            f"for start in range(0, {words}, 500):\n"
+            f"    index.add_new(f'pw{{i}}' for i in range(start, min(start + 500, {words})))\n"
+            "os._exit(0)\n"
+        )
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        subprocess.run([sys.executable, "-c", script, path], check=True, env=env)
+        assert not os.path.exists(path + ".tmp")
+        with DedupeIndex(path) as index:
+            assert len(index) == words
+            assert all(f"pw{i}" in index for i in range(words))
+            assert index.add_new(["pw0", "new"]) == ["new"]
+
+
+# ---------------------------------------------------------------------------
+# Unique generation
+# ---------------------------------------------------------------------------
+
+class TestUniqueGeneration:
+    def test_exhausts_small_space_exactly(self):
+        from passgen.dedupe import DedupeIndex, generate_unique_passwords
+        from passgen.generator import PasswordConfig
+        with DedupeIndex() as index:
+            passwords = generate_unique_passwords(PasswordConfig(**TINY), 254, index)
+        assert len(set(passwords)) == 254
+        assert set("".join(passwords)) == {"a", "B"}
+
+    def test_exhausted_space_raises(self):
+        from passgen.dedupe import DedupeIndex, generate_unique_passwords
+        from passgen.generator import PasswordConfig
+        with DedupeIndex() as index, pytest.raises(ValueError):
+            generate_unique_passwords(PasswordConfig(**TINY), 255, index)
+
+    def test_exhaustion_records_nothing(self):
+        from passgen.dedupe import DedupeIndex, generate_unique_passwords
+        from passgen.generator import PasswordConfig
+        config = PasswordConfig(**TINY)
+        with DedupeIndex() as index:
+            with pytest.raises(ValueError):
+                generate_unique_passwords(config, 300, index)
+            assert len(index) == 0
+            assert len(generate_unique_passwords(config, 254, index)) == 254
+
+    def test_unique_across_calls(self):
+        from passgen.dedupe import DedupeIndex, generate_unique_passwords
+        from passgen.generator import PasswordConfig
+        config = PasswordConfig(**TINY)
+        with DedupeIndex() as index:
+            first = generate_unique_passwords(config, 200, index)
+            second = generate_unique_passwords(config, 54, index)
+        assert not set(first) & set(second)
+
+    def test_unique_batches_stops_at_count(self):
+        from passgen.dedupe import DedupeIndex, unique_batches
+        batches = iter([["a", "b", "a"], ["b", "c", "d", "e"], ["f"]])
+        with DedupeIndex() as index:
+            # Only as many passwords as are still needed are checked per batch.
+            assert list(unique_batches(batches, index, 4)) == [["a", "b"], ["c"], ["f"]]
+            assert "d" not in index
+
+    def test_export_with_index(self):
+        import io
+
+        from passgen.dedupe import DedupeIndex
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        with DedupeIndex() as index:
+            export_passwords(
+                [f"{i}\n" for i in range(254)], PasswordConfig(**TINY), out, "csv",
+                batch_size=100, index=index,
+            )
+        passwords = [row.split(b",")[1] for row in out.getvalue().splitlines()[1:]]
+        assert len(set(passwords)) == 254
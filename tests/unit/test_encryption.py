@@ -0,0 +1,163 @@
+import io
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+
+def _seal(key, *chunks):
+    from passgen.encryption import EncryptedWriter
+    out = io.BytesIO()
+    with EncryptedWriter(out, key) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return out.getvalue()
+
+
+def _open(key, data):
+    from passgen.encryption import decrypt_stream
+    return b"".join(decrypt_stream(io.BytesIO(data), key))
+
+
+# ---------------------------------------------------------------------------
+# Key files
+# ---------------------------------------------------------------------------
+
+class TestKeys:
+    def test_write_and_load(self, tmp_path):
+        import os
+        import stat
+
+        from passgen.encryption import KEY_SIZE, load_key, write_key
+        path = str(tmp_path / "k")
+        write_key(path)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert len(load_key(path)) == KEY_SIZE
+
+    def test_never_overwrites(self, tmp_path):
+        from passgen.encryption import write_key
+        path = tmp_path / "k"
+        path.write_text("keep me")
+        with pytest.raises(FileExistsError):
+            write_key(str(path))
+        assert path.read_text() == "keep me"
+
+    @pytest.mark.parametrize("text", ["", "zz" * 32, "ab" * 16])
+    def test_rejects_malformed_key(self, tmp_path, text):
+        from passgen.encryption import load_key
+        path = tmp_path / "k"
+        path.write_text(text)
+        with pytest.raises(ValueError):
+            load_key(str(path))
+
+
+# ---------------------------------------------------------------------------
+# Stream format
+# ---------------------------------------------------------------------------
+
+class TestStream:
+    def test_round_trip(self):
+        key = bytes(range(32))
+        assert _open(key, _seal(key, b"hello ", bytearray(b"world"))) == b"hello world"
+
+    def test_empty_stream(self):
+        key = bytes(32)
+        assert _open(key, _seal(key)) == b""
+
+    def test_large_writes_are_split_into_frames(self, monkeypatch):
+        import passgen.encryption
+        monkeypatch.setattr(passgen.encryption, "FRAME_SIZE", 1000)
+        key = bytes(32)
+        data = bytes(range(256)) * 40
+        sealed = _seal(key, data)
+        assert _open(key, sealed) == data
+        # 11 data frames + the final frame, each with a header and a tag.
+        assert len(sealed) == 15 + len(data) + 12 * (4 + 16)
+
+    def test_fresh_nonce_per_stream(self):
+        key = bytes(32)
+        assert _seal(key, b"same") != _seal(key, b"same")
+
+    def test_wrong_key_fails(self):
+        with pytest.raises(ValueError, match="decryption failed"):
+            _open(b"\x01" * 32, _seal(bytes(32), b"secret"))
+
+    def test_tampering_fails(self):
+        key = bytes(32)
+        sealed = bytearray(_seal(key, b"secret data"))
+        sealed[20] ^= 1
+        with pytest.raises(ValueError):
+            _open(key, bytes(sealed))
+
+    def test_truncation_detected(self):
+        key = bytes(32)
+        sealed = _seal(key, b"a" * 100, b"b" * 100)
+        # Dropping the final frame leaves every remaining frame valid.
+        with pytest.raises(ValueError, match="truncated"):
+            _open(key, sealed[:-20])
+        with pytest.raises(ValueError):
+            _open(key, sealed[:-1])
+
+    def test_trailing_data_detected(self):
+        key = bytes(32)
+        with pytest.raises(ValueError, match="after the end"):
+            _open(key, _seal(key, b"x") + b"junk")
+
+    def test_frames_cannot_be_reordered(self, monkeypatch):
+        import passgen.encryption
+        monkeypatch.setattr(passgen.encryption, "FRAME_SIZE", 4)
+        key = bytes(32)
+        sealed = _seal(key, b"aaaabbbb")
+        frame = 4 + 4 + 16
+        first, second = sealed[15:15 + frame], sealed[15 + frame:15 + 2 * frame]
+        swapped = sealed[:15] + second + first + sealed[15 + 2 * frame:]
+        with pytest.raises(ValueError):
+            _open(key, swapped)
+
+    def test_not_an_encrypted_stream(self):
+        with pytest.raises(ValueError, match="not a passgen"):
+            _open(bytes(32), b"id,password\r\n")
+
+    def test_aborted_stream_has_no_final_frame(self):
+        from passgen.encryption import EncryptedWriter
+        key = bytes(32)
+        out = io.BytesIO()
+        with pytest.raises(RuntimeError), EncryptedWriter(out, key) as writer:
+            writer.write(b"partial")
+            raise RuntimeError
+        with pytest.raises(ValueError, match="truncated"):
+            _open(key, out.getvalue())
+
+    def test_write_errors_surface_in_the_producer(self):
+        from passgen.encryption import EncryptedWriter
+
+        class Full(io.BytesIO):
+            def write(self, data):
+                if self.tell() > 15:
+                    raise OSError("disk full")
+                return super().write(data)
+
+        writer = EncryptedWriter(Full(), bytes(32))
+        with pytest.raises(OSError, match="disk full"):
+            for _ in range(10):
+                writer.write(b"x" * 10)
+            writer.close()
+
+
+# ---------------------------------------------------------------------------
+# Encrypted export
+# ---------------------------------------------------------------------------
+
+class TestEncryptedExport:
+    def test_export_round_trip(self):
+        from passgen.encryption import EncryptedWriter
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        key = bytes(32)
+        out = io.BytesIO()
+        ids = [f"{i}\n" for i in range(5000)]
+        with EncryptedWriter(out, key) as writer:
+            export_passwords(ids, PasswordConfig(length=12), writer, "jsonl")
+        lines = _open(key, out.getvalue()).splitlines()
+        assert len(lines) == 5000
+        assert b'"password"' not in out.getvalue()
@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+
+import pytest
+
+
+def _ids(n):
+    return [f"user-{i}\n" for i in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# Formats
+# ---------------------------------------------------------------------------
+
+class TestExportFormats:
+    def test_csv(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        assert export_passwords(_ids(50), PasswordConfig(), out, "csv") == 50
+        rows = list(csv.reader(io.StringIO(out.getvalue().decode("utf-8"))))
+        assert rows[0] == ["id", "password"]
+        assert [r[0] for r in rows[1:]] == [f"user-{i}" for i in range(50)]
+        assert all(len(r[1]) == 16 for r in rows[1:])
+
+    def test_csv_quotes_special_characters(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        # The symbol set includes ',' so passwords need quoting too.
+        export_passwords(['a,"b"\n'] * 200, PasswordConfig(length=32), out, "csv")
+        rows = list(csv.reader(io.StringIO(out.getvalue().decode("utf-8"))))
+        assert all(r[0] == 'a,"b"' and len(r[1]) == 32 for r in rows[1:])
+        assert len(rows) == 201
+
+    def test_jsonl(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        ids = ['plain\n', 'quo"te\n', "ünï\n"]
+        assert export_passwords(ids, PasswordConfig(length=20), out, "jsonl") == 3
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["id"] for r in records] == ["plain", 'quo"te', "ünï"]
+        assert all(len(r["password"]) == 20 for r in records)
+
+    def test_binary_round_trip(self):
+        from passgen.export import HEADER, export_passwords, iter_binary_records
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        n = export_passwords(_ids(1000), PasswordConfig(), out, "binary", id_width=12)
+        assert n == 1000
+        assert len(out.getvalue()) == HEADER.size + 1000 * (12 + 16)
+        out.seek(0)
+        records = list(iter_binary_records(out))
+        assert [i for i, _ in records] == [f"user-{i}" for i in range(1000)]
+        assert all(len(p) == 16 for _, p in records)
+        assert len({p for _, p in records}) == 1000
+
+    def test_binary_round_trip_unicode_alphabet(self):
+        from passgen.export import HEADER, export_passwords, iter_binary_records
+        from passgen.generator import PasswordConfig
+        config = PasswordConfig(length=10, alphabets=("абвгд", "€£¥", "0123456789"))
+        out = io.BytesIO()
+        export_passwords(_ids(50), config, out, "binary", id_width=12)
+        # Widest character (€) is 3 UTF-8 bytes.
+        assert len(out.getvalue()) == HEADER.size + 50 * (12 + 30)
+        out.seek(0)
+        records = list(iter_binary_records(out))
+        assert all(len(p) == 10 and any(c in "€£¥" for c in p) for _, p in records)
+
+    def test_binary_rejects_long_ids(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        with pytest.raises(ValueError):
+            export_passwords(["x" * 9], PasswordConfig(), io.BytesIO(), "binary", 8)
+
+    def test_truncated_binary_raises(self):
+        from passgen.export import export_passwords, iter_binary_records
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        export_passwords(_ids(3), PasswordConfig(), out, "binary")
+        with pytest.raises(ValueError):
+            list(iter_binary_records(io.BytesIO(out.getvalue()[:-1])))
+        with pytest.raises(ValueError):
+            list(iter_binary_records(io.BytesIO(b"nonsense" * 4)))
+
+
+# ---------------------------------------------------------------------------
+# Streaming and chunking
+# ---------------------------------------------------------------------------
+
+class TestExportStreaming:
+    def test_blank_lines_skipped(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        assert export_passwords(["a\n", "\n", "b\r\n", ""], PasswordConfig(), out) == 2
+
+    def test_empty_input_writes_only_header(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        assert export_passwords([], PasswordConfig(), out) == 0
+        assert out.getvalue() == b"id,password\r\n"
+
+    def test_ids_are_consumed_lazily(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        consumed = []
+
+        def ids():
+            for i in range(10):
+                consumed.append(i)
+                yield f"{i}\n"
+            raise AssertionError("read past the end")
+
+        with pytest.raises(AssertionError):
+            export_passwords(ids(), PasswordConfig(), io.BytesIO(), batch_size=4)
+        assert consumed == list(range(10))
+
+    def test_writes_in_large_chunks(self, monkeypatch):
+        import passgen.export
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        monkeypatch.setattr(passgen.export, "CHUNK_SIZE", 4096)
+        sizes = []
+
+        class Out(io.BytesIO):
+            def write(self, data):
+                sizes.append(len(data))
+                return super().write(data)
+
+        out = Out()
+        n = export_passwords(_ids(5000), PasswordConfig(), out, "binary", batch_size=64)
+        assert n == 5000
+        assert len(sizes) < 5000 * 48 // 4096 + 2
+        assert sum(sizes) == len(out.getvalue())
+
+    def test_policy_config_honoured(self):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        out = io.BytesIO()
+        config = PasswordConfig(length=12, include_symbols=False, max_repeat=1)
+        export_passwords(_ids(100), config, out, "jsonl")
+        for line in out.getvalue().splitlines():
+            password = json.loads(line)["password"]
+            assert password.isalnum()
+            assert all(a != b for a, b in zip(password, password[1:]))
+
+    @pytest.mark.parametrize("kwargs", [
+        {"fmt": "xml"}, {"id_width": 0}, {"batch_size": 0},
+    ])
+    def test_invalid_arguments(self, kwargs):
+        from passgen.export import export_passwords
+        from passgen.generator import PasswordConfig
+        with pytest.raises(ValueError):
+            export_passwords(["a"], PasswordConfig(), io.BytesIO(), **kwargs)
@@ -0,0 +1,110 @@
+import pytest
+
+
+SEED = b"load-test seed, not a secret"
+
+
+# ---------------------------------------------------------------------------
+# Deterministic sequence
+# ---------------------------------------------------------------------------
+
+class TestFixturePasswords:
+    def test_reproducible(self):
+        from passgen.fixtures import fixture_passwords
+        from passgen.generator import PasswordConfig
+        config = PasswordConfig()
+        assert fixture_passwords(config, SEED, 0, 50) == fixture_passwords(
+            config, SEED, 0, 50
+        )
+
+    def test_random_access_matches_prefix(self):
+        from passgen.fixtures import BLOCK_SIZE, fixture_password, fixture_passwords
+        from passgen.generator import PasswordConfig
+        config = PasswordConfig(length=10)
+        full = fixture_passwords(config, SEED, 0, 3 * BLOCK_SIZE)
+        a, b = BLOCK_SIZE - 7, 2 * BLOCK_SIZE + 5
+        assert fixture_passwords(config, SEED, a, b) == full[a:b]
+        assert fixture_password(config, SEED, b) == full[b]
+        assert len(set(full)) == len(full)
+
+    def test_seed_and_config_select_the_sequence(self):
+        from passgen.fixtures import fixture_passwords
+        from passgen.generator import PasswordConfig
+        base = fixture_passwords(PasswordConfig(), SEED, 0, 20)
+        assert fixture_passwords(PasswordConfig(), SEED + b"!", 0, 20) != base
+        other = fixture_passwords(PasswordConfig(strategy="reject"), SEED, 0, 20)
+        assert other != base
+
+    def test_equivalent_configs_share_the_sequence(self):
+        from passgen.fixtures import fixture_passwords
+        from passgen.generator import PasswordConfig
+        pairs = [
+            (PasswordConfig(forbidden=("ab",)), PasswordConfig(forbidden=["ab"])),
+            (PasswordConfig(exclude="ab"), PasswordConfig(exclude="ba")),
+            (PasswordConfig(forbidden=("ab", "cd", "ab")),
+             PasswordConfig(forbidden=("cd", "ab"))),
+            (PasswordConfig(exclude="0O", exclude_ambiguous=True),
+             PasswordConfig(exclude_ambiguous=True)),
+            (PasswordConfig(alphabets=("ab", "XY"), min_numbers=5),
+             PasswordConfig(alphabets=("ab", "XY"))),
+        ]
+        for a, b in pairs:
+            assert fixture_passwords(a, SEED, 0, 5) == fixture_passwords(b, SEED, 0, 5)
+
+    def test_sequence_is_pinned(self):
+        # Changes only together with passgen.fixtures._DOMAIN.
+        from passgen.fixtures import fixture_passwords
+        from passgen.generator import PasswordConfig
+        assert fixture_passwords(PasswordConfig(), SEED, 0, 2) == [
+            "4+=R|M74MGn,L>8t", "|qo1yAd,3CG5!<w5",
+        ]
+        wide = PasswordConfig(alphabets=("".join(chr(0x4E00 + i) for i in range(300)),))
+        assert fixture_passwords(wide, SEED, 0, 1) == ["付亐今七件乓亓云京乳伡乳五上仚仠"]
+
+    def test_honours_policy(self):
+        from passgen.fixtures import fixture_passwords
+        from passgen.generator import CharacterSet, PasswordConfig
+        config = PasswordConfig(length=8, min_numbers=3, max_repeat=1)
+        for password in fixture_passwords(config, SEED, 0, 300):
+            assert sum(c in CharacterSet.NUMBERS for c in password) >= 3
+            assert all(a != b for a, b in zip(password, password[1:]))
+
+    def test_never_touches_the_os_csprng(self, monkeypatch):
+        import passgen.generator
+        from passgen.fixtures import fixture_passwords
+        from passgen.generator import PasswordConfig
+
+        def fail(n):
+            raise AssertionError("CSPRNG used in deterministic mode")
+
+        monkeypatch.setattr(passgen.generator, "_token_bytes", fail)
+        assert len(fixture_passwords(PasswordConfig(), SEED, 0, 10)) == 10
+
+    def test_empty_and_invalid_ranges(self):
+        from passgen.fixtures import fixture_passwords
+        from passgen.generator import PasswordConfig
+        assert fixture_passwords(PasswordConfig(), SEED, 5, 5) == []
+        with pytest.raises(ValueError):
+            fixture_passwords(PasswordConfig(), SEED, 5, 4)
+        with pytest.raises(ValueError):
+            fixture_passwords(PasswordConfig(), SEED, -1, 4)
+
+    def test_short_seed_file_rejected(self, tmp_path):
+        from passgen.fixtures import load_seed
+        path = tmp_path / "seed"
+        path.write_bytes(b"short")
+        with pytest.raises(ValueError):
+            load_seed(str(path))
+
+
+class TestSeededEntropy:
+    def test_streams_are_deterministic_and_distinct(self):
+        from passgen.fixtures import SeededEntropy
+        key = bytes(32)
+        assert SeededEntropy(key, 0).read(100) == SeededEntropy(key, 0).read(100)
+        assert SeededEntropy(key, 0).read(100) != SeededEntropy(key, 1).read(100)
+
+    def test_large_reads_advance_the_stream(self):
+        from passgen.fixtures import SeededEntropy
+        entropy = SeededEntropy(bytes(32), 0, block_size=16)
+        assert entropy.read(64) != entropy.read(64)
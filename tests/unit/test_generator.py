@@ -1,4 +1,5 @@
 """Unit tests for passgen.generator — TDD: tests written before implementation."""
+import pytest
 
 
 # ---------------------------------------------------------------------------
@@ -194,3 +195,792 @@ class TestCsprngStaticVerification:
         src = pathlib.Path(__file__).parent.parent.parent / "passgen" / "generator.py"
         text = src.read_text()
         assert "import random" not in text
+
+
+# ---------------------------------------------------------------------------
+# Bulk generation — generate_passwords / EntropyBuffer
+# ---------------------------------------------------------------------------
+
+class TestEntropyBuffer:
+    def test_read_returns_requested_length(self):
+        from passgen.generator import EntropyBuffer
+        buf = EntropyBuffer(block_size=64)
+        for n in (0, 1, 63, 64, 65, 1000):
+            assert len(buf.read(n)) == n
+
+    def test_reads_do_not_repeat_bytes(self):
+        from passgen.generator import EntropyBuffer
+        buf = EntropyBuffer(block_size=64)
+        chunks = [buf.read(16) for _ in range(32)]
+        assert len(set(chunks)) == len(chunks)
+
+    def test_randbelow_in_range(self):
+        from passgen.generator import EntropyBuffer
+        buf = EntropyBuffer()
+        for n in (1, 2, 7, 89, 256, 257, 10 ** 12):
+            for _ in range(50):
+                assert 0 <= buf.randbelow(n) < n
+
+    def test_randbelow_covers_all_values(self):
+        from passgen.generator import EntropyBuffer
+        buf = EntropyBuffer()
+        assert {buf.randbelow(6) for _ in range(1000)} == set(range(6))
+
+    def test_randbelow_rejects_non_positive(self):
+        from passgen.generator import EntropyBuffer
+        with pytest.raises(ValueError):
+            EntropyBuffer().randbelow(0)
+
+
+class TestGeneratePasswords:
+    def test_returns_requested_count(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        assert len(generate_passwords(PasswordConfig(), 250)) == 250
+
+    def test_zero_count_returns_empty_list(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        assert generate_passwords(PasswordConfig(), 0) == []
+
+    def test_negative_count_raises(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        with pytest.raises(ValueError):
+            generate_passwords(PasswordConfig(), -1)
+
+    def test_each_password_has_configured_length(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        for length in (8, 16, 64, 128):
+            for result in generate_passwords(PasswordConfig(length=length), 20):
+                assert len(result) == length
+
+    def test_at_least_one_from_each_enabled_set(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        for result in generate_passwords(PasswordConfig(length=8), 500):
+            assert any(ch in CharacterSet.LOWERCASE for ch in result)
+            assert any(ch in CharacterSet.UPPERCASE for ch in result)
+            assert any(ch in CharacterSet.NUMBERS for ch in result)
+            assert any(ch in CharacterSet.SYMBOLS for ch in result)
+
+    def test_letters_only_config(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=32, include_symbols=False, include_numbers=False)
+        letters = CharacterSet.LOWERCASE + CharacterSet.UPPERCASE
+        for result in generate_passwords(config, 100):
+            assert all(ch in letters for ch in result)
+
+    def test_no_symbols_config(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=32, include_symbols=False)
+        for result in generate_passwords(config, 100):
+            assert not any(ch in CharacterSet.SYMBOLS for ch in result)
+            assert any(ch in CharacterSet.NUMBERS for ch in result)
+
+    def test_passwords_are_distinct(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        batch = generate_passwords(PasswordConfig(), 1000)
+        assert len(set(batch)) == len(batch)
+
+    def test_every_pool_character_appears(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        full_alphabet = (
+            CharacterSet.LOWERCASE + CharacterSet.UPPERCASE
+            + CharacterSet.NUMBERS + CharacterSet.SYMBOLS
+        )
+        seen = set("".join(generate_passwords(PasswordConfig(length=64), 200)))
+        assert seen == set(full_alphabet)
+
+
+class TestIterPasswords:
+    def test_yields_exact_count_across_batches(self):
+        from passgen.generator import PasswordConfig, iter_passwords
+        result = list(iter_passwords(PasswordConfig(), 10, batch_size=3))
+        assert len(result) == 10
+        assert all(len(pw) == 16 for pw in result)
+
+    def test_unbounded_when_count_is_none(self):
+        import itertools
+
+        from passgen.generator import PasswordConfig, iter_passwords
+        stream = iter_passwords(PasswordConfig(), batch_size=4)
+        assert len(list(itertools.islice(stream, 50))) == 50
+
+    def test_negative_count_raises(self):
+        from passgen.generator import PasswordConfig, iter_passwords
+        with pytest.raises(ValueError):
+            list(iter_passwords(PasswordConfig(), -1))
+
+
+# ---------------------------------------------------------------------------
+# CompiledPolicy — cached per-config character tables
+# ---------------------------------------------------------------------------
+
+class TestCompiledPolicy:
+    def test_cached_per_flag_combination(self):
+        from passgen.generator import CompiledPolicy, PasswordConfig
+        a = CompiledPolicy.from_config(PasswordConfig(length=8))
+        b = CompiledPolicy.from_config(PasswordConfig(length=64))
+        assert a is b
+
+    def test_distinct_configs_distinct_policies(self):
+        from passgen.generator import CompiledPolicy, PasswordConfig
+        policies = {
+            id(CompiledPolicy.from_config(PasswordConfig(include_symbols=s, include_numbers=n)))
+            for s in (True, False)
+            for n in (True, False)
+        }
+        assert len(policies) == 4
+
+    def test_default_pool_and_tables(self):
+        from passgen.generator import CharacterSet, CompiledPolicy, PasswordConfig
+        policy = CompiledPolicy.from_config(PasswordConfig())
+        assert policy.classes == (
+            CharacterSet.LOWERCASE, CharacterSet.UPPERCASE,
+            CharacterSet.NUMBERS, CharacterSet.SYMBOLS,
+        )
+        assert policy.pool == "".join(policy.classes)
+        assert policy.pool_sampler.symbols == policy.pool.encode("ascii")
+        for chars, offset in zip(policy.classes, policy.offsets):
+            assert policy.pool[offset:offset + len(chars)] == chars
+
+    def test_letters_only_pool(self):
+        from passgen.generator import CharacterSet, CompiledPolicy, PasswordConfig
+        config = PasswordConfig(include_symbols=False, include_numbers=False)
+        policy = CompiledPolicy.from_config(config)
+        assert policy.pool == CharacterSet.LOWERCASE + CharacterSet.UPPERCASE
+        assert len(policy.class_samplers) == 2
+
+    def test_rejection_limit_is_largest_multiple_of_pool_size(self):
+        from passgen.generator import CompiledPolicy, PasswordConfig
+        policy = CompiledPolicy.from_config(PasswordConfig())
+        size = len(policy.pool)
+        assert policy.rejection_limit % size == 0
+        assert 256 - size < policy.rejection_limit <= 256
+
+    def test_entropy_bits(self):
+        import math
+
+        from passgen.generator import CompiledPolicy, PasswordConfig
+        policy = CompiledPolicy.from_config(PasswordConfig())
+        assert policy.bits_per_char == pytest.approx(math.log2(len(policy.pool)))
+        assert policy.entropy_bits(16) == pytest.approx(16 * math.log2(len(policy.pool)))
+
+    def test_sampler_rejects_out_of_range_sizes(self):
+        from passgen.generator import _ByteSampler
+        with pytest.raises(ValueError):
+            _ByteSampler(b"")
+        with pytest.raises(ValueError):
+            _ByteSampler(bytes(257 * [0]))
+
+
+# ---------------------------------------------------------------------------
+# Buffered shuffles — secure_shuffle / shuffle_many statistical checks
+# ---------------------------------------------------------------------------
+
+def _chi_square(observed, expected):
+    return sum((o - expected) ** 2 / expected for o in observed)
+
+
+def _chi_square_critical(df, z=4.753):
+    """Wilson-Hilferty upper critical value; z=4.753 is p ~= 1e-6."""
+    k = 2.0 / (9.0 * df)
+    return df * (1.0 - k + z * k ** 0.5) ** 3
+
+
+class _ScriptedEntropy:
+    """EntropyBuffer stand-in that serves fixed bytes before real ones."""
+
+    def __init__(self, prefix):
+        from passgen.generator import EntropyBuffer
+        self._prefix = prefix
+        self._real = EntropyBuffer()
+        self.reads = 0
+
+    def read(self, n):
+        self.reads += 1
+        out, self._prefix = self._prefix[:n], self._prefix[n:]
+        return out + self._real.read(n - len(out))
+
+
+class TestBufferedShuffle:
+    def test_secure_shuffle_preserves_elements(self):
+        from passgen.generator import secure_shuffle
+        items = list(range(50))
+        secure_shuffle(items)
+        assert sorted(items) == list(range(50))
+
+    def test_secure_shuffle_trivial_lists(self):
+        from passgen.generator import secure_shuffle
+        empty, single = [], ["x"]
+        secure_shuffle(empty)
+        secure_shuffle(single)
+        assert empty == []
+        assert single == ["x"]
+
+    def test_shuffle_many_preserves_rows_of_mixed_length(self):
+        from passgen.generator import EntropyBuffer, shuffle_many
+        rows = [list(range(n)) for n in (0, 1, 2, 16, 300)]
+        shuffle_many(rows, EntropyBuffer())
+        assert [sorted(row) for row in rows] == [list(range(n)) for n in (0, 1, 2, 16, 300)]
+
+    def test_lemire_rejection_redraws(self):
+        from passgen.generator import secure_shuffle
+        # For n = 3 the rejection threshold is 2**32 % 3 == 1, so an all-zero
+        # word is rejected and a fresh one must be read.
+        entropy = _ScriptedEntropy(b"\x00" * 4 + b"\xff" * 4)
+        items = ["a", "b", "c"]
+        secure_shuffle(items, entropy)
+        assert sorted(items) == ["a", "b", "c"]
+        assert entropy.reads > 1
+
+    def test_lemire_below_range_and_uniformity(self):
+        from passgen.generator import EntropyBuffer, _lemire_below
+        n, samples = 300, 60000
+        draws = _lemire_below(n, samples, EntropyBuffer())
+        assert min(draws) >= 0 and max(draws) < n
+        counts = [0] * n
+        for d in draws:
+            counts[d] += 1
+        assert _chi_square(counts, samples / n) < _chi_square_critical(n - 1)
+
+    def test_secure_shuffle_positions_uniform(self):
+        from passgen.generator import secure_shuffle
+        size, trials = 8, 16000
+        counts = [[0] * size for _ in range(size)]
+        for _ in range(trials):
+            items = list(range(size))
+            secure_shuffle(items)
+            for pos, item in enumerate(items):
+                counts[item][pos] += 1
+        observed = [c for row in counts for c in row]
+        assert _chi_square(observed, trials / size) < _chi_square_critical((size - 1) ** 2)
+
+    def test_shuffle_many_positions_uniform(self):
+        from passgen.generator import EntropyBuffer, shuffle_many
+        size, trials = 8, 16000
+        rows = [list(range(size)) for _ in range(trials)]
+        shuffle_many(rows, EntropyBuffer())
+        counts = [[0] * size for _ in range(size)]
+        for row in rows:
+            for pos, item in enumerate(row):
+                counts[item][pos] += 1
+        observed = [c for row in counts for c in row]
+        assert _chi_square(observed, trials / size) < _chi_square_critical((size - 1) ** 2)
+
+    def test_shuffle_many_permutations_uniform(self):
+        import itertools
+
+        from passgen.generator import EntropyBuffer, shuffle_many
+        trials = 24000
+        rows = [list("abcd") for _ in range(trials)]
+        shuffle_many(rows, EntropyBuffer())
+        counts = dict.fromkeys(itertools.permutations("abcd"), 0)
+        for row in rows:
+            counts[tuple(row)] += 1
+        assert _chi_square(counts.values(), trials / 24) < _chi_square_critical(23)
+
+    def test_generate_passwords_guaranteed_position_uniform(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        # Among passwords holding exactly one digit, that digit's position
+        # must be uniform over the 8 slots.
+        config = PasswordConfig(length=8)
+        trials = 8000
+        counts = [0] * 8
+        for pw in generate_passwords(config, trials):
+            digits = [i for i, ch in enumerate(pw) if ch in CharacterSet.NUMBERS]
+            if len(digits) == 1:
+                counts[digits[0]] += 1
+        total = sum(counts)
+        assert _chi_square(counts, total / 8) < _chi_square_critical(7)
+
+    def test_words_are_read_little_endian(self):
+        from passgen.generator import _le_words
+        assert list(_le_words(bytes([1, 2, 3, 4]), "H")) == [0x0201, 0x0403]
+        assert list(_le_words(bytes([1, 2, 3, 4]), "I")) == [0x04030201]
+
+
+# ---------------------------------------------------------------------------
+# Strategies — PasswordConfig.strategy ("shuffle" / "reject")
+# ---------------------------------------------------------------------------
+
+class TestRejectStrategy:
+    def test_default_strategy_is_shuffle(self):
+        from passgen.generator import PasswordConfig
+        assert PasswordConfig().strategy == "shuffle"
+
+    def test_single_password_has_every_enabled_set(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_password
+        config = PasswordConfig(length=8, strategy="reject")
+        for _ in range(50):
+            result = generate_password(config)
+            assert len(result) == 8
+            assert any(ch in CharacterSet.NUMBERS for ch in result)
+            assert any(ch in CharacterSet.SYMBOLS for ch in result)
+
+    def test_batch_has_every_enabled_set(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=8, include_symbols=False, strategy="reject")
+        batch = generate_passwords(config, 500)
+        assert len(batch) == 500
+        for result in batch:
+            assert any(ch in CharacterSet.LOWERCASE for ch in result)
+            assert any(ch in CharacterSet.UPPERCASE for ch in result)
+            assert any(ch in CharacterSet.NUMBERS for ch in result)
+            assert not any(ch in CharacterSet.SYMBOLS for ch in result)
+
+    def test_uniform_over_valid_passwords(self):
+        import math
+
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        # Letters only, length 8: every valid password is equally likely, so
+        # the number of lowercase letters k (1..7) has weight C(8, k).
+        config = PasswordConfig(
+            length=8, include_symbols=False, include_numbers=False, strategy="reject"
+        )
+        trials = 20000
+        counts = [0] * 9
+        for result in generate_passwords(config, trials):
+            counts[sum(ch in CharacterSet.LOWERCASE for ch in result)] += 1
+        assert counts[0] == counts[8] == 0
+        total_weight = sum(math.comb(8, k) for k in range(1, 8))
+        chi2 = sum(
+            (counts[k] - trials * math.comb(8, k) / total_weight) ** 2
+            / (trials * math.comb(8, k) / total_weight)
+            for k in range(1, 8)
+        )
+        assert chi2 < _chi_square_critical(6)
+
+    @pytest.mark.parametrize("strategy", ["shuffle", "reject"])
+    def test_length_shorter_than_required_sets_raises(self, strategy):
+        from passgen.generator import (
+            PasswordConfig,
+            generate_password,
+            generate_passwords,
+        )
+        config = PasswordConfig(length=3, strategy=strategy)
+        with pytest.raises(ValueError):
+            generate_password(config)
+        with pytest.raises(ValueError):
+            generate_passwords(config, 1)
+
+    def test_length_below_set_count_ok_when_minimums_allow(self):
+        from passgen.generator import PasswordConfig, generate_into, generate_password
+        config = PasswordConfig(length=3, min_symbols=0, min_numbers=0)
+        assert len(generate_password(config)) == 3
+        out = bytearray(6)
+        generate_into(config, out, count=2)
+        assert 0 not in out
+
+    def test_unknown_strategy_raises(self):
+        from passgen.generator import (
+            PasswordConfig,
+            generate_password,
+            generate_passwords,
+        )
+        config = PasswordConfig(strategy="guess")
+        with pytest.raises(ValueError):
+            generate_password(config)
+        with pytest.raises(ValueError):
+            generate_passwords(config, 1)
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+class TestInstrument:
+    def test_disabled_by_default_and_restored_after_block(self):
+        from passgen import generator
+        assert generator._stats is None
+        with generator.instrument() as outer:
+            with generator.instrument() as inner:
+                assert generator._stats is inner
+            assert generator._stats is outer
+        assert generator._stats is None
+
+    def test_counts_single_password(self):
+        from passgen.generator import PasswordConfig, generate_password, instrument
+        from passgen.metrics import STAGES
+        with instrument() as stats:
+            generate_password(PasswordConfig(length=20))
+        assert stats.passwords == 1
+        # 20 characters plus 19 swap targets.
+        assert stats.draws == 39
+        assert stats.swaps == 19
+        assert stats.bytes_consumed >= 4 * 19
+        assert stats.os_reads >= 1
+        assert set(stats.seconds) == set(STAGES)
+        assert all(seconds > 0 for seconds in stats.seconds.values())
+
+    def test_counts_shuffle_batch(self):
+        from passgen.generator import PasswordConfig, generate_passwords, instrument
+        with instrument() as stats:
+            generate_passwords(PasswordConfig(length=16), 500)
+        assert stats.passwords == 500
+        assert stats.draws == 500 * (16 + 15)
+        assert stats.swaps == 500 * 15
+        assert stats.bytes_consumed >= stats.draws + stats.rejections
+        assert stats.os_bytes >= stats.bytes_consumed
+        assert stats.rejected_passwords == 0
+
+    def test_counts_reject_batch(self):
+        from passgen.generator import PasswordConfig, generate_passwords, instrument
+        with instrument() as stats:
+            generate_passwords(PasswordConfig(length=8, strategy="reject"), 500)
+        assert stats.passwords == 500
+        assert stats.swaps == 0
+        assert stats.draws == (500 + stats.rejected_passwords) * 8
+        assert stats.rejected_passwords > 0
+
+    def test_nothing_counted_outside_block(self):
+        from passgen.generator import PasswordConfig, generate_passwords, instrument
+        with instrument() as stats:
+            pass
+        generate_passwords(PasswordConfig(), 10)
+        assert stats.passwords == 0
+        assert stats.draws == 0
+
+
+# ---------------------------------------------------------------------------
+# Pluggable entropy sources and fork safety
+# ---------------------------------------------------------------------------
+
+class _CountingSource:
+    """Deterministic EntropySource (a SHAKE-256 keystream), counting reads."""
+
+    def __init__(self):
+        self.reads = 0
+        self.bytes = 0
+
+    def read(self, n):
+        from hashlib import shake_256
+        self.reads += 1
+        self.bytes += n
+        return shake_256(self.reads.to_bytes(8, "big")).digest(n)
+
+
+class TestEntropySources:
+    def test_urandom_source_counts_os_reads(self):
+        from passgen.generator import UrandomSource, instrument
+        with instrument() as stats:
+            data = UrandomSource().read(32)
+        assert len(data) == 32
+        assert stats.os_reads == 1
+        assert stats.os_bytes == 32
+
+    def test_getrandom_source(self):
+        import os
+
+        from passgen.generator import GetrandomSource
+        if not hasattr(os, "getrandom"):
+            pytest.skip("getrandom() not available")
+        source = GetrandomSource(os.GRND_NONBLOCK)
+        assert len(source.read(100_000)) == 100_000
+
+    def test_getrandom_source_unavailable(self, monkeypatch):
+        import os
+
+        from passgen.generator import GetrandomSource
+        monkeypatch.delattr(os, "getrandom", raising=False)
+        with pytest.raises(ValueError, match="getrandom"):
+            GetrandomSource()
+
+    def test_buffer_refills_from_source(self):
+        from passgen.generator import EntropyBuffer
+        source = _CountingSource()
+        buffer = EntropyBuffer(64, source=source)
+        for _ in range(8):
+            buffer.read(16)
+        assert source.reads == 2
+        assert len(buffer.read(1000)) == 1000
+        assert source.bytes == 2 * 64 + 1000
+
+    @pytest.mark.parametrize("strategy", ["shuffle", "reject"])
+    def test_generate_password_draws_only_from_source(self, strategy):
+        from passgen.generator import PasswordConfig, generate_password
+        config = PasswordConfig(length=20, strategy=strategy)
+        first = generate_password(config, _CountingSource())
+        assert first == generate_password(config, _CountingSource())
+        assert len(first) == 20
+
+    def test_policy_sampler_draws_from_source(self):
+        from passgen.generator import PasswordConfig, generate_password
+        config = PasswordConfig(length=12, min_numbers=3, max_repeat=2)
+        source = _CountingSource()
+        assert generate_password(config, source) == generate_password(
+            config, _CountingSource()
+        )
+        assert source.reads >= 1
+
+    def test_generate_and_iter_passwords_use_source(self):
+        from passgen.generator import PasswordConfig, generate_passwords, iter_passwords
+        config = PasswordConfig(length=16)
+        batch = generate_passwords(config, 50, entropy=_CountingSource())
+        assert batch == generate_passwords(config, 50, entropy=_CountingSource())
+        assert len(set(batch)) == 50
+        lazy = list(iter_passwords(config, 50, batch_size=7, entropy=_CountingSource()))
+        assert lazy == list(
+            iter_passwords(config, 50, batch_size=7, entropy=_CountingSource())
+        )
+
+    def test_shuffles_accept_source(self):
+        from passgen.generator import secure_shuffle, shuffle_many
+        items = list(range(40))
+        secure_shuffle(items, _CountingSource())
+        assert sorted(items) == list(range(40))
+        rows = [list(range(n)) for n in (3, 10)]
+        shuffle_many(rows, _CountingSource())
+        assert [sorted(r) for r in rows] == [list(range(3)), list(range(10))]
+
+
+class TestForkSafety:
+    def test_discard_after_fork_empties_live_buffers(self):
+        from passgen.generator import EntropyBuffer, _discard_after_fork
+        buffer = EntropyBuffer(64)
+        buffer.refill()
+        buffer.read(8)
+        _discard_after_fork()
+        assert buffer._buf == b""
+        assert buffer._pos == 0
+
+    def test_forked_child_does_not_repeat_parent_bytes(self):
+        import os
+
+        from passgen.generator import EntropyBuffer
+        if not hasattr(os, "fork"):
+            pytest.skip("os.fork() not available")
+        buffer = EntropyBuffer(4096)
+        buffer.refill()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # child
+            try:
+                os.close(read_fd)
+                os.write(write_fd, buffer.read(32))
+            finally:
+                os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as fh:
+            child = fh.read()
+        os.waitpid(pid, 0)
+        assert len(child) == 32
+        assert child != buffer.read(32)
+
+    def test_seeded_entropy_survives_fork_hook(self):
+        from passgen.fixtures import SeededEntropy
+        from passgen.generator import _discard_after_fork
+        a, b = SeededEntropy(b"k" * 32, 0), SeededEntropy(b"k" * 32, 0)
+        a.read(10)
+        _discard_after_fork()
+        b.read(10)
+        assert a.read(10) == b.read(10)
+
+
+# ---------------------------------------------------------------------------
+# PasswordGenerator (shared between threads)
+# ---------------------------------------------------------------------------
+
+class _StampedSource:
+    """Thread-safe EntropySource: a keystream of hashed 8-byte counters.
+
+    No stretch of its output repeats (barring a 64-bit collision), so two
+    threads receiving the same 8 bytes means bytes were handed out twice.
+    """
+
+    def __init__(self):
+        import threading
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def read(self, n):
+        from hashlib import blake2b
+        words = -(-n // 8)
+        with self._lock:
+            first = self._next
+            self._next += words
+        return b"".join(
+            blake2b(i.to_bytes(8, "big"), digest_size=8).digest()
+            for i in range(first, first + words)
+        )[:n]
+
+
+class TestPasswordGenerator:
+    def test_generates_per_config(self):
+        from passgen.generator import CharacterSet, PasswordConfig, PasswordGenerator
+        generator = PasswordGenerator(PasswordConfig(length=12, include_symbols=False))
+        password = generator.password()
+        assert len(password) == 12
+        assert not any(c in CharacterSet.SYMBOLS for c in password)
+        batch = generator.passwords(100)
+        assert len(set(batch)) == 100
+        out = bytearray(24)
+        generator.generate_into(out, count=2)
+        assert 0 not in out
+
+    def test_invalid_config_fails_up_front(self):
+        from passgen.generator import PasswordConfig, PasswordGenerator
+        with pytest.raises(ValueError):
+            PasswordGenerator(PasswordConfig(strategy="bogus"))
+        with pytest.raises(ValueError):
+            PasswordGenerator(block_size=0)
+
+    def test_honours_forbidden_substrings(self):
+        from passgen.generator import PasswordConfig, PasswordGenerator
+        generator = PasswordGenerator(PasswordConfig(length=8, forbidden=("ab", "cd")))
+        for _ in range(200):
+            password = generator.password()
+            assert "ab" not in password and "cd" not in password
+
+    def test_one_buffer_per_thread(self):
+        import threading
+
+        from passgen.generator import PasswordGenerator
+        generator = PasswordGenerator()
+        seen = []
+        threads = [
+            threading.Thread(target=lambda: seen.append(generator.entropy()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert generator.entropy() is generator.entropy()
+        assert len({id(buffer) for buffer in seen + [generator.entropy()]}) == 5
+
+    def test_threads_never_receive_overlapping_bytes(self):
+        import threading
+
+        from passgen.generator import PasswordGenerator
+        source = _StampedSource()
+        generator = PasswordGenerator(block_size=64, source=source)
+        received = [[] for _ in range(8)]
+        start = threading.Barrier(8)
+
+        def work(slot):
+            start.wait()
+            entropy = generator.entropy()
+            for _ in range(2000):
+                received[slot].append(entropy.read(8))
+                generator.password()  # interleave real consumption
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        words = [word for chunk in received for word in chunk]
+        assert len(words) == 8 * 2000
+        assert len(set(words)) == len(words)
+
+    def test_concurrent_batches_are_distinct(self):
+        import threading
+
+        from passgen.generator import PasswordConfig, PasswordGenerator
+        generator = PasswordGenerator(PasswordConfig(length=20))
+        results = []
+
+        def work():
+            results.extend(generator.passwords(500))
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(results) == 3000
+        assert len(set(results)) == 3000
+
+
+# ---------------------------------------------------------------------------
+# Custom alphabets (PasswordConfig.alphabets)
+# ---------------------------------------------------------------------------
+
+CJK = "".join(map(chr, range(0x4E00, 0x4E00 + 3000)))
+
+
+class TestCustomAlphabets:
+    def test_presets_and_literals(self):
+        from passgen.generator import CharacterSet, alphabet
+        assert alphabet("pin") == "0123456789"
+        assert alphabet("hex") == "0123456789abcdef"
+        assert len(alphabet("base58")) == 58
+        assert not set("0OIl") & set(alphabet("base58"))
+        assert alphabet("xyz") == "xyz"
+        assert alphabet("symbols") == CharacterSet.SYMBOLS
+
+    @pytest.mark.parametrize("strategy", ["shuffle", "reject"])
+    def test_single_alphabet(self, strategy):
+        from passgen.generator import PasswordConfig, generate_password, generate_passwords
+        config = PasswordConfig(length=10, alphabets=("0123456789",), strategy=strategy)
+        assert generate_password(config).isdigit()
+        assert all(p.isdigit() and len(p) == 10 for p in generate_passwords(config, 200))
+
+    @pytest.mark.parametrize("strategy", ["shuffle", "reject"])
+    def test_every_alphabet_used(self, strategy):
+        from passgen.generator import PasswordConfig, generate_passwords
+        alphabets = ("абвгдежзиклмн", "0123456789abcdef", CJK)
+        config = PasswordConfig(length=8, alphabets=alphabets, strategy=strategy)
+        for password in generate_passwords(config, 300):
+            assert len(password) == 8
+            for chars in alphabets:
+                assert any(c in chars for c in password)
+
+    def test_large_alphabets_are_uniform(self):
+        from collections import Counter
+
+        from passgen.generator import PasswordConfig, generate_passwords
+        # CJK ideographs, CJK Extension B and Hangul syllables.
+        ranges = [(0x4E00, 0x9FFF), (0x20000, 0x2A6DF), (0xAC00, 0xD7A3)]
+        everything = "".join(chr(c) for lo, hi in ranges for c in range(lo, hi + 1))
+        # 8-bit, 16-bit and Lemire index draws.
+        for size in (200, 300, 70_000):
+            chars = everything[:size]
+            config = PasswordConfig(length=16, alphabets=(chars,))
+            text = "".join(generate_passwords(config, 2000))
+            assert set(text) <= set(chars)
+            # 32000 draws: no symbol far above its expected share.
+            assert max(Counter(text).values()) < 2 * 32000 / size + 10
+
+    def test_policy_sampler_with_alphabets(self):
+        from passgen.generator import PasswordConfig, generate_password
+        config = PasswordConfig(length=12, alphabets=("ab", "xy"), max_repeat=1)
+        for _ in range(50):
+            password = generate_password(config)
+            assert set(password) <= set("abxy")
+            assert all(a != b for a, b in zip(password, password[1:]))
+
+    def test_normalized_and_deduplicated_once(self):
+        from passgen.generator import CompiledPolicy, PasswordConfig
+        config = PasswordConfig(alphabets=("éaab",))
+        policy = CompiledPolicy.from_config(config)
+        assert policy.classes == ("éab",)
+        assert CompiledPolicy.from_config(config) is policy
+        assert not policy.is_ascii
+
+    def test_exclude_applies_to_alphabets(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        config = PasswordConfig(length=12, alphabets=("0123456789abcdef",), exclude="0123")
+        assert not set("".join(generate_passwords(config, 100))) & set("0123")
+
+    @pytest.mark.parametrize("alphabets", [
+        ("",), ("ab", "bc"), ("a b",), ("́",), ("a\x00",),
+    ])
+    def test_invalid_alphabets_rejected(self, alphabets):
+        from passgen.generator import PasswordConfig, generate_password
+        with pytest.raises(ValueError):
+            generate_password(PasswordConfig(alphabets=alphabets))
+
+    def test_exact_entropy(self):
+        import math
+
+        from passgen.generator import PasswordConfig
+        from passgen.strength import config_entropy
+        config = PasswordConfig(length=6, alphabets=("0123456789",))
+        assert config_entropy(config) == pytest.approx(6 * math.log2(10))
+
+    def test_bytes_paths_need_ascii(self):
+        from passgen.generator import PasswordConfig, generate_into
+        with pytest.raises(ValueError):
+            generate_into(PasswordConfig(alphabets=(CJK,)), bytearray(64))
+        out = bytearray(16)
+        generate_into(PasswordConfig(alphabets=("0123456789abcdef",)), out)
+        assert set(out.decode()) <= set("0123456789abcdef")
@@ -0,0 +1,40 @@
+import json
+
+
+class TestGenerationStats:
+    def test_add_and_as_dict(self):
+        from passgen.metrics import STAGES, GenerationStats
+        stats = GenerationStats()
+        stats.add(draws=3, swaps=2)
+        stats.add(draws=1)
+        data = stats.as_dict()
+        assert data["draws"] == 4
+        assert data["swaps"] == 2
+        assert data["seconds"] == dict.fromkeys(STAGES, 0.0)
+
+    def test_lap_accumulates_stage_time(self):
+        from time import perf_counter
+
+        from passgen.metrics import GenerationStats
+        stats = GenerationStats()
+        mark = stats.lap("shuffle", perf_counter())
+        stats.lap("shuffle", mark)
+        assert stats.seconds["shuffle"] >= 0.0
+        assert stats.seconds["join"] == 0.0
+
+    def test_to_json_round_trips(self):
+        from passgen.metrics import GenerationStats
+        stats = GenerationStats(passwords=2, os_reads=1, os_bytes=4096)
+        assert json.loads(stats.to_json()) == stats.as_dict()
+
+    def test_to_prometheus(self):
+        from passgen.metrics import STAGES, GenerationStats
+        text = GenerationStats(passwords=7).to_prometheus(prefix="pg")
+        lines = text.splitlines()
+        assert "# TYPE pg_passwords_total counter" in lines
+        assert "pg_passwords_total 7" in lines
+        assert "pg_rejections_total 0" in lines
+        for stage in STAGES:
+            assert f'pg_stage_seconds_total{{stage="{stage}"}} 0.0' in lines
+        samples = [line for line in lines if not line.startswith("#")]
+        assert all(len(line.split(" ")) == 2 for line in samples)
@@ -0,0 +1,55 @@
+"""Unit tests for passgen.parallel."""
+import itertools
+
+import pytest
+
+from passgen.generator import CharacterSet, PasswordConfig
+
+
+class TestGenerateParallel:
+    def test_ordered_chunks_follow_submission_sizes(self):
+        from passgen.parallel import generate_parallel
+        chunks = list(generate_parallel(PasswordConfig(), 25, workers=2, chunk_size=10))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+    def test_unordered_yields_full_count(self):
+        from passgen.parallel import generate_parallel
+        chunks = generate_parallel(
+            PasswordConfig(length=12), 95, workers=2, chunk_size=10, ordered=False
+        )
+        passwords = [pw for chunk in chunks for pw in chunk]
+        assert len(passwords) == 95
+        assert all(len(pw) == 12 for pw in passwords)
+
+    def test_workers_produce_distinct_passwords(self):
+        from passgen.parallel import generate_parallel
+        chunks = generate_parallel(PasswordConfig(), 4000, workers=2, chunk_size=500)
+        passwords = [pw for chunk in chunks for pw in chunk]
+        assert len(set(passwords)) == len(passwords)
+
+    def test_config_is_honoured(self):
+        from passgen.parallel import generate_parallel
+        config = PasswordConfig(include_symbols=False, include_numbers=False)
+        letters = CharacterSet.LOWERCASE + CharacterSet.UPPERCASE
+        for chunk in generate_parallel(config, 50, workers=2, chunk_size=20):
+            for pw in chunk:
+                assert all(ch in letters for ch in pw)
+
+    def test_unbounded_stream(self):
+        from passgen.parallel import generate_parallel
+        stream = generate_parallel(PasswordConfig(), None, workers=1, chunk_size=5)
+        assert [len(c) for c in itertools.islice(stream, 3)] == [5, 5, 5]
+        stream.close()
+
+    def test_zero_count_yields_nothing(self):
+        from passgen.parallel import generate_parallel
+        assert list(generate_parallel(PasswordConfig(), 0, workers=1)) == []
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"count": -1}, {"chunk_size": 0}, {"workers": 0}]
+    )
+    def test_invalid_arguments_raise(self, kwargs):
+        from passgen.parallel import generate_parallel
+        params = {"count": 10, **kwargs}
+        with pytest.raises(ValueError):
+            list(generate_parallel(PasswordConfig(), **params))
@@ -0,0 +1,143 @@
+import math
+import re
+from collections import Counter
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Wordlist file format
+# ---------------------------------------------------------------------------
+
+class TestWordlist:
+    def test_round_trip(self, tmp_path):
+        from passgen.passphrase import Wordlist, write_wordlist
+        words = ["alpha", "bravo", "charlie", "délta", "echo"]
+        path = str(tmp_path / "w.pgw")
+        assert write_wordlist(words, path) == 5
+        with Wordlist(path) as wordlist:
+            assert len(wordlist) == 5
+            assert [wordlist[i] for i in range(5)] == words
+
+    def test_index_out_of_range(self, wordlist_path):
+        from passgen.passphrase import Wordlist
+        with Wordlist(wordlist_path) as wordlist:
+            with pytest.raises(IndexError):
+                wordlist[1000]
+            with pytest.raises(IndexError):
+                wordlist[-1]
+
+    def test_rejects_foreign_file(self, tmp_path):
+        from passgen.passphrase import Wordlist
+        path = tmp_path / "words.txt"
+        path.write_text("alpha\nbravo\n")
+        with pytest.raises(ValueError):
+            Wordlist(str(path))
+
+    def test_rejects_empty_file(self, tmp_path):
+        from passgen.passphrase import Wordlist
+        path = tmp_path / "empty.pgw"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            Wordlist(str(path))
+
+    def test_rejects_truncated_file(self, wordlist_path, tmp_path):
+        from passgen.passphrase import Wordlist
+        path = tmp_path / "cut.pgw"
+        with open(wordlist_path, "rb") as fh:
+            path.write_bytes(fh.read()[:-3])
+        with pytest.raises(ValueError):
+            Wordlist(str(path))
+
+    @pytest.mark.parametrize("words", [["only"], ["a", "a"], ["a", ""]])
+    def test_write_rejects_bad_lists(self, tmp_path, words):
+        from passgen.passphrase import write_wordlist
+        with pytest.raises(ValueError):
+            write_wordlist(words, str(tmp_path / "w.pgw"))
+
+    def test_read_words_accepts_eff_format(self):
+        from passgen.passphrase import read_words
+        lines = ["11111\tabacus\n", "11112\tabdomen\n", "\n", "plain\n", "plain\n"]
+        assert read_words(lines) == ["abacus", "abdomen", "plain"]
+
+
+# ---------------------------------------------------------------------------
+# Passphrase generation
+# ---------------------------------------------------------------------------
+
+WORD = r"w\d{3}"
+
+
+class TestGeneratePassphrases:
+    def test_default_shape(self, wordlist_path):
+        from passgen.passphrase import PassphraseConfig, Wordlist, generate_passphrase
+        with Wordlist(wordlist_path) as wordlist:
+            phrase = generate_passphrase(PassphraseConfig(), wordlist)
+        assert re.fullmatch("-".join([WORD] * 6), phrase)
+
+    def test_separator_and_capitalize(self, wordlist_path):
+        from passgen.passphrase import PassphraseConfig, Wordlist, generate_passphrases
+        config = PassphraseConfig(words=4, separator=" ", capitalize=True)
+        with Wordlist(wordlist_path) as wordlist:
+            phrases = generate_passphrases(config, wordlist, 50)
+        for phrase in phrases:
+            assert re.fullmatch(r"W\d{3}( W\d{3}){3}", phrase)
+
+    def test_numbers_and_symbols_injected_exactly_once(self, wordlist_path):
+        from passgen.generator import CharacterSet
+        from passgen.passphrase import PassphraseConfig, Wordlist, generate_passphrases
+        config = PassphraseConfig(
+            words=5, separator=" ", include_numbers=True, include_symbols=True
+        )
+        with Wordlist(wordlist_path) as wordlist:
+            phrases = generate_passphrases(config, wordlist, 300)
+        positions = Counter()
+        for phrase in phrases:
+            words = phrase.split(" ")
+            assert len(words) == 5
+            extras = [w[4:] for w in words]
+            assert sum(len(e) for e in extras) == 2
+            joined = "".join(extras)
+            assert sum(c in CharacterSet.NUMBERS for c in joined) == 1
+            assert sum(c in CharacterSet.SYMBOLS for c in joined) == 1
+            positions.update(i for i, e in enumerate(extras) if e)
+        assert set(positions) == set(range(5))
+
+    def test_batch_count(self, wordlist_path):
+        from passgen.passphrase import PassphraseConfig, Wordlist, generate_passphrases
+        with Wordlist(wordlist_path) as wordlist:
+            assert generate_passphrases(PassphraseConfig(), wordlist, 0) == []
+            assert len(generate_passphrases(PassphraseConfig(), wordlist, 257)) == 257
+            with pytest.raises(ValueError):
+                generate_passphrases(PassphraseConfig(), wordlist, -1)
+
+    def test_zero_words_raises(self, wordlist_path):
+        from passgen.passphrase import PassphraseConfig, Wordlist, generate_passphrase
+        with Wordlist(wordlist_path) as wordlist, pytest.raises(ValueError):
+            generate_passphrase(PassphraseConfig(words=0), wordlist)
+
+    def test_words_are_uniform(self, wordlist_path):
+        from passgen.passphrase import PassphraseConfig, Wordlist, generate_passphrases
+        config = PassphraseConfig(words=10)
+        with Wordlist(wordlist_path) as wordlist:
+            phrases = generate_passphrases(config, wordlist, 2000)
+        counts = Counter(w for phrase in phrases for w in phrase.split("-"))
+        expected = 20_000 / 1000
+        chi2 = sum((counts[f"w{i:03d}"] - expected) ** 2 / expected for i in range(1000))
+        # Wilson-Hilferty critical value for df=999 at z=4.753 (p ~ 1e-6).
+        df = 999
+        critical = df * (1 - 2 / (9 * df) + 4.753 * math.sqrt(2 / (9 * df))) ** 3
+        assert chi2 < critical
+
+    def test_small_wordlist_uses_byte_sampler(self, tmp_path):
+        from passgen.passphrase import (
+            PassphraseConfig,
+            Wordlist,
+            generate_passphrases,
+            write_wordlist,
+        )
+        path = str(tmp_path / "dice.pgw")
+        write_wordlist(["one", "two", "six"], path)
+        with Wordlist(path) as wordlist:
+            phrases = generate_passphrases(PassphraseConfig(words=3), wordlist, 100)
+        assert {w for p in phrases for w in p.split("-")} == {"one", "two", "six"}
@@ -0,0 +1,277 @@
+import itertools
+import math
+from collections import Counter
+
+import pytest
+
+
+def _brute_force(classes, minimums, max_repeat, length, forbidden=()):
+    """Every valid password, by enumeration (tiny alphabets only)."""
+    alphabet = "".join(classes)
+    valid = []
+    for chars in itertools.product(alphabet, repeat=length):
+        if any(
+            sum(c in cls for c in chars) < m for cls, m in zip(classes, minimums)
+        ):
+            continue
+        if max_repeat is not None and any(
+            len(list(run)) > max_repeat for _, run in itertools.groupby(chars)
+        ):
+            continue
+        if any(s in "".join(chars) for s in forbidden):
+            continue
+        valid.append("".join(chars))
+    return valid
+
+
+CASES = [
+    (("ab", "XYZ"), (1, 1), None),
+    (("ab", "XYZ"), (2, 1), None),
+    (("ab", "XYZ", "7"), (0, 2, 1), 1),
+    (("abc", "XY"), (1, 1), 2),
+    (("a", "B"), (1, 1), 1),
+]
+
+FORBIDDEN_CASES = [
+    (("ab", "XYZ"), (1, 1), None, ("aa", "bb")),
+    (("ab", "XYZ"), (1, 1), 2, ("aX", "Xa", "ZZ")),
+    (("abc", "XY"), (0, 1), 1, ("aba", "bXb", "XaX", "q")),
+    (("ab", "XY"), (1, 1), None, ("abXY", "bX", "b")),
+]
+
+
+# ---------------------------------------------------------------------------
+# Counting tables
+# ---------------------------------------------------------------------------
+
+class TestPolicySampler:
+    @pytest.mark.parametrize("classes,minimums,max_repeat", CASES)
+    @pytest.mark.parametrize("length", [1, 3, 5])
+    def test_count_matches_enumeration(self, classes, minimums, max_repeat, length):
+        from passgen.policy import PolicySampler
+        sampler = PolicySampler(classes, minimums, max_repeat)
+        assert sampler.count(length) == len(
+            _brute_force(classes, minimums, max_repeat, length)
+        )
+
+    @pytest.mark.parametrize("classes,minimums,max_repeat", CASES)
+    def test_unrank_is_a_bijection(self, classes, minimums, max_repeat):
+        from passgen.policy import PolicySampler
+        sampler = PolicySampler(classes, minimums, max_repeat)
+        length = 5
+        ranked = [sampler.unrank(length, r) for r in range(sampler.count(length))]
+        assert sorted(ranked) == sorted(_brute_force(classes, minimums, max_repeat, length))
+
+    @pytest.mark.parametrize("classes,minimums,max_repeat,forbidden", FORBIDDEN_CASES)
+    def test_forbidden_substrings_are_exact(self, classes, minimums, max_repeat, forbidden):
+        from passgen.policy import PolicySampler
+        sampler = PolicySampler(classes, minimums, max_repeat, forbidden)
+        for length in (1, 3, 5):
+            valid = _brute_force(classes, minimums, max_repeat, length, forbidden)
+            assert sampler.count(length) == len(valid)
+        ranked = [sampler.unrank(5, r) for r in range(sampler.count(5))]
+        assert sorted(ranked) == sorted(valid)
+
+    def test_unrank_rejects_out_of_range(self):
+        from passgen.policy import PolicySampler
+        sampler = PolicySampler(("ab", "XY"), (1, 1))
+        with pytest.raises(ValueError):
+            sampler.unrank(3, sampler.count(3))
+        with pytest.raises(ValueError):
+            sampler.unrank(3, -1)
+
+    def test_tables_grow_on_demand(self):
+        from passgen.policy import PolicySampler
+        sampler = PolicySampler(("ab", "XY"), (1, 1), 2)
+        long = sampler.count(40)
+        assert sampler.count(4) < long
+        assert len(sampler.unrank(40, long - 1)) == 40
+
+    def test_invalid_arguments(self):
+        from passgen.policy import PolicySampler
+        with pytest.raises(ValueError):
+            PolicySampler(("ab", "XY"), (1,))
+        with pytest.raises(ValueError):
+            PolicySampler(("ab", "XY"), (1, 1), 0)
+        with pytest.raises(ValueError):
+            PolicySampler(("ab", "XY"), (1, 1), None, ("",))
+
+    def test_cached(self):
+        from passgen.policy import policy_sampler
+        assert policy_sampler(("ab", "XY"), (1, 1), 2) is policy_sampler(
+            ("ab", "XY"), (1, 1), 2
+        )
+
+    def test_oversized_tables_raise(self):
+        from passgen.policy import PolicySampler
+        sampler = PolicySampler(("ab", "XY"), (1, 1), 2)
+        with pytest.raises(ValueError, match="too complex"):
+            sampler.count(1_000_000)
+
+
+class TestCompositionSampler:
+    @pytest.mark.parametrize("classes,minimums", [
+        (("ab", "XYZ"), (1, 1)),
+        (("ab", "XYZ"), (2, 1)),
+        (("ab", "XYZ", "7"), (0, 2, 1)),
+        (("abc",), (2,)),
+    ])
+    def test_matches_enumeration(self, classes, minimums):
+        from passgen.policy import CompositionSampler
+        sampler = CompositionSampler(classes, minimums)
+        for length in (1, 3, 5):
+            valid = _brute_force(classes, minimums, None, length)
+            assert sampler.count(length) == len(valid)
+        ranked = [sampler.unrank(5, r) for r in range(sampler.count(5))]
+        assert sorted(ranked) == sorted(valid)
+
+    def test_unrank_rejects_out_of_range(self):
+        from passgen.policy import CompositionSampler
+        sampler = CompositionSampler(("ab", "XY"), (1, 1))
+        with pytest.raises(ValueError):
+            sampler.unrank(3, sampler.count(3))
+
+    def test_large_minimums_are_cheap(self):
+        from passgen.generator import CharacterSet
+        from passgen.policy import CompositionSampler, PolicySampler
+        classes = (CharacterSet.LOWERCASE, CharacterSet.UPPERCASE,
+                   CharacterSet.NUMBERS, CharacterSet.SYMBOLS)
+        sampler = CompositionSampler(classes, (20, 20, 20, 20))
+        password = sampler.unrank(128, sampler.count(128) // 2)
+        for chars in classes:
+            assert sum(c in chars for c in password) >= 20
+        assert CompositionSampler(classes, (1, 2, 3, 1)).count(12) == PolicySampler(
+            classes, (1, 2, 3, 1)
+        ).count(12)
+
+    def test_chosen_without_run_limit_or_forbidden(self):
+        from passgen.policy import CompositionSampler, PolicySampler, policy_sampler
+        assert isinstance(policy_sampler(("ab", "XY"), (2, 1), None), CompositionSampler)
+        assert isinstance(policy_sampler(("ab", "XY"), (2, 1), 1), PolicySampler)
+        forbidding = policy_sampler(("ab", "XY"), (2, 1), None, ("aX",))
+        assert isinstance(forbidding, PolicySampler)
+
+
+# ---------------------------------------------------------------------------
+# generate_password / generate_passwords with policy fields
+# ---------------------------------------------------------------------------
+
+class TestPolicyGeneration:
+    def test_minimum_counts(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=8, min_numbers=3, min_symbols=3)
+        for password in generate_passwords(config, 500):
+            assert len(password) == 8
+            assert sum(c in CharacterSet.NUMBERS for c in password) >= 3
+            assert sum(c in CharacterSet.SYMBOLS for c in password) >= 3
+            assert any(c in CharacterSet.LOWERCASE for c in password)
+            assert any(c in CharacterSet.UPPERCASE for c in password)
+
+    def test_zero_minimum_drops_the_guarantee(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=8, min_symbols=0)
+        passwords = generate_passwords(config, 2000)
+        assert any(not set(p) & set(CharacterSet.SYMBOLS) for p in passwords)
+
+    def test_max_repeat(self):
+        from passgen.generator import PasswordConfig, generate_password, generate_passwords
+        config = PasswordConfig(length=32, include_symbols=False, max_repeat=1)
+        passwords = generate_passwords(config, 300) + [generate_password(config)]
+        for password in passwords:
+            assert all(a != b for a, b in zip(password, password[1:]))
+
+    def test_exclude_and_ambiguous(self):
+        from passgen.generator import PasswordConfig, generate_password, generate_passwords
+        config = PasswordConfig(length=64, exclude="abc!", exclude_ambiguous=True)
+        passwords = generate_passwords(config, 200) + [generate_password(config)]
+        assert not set("".join(passwords)) & set("abc!0O1lI")
+
+    def test_exclude_whole_set_raises(self):
+        from passgen.generator import PasswordConfig, generate_password
+        with pytest.raises(ValueError):
+            generate_password(PasswordConfig(exclude="0123456789"))
+
+    def test_forbidden_substrings(self):
+        from passgen.generator import PasswordConfig, generate_password, generate_passwords
+        config = PasswordConfig(
+            length=8, include_symbols=False, exclude="bcdefghijklmnopqrstuvwxyz",
+            forbidden=("aa", "Q"),
+        )
+        passwords = generate_passwords(config, 300) + [generate_password(config)]
+        for password in passwords:
+            assert "aa" not in password
+            assert "Q" not in password
+
+    def test_forbidden_substrings_leave_few_passwords(self):
+        from passgen.generator import PasswordConfig, generate_password, generate_passwords
+        from passgen.strength import config_entropy
+        config = PasswordConfig(length=16, alphabets=("ab",), forbidden=("aa", "bb"))
+        passwords = set(generate_passwords(config, 200) + [generate_password(config)])
+        assert passwords == {"ab" * 8, "ba" * 8}
+        assert config_entropy(config) == 1.0
+
+    def test_unsatisfiable_forbidden_raises(self):
+        from passgen.generator import PasswordConfig, generate_password, generate_passwords
+        lower, upper = "abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        # Letters only, both cases required, but no case change allowed.
+        boundaries = tuple(a + b for a in lower for b in upper)
+        boundaries += tuple(b + a for a in lower for b in upper)
+        config = PasswordConfig(
+            length=8, include_numbers=False, include_symbols=False, forbidden=boundaries
+        )
+        with pytest.raises(ValueError, match="no password satisfies"):
+            generate_password(config)
+        with pytest.raises(ValueError, match="no password satisfies"):
+            generate_passwords(config, 5)
+
+    def test_policy_without_valid_passwords_raises(self):
+        from passgen.generator import (
+            CharacterSet,
+            CompiledPolicy,
+            PasswordConfig,
+            check_config,
+        )
+        # One symbol left, five of them needed, never two in a row: 8 is too short.
+        config = PasswordConfig(
+            length=8, exclude=CharacterSet.SYMBOLS[1:], min_symbols=5, max_repeat=1
+        )
+        with pytest.raises(ValueError, match="no password satisfies"):
+            check_config(config, CompiledPolicy.from_config(config))
+
+    @pytest.mark.parametrize("kwargs", [
+        {"min_numbers": -1},
+        {"max_repeat": 0},
+        {"forbidden": ("",)},
+        {"length": 8, "min_numbers": 5, "min_symbols": 5},
+    ])
+    def test_invalid_policies_raise(self, kwargs):
+        from passgen.generator import PasswordConfig, generate_password, generate_passwords
+        config = PasswordConfig(**kwargs)
+        with pytest.raises(ValueError):
+            generate_password(config)
+        with pytest.raises(ValueError):
+            generate_passwords(config, 1)
+
+    def test_constrained_batch_is_uniform(self):
+        from passgen.generator import EntropyBuffer, PasswordConfig, generate_passwords
+        from passgen.policy import policy_sampler
+        config = PasswordConfig(
+            length=4, include_symbols=False, include_numbers=False,
+            exclude="cdefghijklmnopqrstuvwxyzCDEFGHIJKLMNOPQRSTUVWXYZ",
+            min_uppercase=2, max_repeat=2,
+        )
+        total = policy_sampler(("ab", "AB"), (1, 2), 2).count(4)
+        trials = 200 * total
+        counts = Counter(generate_passwords(config, trials, entropy=EntropyBuffer()))
+        assert len(counts) == total
+        expected = trials / total
+        chi2 = sum((n - expected) ** 2 / expected for n in counts.values())
+        df = total - 1
+        critical = df * (1 - 2 / (9 * df) + 4.753 * math.sqrt(2 / (9 * df))) ** 3
+        assert chi2 < critical
+
+    def test_daemon_client_refuses_policy_configs(self, tmp_path):
+        from passgen.client import request_passwords
+        from passgen.generator import PasswordConfig
+        with pytest.raises(ValueError):
+            request_passwords(str(tmp_path / "none.sock"), PasswordConfig(max_repeat=2))
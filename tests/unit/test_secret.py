@@ -0,0 +1,160 @@
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# SecretBuffer
+# ---------------------------------------------------------------------------
+
+class TestSecretBuffer:
+    def test_zero_wipes_and_releases(self):
+        from passgen.secret import SecretBuffer
+        secret = SecretBuffer(8)
+        buffer = secret.buffer
+        buffer[:] = b"hunter22"
+        secret.zero()
+        assert buffer == bytes(8)
+        assert "zeroed" in repr(secret)
+        with pytest.raises(ValueError):
+            _ = secret.view
+        secret.zero()  # idempotent
+
+    def test_context_manager_zeroes(self):
+        from passgen.secret import SecretBuffer
+        with SecretBuffer(4) as secret:
+            secret.view[:] = b"abcd"
+            assert secret.decode() == "abcd"
+        with pytest.raises(ValueError):
+            secret.decode()
+
+    def test_repr_hides_contents(self):
+        from passgen.secret import SecretBuffer
+        secret = SecretBuffer(6)
+        secret.view[:] = b"s3cr3t"
+        assert "s3cr3t" not in repr(secret)
+        assert len(secret) == 6
+
+    def test_locked_buffer(self):
+        from passgen.secret import SecretBuffer
+        try:
+            secret = SecretBuffer(64, lock=True)
+        except ValueError as exc:
+            pytest.skip(f"cannot lock memory here: {exc}")
+        assert secret.locked
+        secret.view[:4] = b"abcd"
+        secret.zero()
+        assert not secret._mm
+
+    def test_negative_size_rejected(self):
+        from passgen.secret import SecretBuffer
+        with pytest.raises(ValueError):
+            SecretBuffer(-1)
+
+
+# ---------------------------------------------------------------------------
+# generate_secret / generate_secrets
+# ---------------------------------------------------------------------------
+
+class TestGenerateSecret:
+    @pytest.mark.parametrize("kwargs", [
+        {"length": 20},
+        {"length": 8, "strategy": "reject"},
+        {"length": 12, "min_numbers": 3, "max_repeat": 2},
+        {"length": 10, "forbidden": ("ab", "Zq")},
+    ])
+    def test_satisfies_policy(self, kwargs):
+        from passgen.generator import CharacterSet, PasswordConfig
+        from passgen.secret import generate_secrets
+        config = PasswordConfig(**kwargs)
+        with generate_secrets(config, 300) as secret:
+            lines = secret.decode().split("\n")
+        assert lines[-1] == ""
+        assert len(lines) == 301
+        for password in lines[:-1]:
+            assert len(password) == config.length
+            for chars in (CharacterSet.LOWERCASE, CharacterSet.UPPERCASE,
+                          CharacterSet.NUMBERS, CharacterSet.SYMBOLS):
+                assert any(c in chars for c in password)
+            assert not any(s in password for s in config.forbidden)
+            if config.max_repeat:
+                assert all(len(set(password[i:i + 3])) > 1 for i in range(10))
+
+    def test_single_secret(self):
+        from passgen.generator import PasswordConfig
+        from passgen.secret import generate_secret
+        secret = generate_secret(PasswordConfig(length=24))
+        password = secret.decode()
+        assert len(password) == 24
+        assert password.isascii() and password.isprintable()
+
+    def test_custom_terminator_and_empty_batch(self):
+        from passgen.generator import PasswordConfig
+        from passgen.secret import generate_secrets
+        secret = generate_secrets(PasswordConfig(length=6), 4, terminator=b"\r\n")
+        records = secret.decode().split("\r\n")
+        assert [len(r) for r in records] == [6, 6, 6, 6, 0]
+        assert len(generate_secrets(PasswordConfig(), 0)) == 0
+
+    def test_uses_entropy_source(self):
+        from passgen.fixtures import SeededEntropy
+        from passgen.generator import PasswordConfig
+        from passgen.secret import generate_secrets
+        config = PasswordConfig()
+        a = generate_secrets(config, 50, entropy=SeededEntropy(bytes(32), 0))
+        b = generate_secrets(config, 50, entropy=SeededEntropy(bytes(32), 0))
+        assert a.decode() == b.decode()
+        assert len(set(a.decode().split())) == 50
+
+    def test_invalid_config_raises(self):
+        from passgen.generator import PasswordConfig
+        from passgen.secret import generate_secret
+        with pytest.raises(ValueError):
+            generate_secret(PasswordConfig(length=3))
+
+
+class TestGenerateInto:
+    def test_writes_only_password_positions(self):
+        from passgen.generator import PasswordConfig, generate_into
+        out = bytearray(50)
+        generate_into(PasswordConfig(length=8), out, count=3, stride=12, offset=5)
+        assert out[:5] == bytes(5)
+        for r in range(3):
+            start = 5 + 12 * r
+            assert 0 not in out[start:start + 8]
+            assert out[start + 8:start + 12] == bytes(4)
+
+    def test_positions_are_uniformly_shuffled(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_into
+        config = PasswordConfig(length=4, include_symbols=False)
+        out = bytearray(4 * 6000)
+        generate_into(config, out, count=6000)
+        digits = [0] * 4
+        for r in range(6000):
+            for i in range(4):
+                if chr(out[4 * r + i]) in CharacterSet.NUMBERS:
+                    digits[i] += 1
+        # Every position holds the guaranteed digit equally often.
+        assert max(digits) - min(digits) < 0.15 * max(digits)
+
+    def test_rejects_bad_layout(self):
+        from passgen.generator import PasswordConfig, generate_into
+        with pytest.raises(ValueError):
+            generate_into(PasswordConfig(length=8), bytearray(20), count=3)
+        with pytest.raises(ValueError):
+            generate_into(PasswordConfig(length=8), bytearray(40), count=2, stride=4)
+
+    def test_instrumented_stages(self):
+        from passgen.generator import PasswordConfig, generate_into, instrument
+        from passgen.secret import generate_secret
+        stages = ("pool_build", "guaranteed", "filler", "shuffle")
+        with instrument() as stats:
+            generate_secret(PasswordConfig(length=20)).zero()
+        assert stats.passwords == 1
+        assert all(stats.seconds[stage] > 0 for stage in stages)
+        with instrument() as stats:
+            generate_into(PasswordConfig(length=8), bytearray(8 * 50), count=50)
+        assert stats.passwords == 50
+        assert stats.swaps == 50 * 7
+        assert all(stats.seconds[stage] > 0 for stage in stages)
+        with instrument() as stats:
+            generate_into(PasswordConfig(length=8, min_numbers=2), bytearray(8))
+        assert stats.seconds["pool_build"] > 0 and stats.seconds["filler"] > 0
@@ -0,0 +1,231 @@
+"""Unit tests for passgen.server and passgen.client (daemon mode)."""
+import json
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from passgen.generator import CharacterSet, EntropyBuffer, PasswordConfig
+
+
+def _roundtrip(path, payload):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(path)
+        sock.sendall(payload)
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+
+class TestParseRequest:
+    def test_defaults(self):
+        from passgen.server import parse_request
+        config, count = parse_request({})
+        assert config == PasswordConfig()
+        assert count == 1
+
+    def test_all_fields(self):
+        from passgen.server import parse_request
+        config, count = parse_request(
+            {"length": 20, "symbols": False, "numbers": False,
+             "strategy": "reject", "count": 7}
+        )
+        assert config == PasswordConfig(
+            length=20, include_symbols=False, include_numbers=False, strategy="reject"
+        )
+        assert count == 7
+
+    @pytest.mark.parametrize(
+        "request_obj",
+        [
+            [],
+            {"length": 7},
+            {"length": 129},
+            {"length": "16"},
+            {"length": True},
+            {"count": 0},
+            {"count": 10_001},
+            {"symbols": "yes"},
+            {"strategy": "guess"},
+            {"colour": "blue"},
+        ],
+    )
+    def test_invalid_requests_raise(self, request_obj):
+        from passgen.server import parse_request
+        with pytest.raises(ValueError):
+            parse_request(request_obj)
+
+
+class TestHandleLine:
+    def test_valid_line(self):
+        from passgen.server import handle_line
+        reply = handle_line(b'{"count": 3, "length": 12}\n', EntropyBuffer())
+        assert len(reply["passwords"]) == 3
+        assert all(len(pw) == 12 for pw in reply["passwords"])
+
+    def test_malformed_json_returns_error(self):
+        from passgen.server import handle_line
+        assert "error" in handle_line(b"not json\n", EntropyBuffer())
+
+    def test_invalid_request_returns_error(self):
+        from passgen.server import handle_line
+        reply = handle_line(b'{"length": 4}\n', EntropyBuffer())
+        assert reply == {"error": "length must be between 8 and 128"}
+
+    def test_deeply_nested_json_returns_error(self):
+        from passgen.server import MAX_LINE, handle_line
+        line = b"[" * 3000 + b"\n"
+        assert len(line) < MAX_LINE
+        assert "error" in handle_line(line, EntropyBuffer())
+
+
+class TestDaemon:
+    def test_socket_is_owner_only(self, daemon):
+        mode = stat.S_IMODE(os.stat(daemon).st_mode)
+        assert mode & 0o077 == 0
+
+    def test_roundtrip(self, daemon):
+        reply = _roundtrip(daemon, b'{"count": 5, "numbers": false}\n')
+        assert len(reply["passwords"]) == 5
+        for pw in reply["passwords"]:
+            assert len(pw) == 16
+            assert not any(ch in CharacterSet.NUMBERS for ch in pw)
+
+    def test_multiple_requests_per_connection(self, daemon):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(daemon)
+            sock.sendall(b'{}\n{"length": 3}\n{"count": 2}\n')
+            with sock.makefile("rb") as reply:
+                replies = [json.loads(reply.readline()) for _ in range(3)]
+        assert len(replies[0]["passwords"]) == 1
+        assert "error" in replies[1]
+        assert len(replies[2]["passwords"]) == 2
+
+    def test_overlong_line_rejected(self, daemon):
+        reply = _roundtrip(daemon, b"{" + b" " * 10_000 + b"}\n")
+        assert reply == {"error": "request line too long"}
+
+    def test_concurrent_clients(self, daemon):
+        from passgen.client import request_passwords
+        results = []
+
+        def worker():
+            results.extend(request_passwords(daemon, PasswordConfig(), count=50))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(results) == 400
+        assert len(set(results)) == 400
+
+    def test_large_request_does_not_block_others(self, daemon):
+        import time
+        from passgen.generator import generate_passwords
+        from passgen.server import MAX_COUNT
+        config = PasswordConfig(length=128)
+        began = time.perf_counter()
+        generate_passwords(config, MAX_COUNT)
+        one_large = time.perf_counter() - began
+
+        payload = json.dumps({"count": MAX_COUNT, "length": 128}).encode() + b"\n"
+        large = threading.Thread(target=_roundtrip, args=(daemon, payload * 3))
+        large.start()
+        time.sleep(0.03)
+        began = time.perf_counter()
+        assert len(_roundtrip(daemon, b'{"count": 1}\n')["passwords"]) == 1
+        waited = time.perf_counter() - began
+        large.join()
+        assert waited < one_large / 2
+
+    def test_second_daemon_on_same_path_refused(self, daemon):
+        import asyncio
+
+        from passgen.server import serve
+        with pytest.raises(OSError):
+            asyncio.run(serve(daemon))
+
+    def test_stale_socket_is_replaced(self, tmp_path):
+        import asyncio
+
+        from passgen.server import serve
+        path = str(tmp_path / "stale.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()  # file remains, nobody listening
+
+        async def start_and_stop():
+            stop = asyncio.Event()
+            await serve(path, stop, ready=stop.set)
+
+        asyncio.run(start_and_stop())
+        assert not os.path.exists(path)
+
+    @pytest.mark.parametrize("kind", ["file", "symlink"])
+    def test_non_socket_path_is_never_removed(self, tmp_path, kind):
+        import asyncio
+
+        from passgen.server import serve
+        notes = tmp_path / "notes.txt"
+        notes.write_text("keep me")
+        path = notes
+        if kind == "symlink":
+            path = tmp_path / "link.sock"
+            path.symlink_to(notes)
+        with pytest.raises(OSError, match="not a socket"):
+            asyncio.run(serve(str(path)))
+        assert os.path.lexists(path)
+        assert notes.read_text() == "keep me"
+
+
+class TestClient:
+    def test_default_socket_path_from_env(self, monkeypatch):
+        from passgen.client import default_socket_path
+        monkeypatch.setenv("PASSGEN_SOCKET", "/tmp/x.sock")
+        assert default_socket_path() == "/tmp/x.sock"
+
+    def test_default_socket_path_from_runtime_dir(self, monkeypatch):
+        from passgen.client import default_socket_path
+        monkeypatch.delenv("PASSGEN_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+        assert default_socket_path() == "/run/user/1000/passgen.sock"
+
+    def test_no_default_socket_path(self, monkeypatch):
+        from passgen.client import default_socket_path
+        monkeypatch.delenv("PASSGEN_SOCKET", raising=False)
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        assert default_socket_path() is None
+
+    def test_regular_file_not_trusted(self, tmp_path):
+        from passgen.client import socket_is_trusted
+        path = tmp_path / "not-a-socket"
+        path.write_text("")
+        assert socket_is_trusted(str(path)) is False
+        assert socket_is_trusted(str(tmp_path / "missing")) is False
+
+    def test_daemon_socket_trusted(self, daemon):
+        from passgen.client import socket_is_trusted
+        assert socket_is_trusted(daemon) is True
+
+    def test_request_passwords(self, daemon):
+        from passgen.client import request_passwords
+        config = PasswordConfig(length=24, include_symbols=False)
+        passwords = request_passwords(daemon, config, count=3)
+        assert len(passwords) == 3
+        for pw in passwords:
+            assert len(pw) == 24
+            assert not any(ch in CharacterSet.SYMBOLS for ch in pw)
+
+    def test_request_error_raises_value_error(self, daemon):
+        from passgen.client import request_passwords
+        with pytest.raises(ValueError):
+            request_passwords(daemon, PasswordConfig(length=4))
+
+    def test_unreachable_socket_raises_os_error(self, tmp_path):
+        from passgen.client import request_passwords
+        with pytest.raises(OSError):
+            request_passwords(str(tmp_path / "missing.sock"), PasswordConfig())
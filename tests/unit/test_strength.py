@@ -0,0 +1,146 @@
+import itertools
+import math
+from collections import Counter
+
+import pytest
+
+
+def _shannon(counter):
+    total = sum(counter.values())
+    return -sum(n / total * math.log2(n / total) for n in counter.values())
+
+
+def _shuffle_distribution(classes, length):
+    """Exact output distribution of guaranteed + filler + uniform shuffle."""
+    pool = "".join(classes)
+    outcomes = Counter()
+    for guaranteed in itertools.product(*classes):
+        for filler in itertools.product(pool, repeat=length - len(classes)):
+            chars = guaranteed + filler
+            for order in itertools.permutations(range(length)):
+                outcomes["".join(chars[i] for i in order)] += 1
+    return outcomes
+
+
+# ---------------------------------------------------------------------------
+# Exact entropy of generated passwords
+# ---------------------------------------------------------------------------
+
+class TestConfigEntropy:
+    @pytest.mark.parametrize("classes,length", [
+        (("ab", "X"), 3),
+        (("abc", "XY"), 4),
+        (("ab", "X", "7"), 4),
+    ])
+    def test_shuffle_entropy_matches_enumeration(self, classes, length):
+        from passgen.strength import _shuffle_entropy
+        sizes = tuple(map(len, classes))
+        expected = _shannon(_shuffle_distribution(classes, length))
+        assert _shuffle_entropy(sizes, length) == pytest.approx(expected)
+
+    def test_reject_entropy_counts_valid_passwords(self):
+        from passgen.strength import _reject_entropy
+        valid = [
+            p for p in itertools.product("abcXY7", repeat=4)
+            if set(p) & set("abc") and set(p) & set("XY") and "7" in p
+        ]
+        assert _reject_entropy((3, 2, 1), 4) == pytest.approx(math.log2(len(valid)))
+
+    def test_default_config_is_below_the_naive_estimate(self):
+        from passgen.generator import CompiledPolicy, PasswordConfig
+        from passgen.strength import config_entropy
+        for strategy in ("shuffle", "reject"):
+            config = PasswordConfig(strategy=strategy)
+            naive = CompiledPolicy.from_config(config).entropy_bits(config.length)
+            bits = config_entropy(config)
+            assert naive - 1 < bits < naive
+
+    def test_policy_configs_use_the_exact_count(self):
+        from passgen.generator import CharacterSet as C
+        from passgen.generator import PasswordConfig
+        from passgen.policy import policy_sampler
+        from passgen.strength import config_entropy
+        config = PasswordConfig(length=10, min_numbers=3, max_repeat=2)
+        sampler = policy_sampler(
+            (C.LOWERCASE, C.UPPERCASE, C.NUMBERS, C.SYMBOLS), (1, 1, 3, 1), 2
+        )
+        assert config_entropy(config) == pytest.approx(math.log2(sampler.count(10)))
+
+    def test_exclusions_lower_entropy(self):
+        from passgen.generator import PasswordConfig
+        from passgen.strength import config_entropy
+        full = config_entropy(PasswordConfig())
+        assert config_entropy(PasswordConfig(exclude_ambiguous=True)) < full
+
+    def test_invalid_config_raises(self):
+        from passgen.generator import PasswordConfig
+        from passgen.strength import config_entropy
+        with pytest.raises(ValueError):
+            config_entropy(PasswordConfig(strategy="guess"))
+
+    def test_empty_password_space_raises_clearly(self):
+        from passgen.strength import _log2_count, _reject_entropy
+        with pytest.raises(ValueError, match="no password satisfies"):
+            _log2_count(0)
+        # Two classes at length 1: nothing uses both.
+        with pytest.raises(ValueError, match="no password satisfies"):
+            _reject_entropy((3, 4), 1)
+
+
+# ---------------------------------------------------------------------------
+# Pattern-aware estimator
+# ---------------------------------------------------------------------------
+
+class TestEstimateEntropy:
+    def test_empty(self):
+        from passgen.strength import estimate_entropy
+        assert estimate_entropy("") == 0.0
+
+    def test_random_string_scores_brute_force(self):
+        from passgen.strength import estimate_entropy
+        assert estimate_entropy("Xk9#mP2$vL") == pytest.approx(10 * math.log2(88))
+
+    @pytest.mark.parametrize("weak", [
+        "password", "Password", "aaaaaaaaaa", "abcdefgh", "87654321", "qwertyuiop",
+        "asdfghjkl",
+    ])
+    def test_patterns_score_low(self, weak):
+        from passgen.strength import estimate_entropy
+        assert estimate_entropy(weak) < 15
+
+    @pytest.mark.parametrize("weak,bits", [
+        ("P@ssw0rd", 10), ("Summer2024!", 25), ("abcabcabcabc", 12),
+        ("hello123hello123", 15), ("dragon19880514", 30), ("M0nk3y!", 20),
+    ])
+    def test_leet_dates_and_repeated_blocks_score_low(self, weak, bits):
+        from passgen.strength import estimate_entropy
+        assert estimate_entropy(weak) < bits
+
+    def test_leet_substitutions_cost_a_bit_each(self):
+        from passgen.strength import estimate_entropy
+        assert estimate_entropy("p@ssword") == estimate_entropy("password") + 1
+        assert estimate_entropy("p@$$word") == estimate_entropy("password") + 3
+
+    def test_impossible_dates_are_not_dates(self):
+        from passgen.strength import _is_date
+        assert _is_date("14/05/1988") and _is_date("19880514") and _is_date("051488")
+        assert not _is_date("99/99/1988") and not _is_date("31133099")
+
+    def test_pattern_inside_random_text(self):
+        from passgen.strength import estimate_entropy
+        plain = estimate_entropy("Q7#kpassword")
+        assert plain < estimate_entropy("Q7#kzmvtrhwe")
+
+    def test_case_change_costs_a_bit(self):
+        from passgen.strength import estimate_entropy
+        assert estimate_entropy("PassWord") == estimate_entropy("password") + 1
+
+    def test_non_ascii(self):
+        from passgen.strength import OTHER_SIZE, estimate_entropy
+        assert estimate_entropy("éa") == pytest.approx(2 * math.log2(26 + OTHER_SIZE))
+
+    def test_score_passwords_is_lazy_bulk_map(self):
+        from passgen.strength import estimate_entropy, score_passwords
+        passwords = ["password", "Xk9#mP2$vL", "aaaa"]
+        scores = score_passwords(iter(passwords))
+        assert list(scores) == [estimate_entropy(p) for p in passwords]
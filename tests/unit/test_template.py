@@ -0,0 +1,96 @@
+import math
+import re
+from collections import Counter
+
+import pytest
+
+
+# ---------------------------------------------------------------------------
+# Template compilation
+# ---------------------------------------------------------------------------
+
+class TestCompileTemplate:
+    def test_placeholders_and_literals(self):
+        from passgen.generator import CharacterSet
+        from passgen.template import CONSONANTS, VOWELS, compile_template
+        compiled = compile_template("Cv9-s")
+        assert compiled.positions == (
+            CONSONANTS.upper(), VOWELS, CharacterSet.NUMBERS, "-", CharacterSet.SYMBOLS,
+        )
+        assert compiled.length == 5
+
+    def test_shared_sets_form_one_group(self):
+        from passgen.template import compile_template
+        compiled = compile_template("cvc-cvc")
+        assert sorted(cols for _, cols in compiled.groups) == [(0, 2, 4, 6), (1, 5)]
+
+    def test_sets_ranges_and_escapes(self):
+        from passgen.template import compile_template
+        compiled = compile_template(r"[a-f0-3]\c[-x][x-][\-y]")
+        assert compiled.positions == ("abcdef0123", "c", "-x", "x-", "-y")
+
+    def test_set_is_normalized_and_deduplicated(self):
+        from passgen.template import compile_template
+        assert compile_template("[aabé]").positions == ("abé",)
+
+    def test_cached_by_template(self):
+        from passgen.template import compile_template
+        assert compile_template("Cvccvc") is compile_template("Cvccvc")
+
+    def test_exact_entropy(self):
+        from passgen.template import compile_template
+        compiled = compile_template("Cvccvc-99-Cvccvc")
+        assert compiled.combinations == (21 ** 4 * 5 ** 2) ** 2 * 10 ** 2
+        assert compiled.entropy_bits == pytest.approx(
+            8 * math.log2(21) + 4 * math.log2(5) + 2 * math.log2(10)
+        )
+
+    @pytest.mark.parametrize("template", [
+        "", "---", "[a]", "ab\\", "[ab", "[]", "[z-a]", "[ a]",
+    ])
+    def test_rejects_malformed(self, template):
+        from passgen.template import compile_template
+        with pytest.raises(ValueError):
+            compile_template(template)
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+class TestGenerateTemplatePasswords:
+    def test_shape(self):
+        from passgen.template import generate_template_passwords
+        passwords = generate_template_passwords("Cvccvc-99-Cvccvc", 500)
+        assert len(passwords) == 500
+        shape = r"[B-DF-HJ-NP-TV-Z][aeiou][b-df-hj-np-tv-z]{2}[aeiou][b-df-hj-np-tv-z]"
+        for password in passwords:
+            assert re.fullmatch(f"{shape}-[0-9]{{2}}-{shape}", password)
+
+    def test_unicode_set(self):
+        from passgen.template import generate_template_password
+        password = generate_template_password("[αβγδ]9[한글]")
+        assert password[0] in "αβγδ" and password[2] in "한글"
+
+    def test_positions_sharing_a_set_are_independent(self):
+        from passgen.template import generate_template_passwords
+        passwords = generate_template_passwords("99", 20_000)
+        counts = Counter(passwords)
+        assert len(counts) == 100
+        # Every pair of digits about equally often (mean 200, sd ~14).
+        assert max(counts.values()) - min(counts.values()) < 150
+
+    def test_uses_entropy_source(self):
+        from passgen.fixtures import SeededEntropy
+        from passgen.template import generate_template_passwords
+        a = generate_template_passwords("xxxx-xxxx", 20, SeededEntropy(bytes(32), 0))
+        b = generate_template_passwords("xxxx-xxxx", 20, SeededEntropy(bytes(32), 0))
+        assert a == b
+        assert len(set(a)) == 20
+
+    def test_batch_count(self):
+        from passgen.template import generate_template_passwords
+        assert generate_template_passwords("cvc", 0) == []
+        assert len(generate_template_passwords("cvc", 4097)) == 4097
+        with pytest.raises(ValueError):
+            generate_template_passwords("cvc", -1)
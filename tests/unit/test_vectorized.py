@@ -0,0 +1,94 @@
+"""Unit tests for passgen.vectorized (NumPy batch engine)."""
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+class TestDrawBelow:
+    def test_rows_within_limits(self):
+        from passgen.vectorized import _draw_below
+        limits = np.array([1, 2, 3, 26, 89, 256])
+        out = _draw_below(limits, 2000)
+        assert out.shape == (6, 2000)
+        assert (out < limits[:, None]).all()
+
+    def test_large_limits_use_word_draws(self):
+        from passgen.vectorized import _draw_below
+        limits = np.array([300, 70000])
+        out = _draw_below(limits, 500)
+        assert (out < limits[:, None]).all()
+        assert out[1].max() > 256
+
+    def test_all_values_reached(self):
+        from passgen.vectorized import _draw_below
+        out = _draw_below(np.array([7]), 2000)
+        assert set(out[0].tolist()) == set(range(7))
+
+
+class TestNumpyEngine:
+    def test_count_and_length(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        result = generate_passwords(PasswordConfig(length=20), 300, engine="numpy")
+        assert len(result) == 300
+        assert all(len(pw) == 20 for pw in result)
+
+    def test_zero_count(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        assert generate_passwords(PasswordConfig(), 0, engine="numpy") == []
+
+    def test_at_least_one_from_each_enabled_set(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        for result in generate_passwords(PasswordConfig(length=8), 1000, engine="numpy"):
+            assert any(ch in CharacterSet.LOWERCASE for ch in result)
+            assert any(ch in CharacterSet.UPPERCASE for ch in result)
+            assert any(ch in CharacterSet.NUMBERS for ch in result)
+            assert any(ch in CharacterSet.SYMBOLS for ch in result)
+
+    def test_disabled_sets_excluded(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=32, include_symbols=False, include_numbers=False)
+        letters = CharacterSet.LOWERCASE + CharacterSet.UPPERCASE
+        for result in generate_passwords(config, 200, engine="numpy"):
+            assert all(ch in letters for ch in result)
+
+    def test_guaranteed_characters_are_shuffled(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=8)
+        batch = generate_passwords(config, 2000, engine="numpy")
+        # Without the shuffle position 0 would always be lowercase.
+        first_lower = sum(pw[0] in CharacterSet.LOWERCASE for pw in batch)
+        assert 200 < first_lower < 1200
+
+    def test_lengths_beyond_256(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        result = generate_passwords(PasswordConfig(length=300), 3, engine="numpy")
+        assert all(len(pw) == 300 for pw in result)
+
+
+class TestEngineSelection:
+    def test_unknown_engine_raises(self):
+        from passgen.generator import PasswordConfig, generate_passwords
+        with pytest.raises(ValueError):
+            generate_passwords(PasswordConfig(), 1, engine="gpu")
+
+    def test_falls_back_without_numpy(self, monkeypatch):
+        from passgen.generator import PasswordConfig, generate_passwords
+        monkeypatch.setitem(sys.modules, "passgen.vectorized", None)
+        result = generate_passwords(PasswordConfig(), 5, engine="numpy")
+        assert len(result) == 5
+
+
+class TestNumpyRejectStrategy:
+    def test_every_enabled_set_present(self):
+        from passgen.generator import CharacterSet, PasswordConfig, generate_passwords
+        config = PasswordConfig(length=8, strategy="reject")
+        batch = generate_passwords(config, 1000, engine="numpy")
+        assert len(batch) == 1000
+        for result in batch:
+            assert len(result) == 8
+            assert any(ch in CharacterSet.LOWERCASE for ch in result)
+            assert any(ch in CharacterSet.UPPERCASE for ch in result)
+            assert any(ch in CharacterSet.NUMBERS for ch in result)
+            assert any(ch in CharacterSet.SYMBOLS for ch in result)